@@ -0,0 +1,101 @@
+"""
+Benchmark request latency under parallel load, sync vs async sessions.
+
+Fires bursts of --concurrency requests at one event loop, the way a single
+uvicorn worker sees them, and times each from the start of its burst. The
+sync mode runs the query through SessionLocal in Starlette's threadpool,
+the way FastAPI serves a plain `def` handler (at most 40 at a time by
+default); the async mode awaits the same query on AsyncSessionLocal:
+
+    uv run python benchmarks/bench_concurrency.py --concurrency 50 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.db.database import SessionLocal, AsyncSessionLocal, async_engine, engine
+from app.models.property import Property
+
+
+def stats_query(state: str = None):
+    """Same count/avg GET /api/properties/stats/overview runs"""
+    stmt = select(func.count(Property.id), func.avg(Property.price))
+    if state:
+        stmt = stmt.where(Property.state == state)
+    return stmt
+
+
+def sync_query(stmt):
+    db = SessionLocal()
+    try:
+        db.execute(stmt).one()
+    finally:
+        db.close()
+
+
+async def sync_request(stmt):
+    await run_in_threadpool(sync_query, stmt)
+
+
+async def async_request(stmt):
+    async with AsyncSessionLocal() as db:
+        (await db.execute(stmt)).one()
+
+
+async def run_mode(request, stmt, concurrency: int, rounds: int) -> tuple:
+    """Per-request latencies in milliseconds and the total wall time in seconds"""
+    latencies = []
+
+    async def timed(burst_start: float):
+        await request(stmt)
+        latencies.append((time.perf_counter() - burst_start) * 1000)
+
+    # One untimed burst so both pools are already filled
+    await asyncio.gather(*(request(stmt) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        burst_start = time.perf_counter()
+        await asyncio.gather(*(timed(burst_start) for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label: str, latencies: list, elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"  {label:<6} median {statistics.median(latencies):8.2f} ms | "
+          f"p99 {p99:8.2f} ms | max {latencies[-1]:8.2f} ms | "
+          f"{len(latencies) / elapsed:8.1f} req/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight per burst")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed bursts per mode")
+    parser.add_argument("--state", default=None, help="Optional state filter, e.g. az")
+    args = parser.parse_args()
+
+    stmt = stats_query(args.state)
+    print(f"📊 {args.rounds} bursts of {args.concurrency} concurrent requests per mode")
+    try:
+        report("sync", *await run_mode(sync_request, stmt, args.concurrency, args.rounds))
+        report("async", *await run_mode(async_request, stmt, args.concurrency, args.rounds))
+    finally:
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+"""
+Benchmark bulk import throughput with per-stage timings and peak memory.
+
+Runs the load_data.py bulk path in a single process (read -> parse ->
+convert -> COPY/merge write) and reports files/sec, rows/sec, where the
+time went and peak RSS. The write stage merges into and retires rows of
+`properties`, so it only runs against a dedicated scratch database in
+BENCH_DATABASE_URL and refuses one that is DATABASE_URL's database. Rows
+the run inserted are deleted again afterwards unless --keep is given.
+Generate input with generate_homeharvest.py:
+
+    uv run python benchmarks/generate_homeharvest.py --out /tmp/hh --files 200
+    BENCH_DATABASE_URL=postgresql://localhost/tailorhomefinder_bench \
+        uv run python benchmarks/bench_import.py --data-path /tmp/hh
+    uv run python benchmarks/bench_import.py --data-path /tmp/hh --no-write --json
+"""
+import argparse
+import hashlib
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+# load_data.py lives in the backend directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+import load_data
+from src.app.db.database import DATABASE_URL, Base
+
+STAGES = ("read", "parse", "convert", "write")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+
+
+class StageTimer:
+    """Accumulates wall time per stage"""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+
+def same_database(a: str, b: str) -> bool:
+    a, b = make_url(a), make_url(b)
+    return (a.host or "localhost", a.port or 5432, a.database) == (b.host or "localhost", b.port or 5432, b.database)
+
+
+def bench_engine():
+    """Engine on BENCH_DATABASE_URL, refusing to write anywhere else"""
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        raise SystemExit("❌ Set BENCH_DATABASE_URL to a scratch database, or pass --no-write")
+    if DATABASE_URL and same_database(url, DATABASE_URL):
+        raise SystemExit("❌ BENCH_DATABASE_URL is DATABASE_URL's database; use a dedicated one")
+    return create_engine(url)
+
+
+def existing_ids(db, ids: list) -> set:
+    return set(db.execute(text("SELECT id FROM properties WHERE id = ANY(:ids)"), {"ids": ids}).scalars())
+
+
+def run(data_path: str, batch_size: int, write: bool, keep: bool) -> dict:
+    files = [str(f) for _, sources in load_data.iter_json_sources(data_path) for f in sources]
+    if not files:
+        raise SystemExit(f"❌ No files found under {data_path}/states")
+
+    timer = StageTimer()
+    seen = load_data.CompactHashSet()
+    engine = bench_engine() if write else None
+    db = sessionmaker(bind=engine)() if write else None
+    created = []  # ids this run inserted, removed again unless --keep
+    totals = defaultdict(int)
+    pending = []
+
+    def flush():
+        batch_ids = [row[0] for row in pending]
+        # Bookkeeping for cleanup, outside the timed write stage
+        before = existing_ids(db, batch_ids) if not keep else set()
+        with timer.stage("write"):
+            load_data.copy_rows_to_staging(db, pending)
+            inserted, updated = load_data.merge_staging(db)
+            load_data.retire_legacy_ids(db)
+            db.commit()
+        created.extend(i for i in batch_ids if i not in before)
+        totals["inserted"] += inserted
+        totals["updated"] += updated
+        pending.clear()
+
+    start = time.perf_counter()
+    try:
+        if write:
+            Base.metadata.create_all(bind=engine)
+
+        for group in load_data.group_files_by_size(files, load_data.PARSE_BYTES_PER_TASK):
+            source_rows = []
+            for zip_file in group:
+                with timer.stage("read"):
+                    raw = Path(zip_file).read_bytes()
+                    hashlib.sha256(raw).hexdigest()
+                with timer.stage("parse"):
+                    source_rows.extend(
+                        tuple(r.get(key) for key in load_data.SOURCE_KEYS)
+                        for r in load_data.parse_records(raw)
+                    )
+                totals["bytes"] += len(raw)
+            totals["records"] += len(source_rows)
+
+            with timer.stage("convert"):
+                mapped = load_data.map_records(pd.DataFrame.from_records(source_rows, columns=load_data.SOURCE_KEYS))
+                rows = list(mapped.itertuples(index=False, name=None))
+                if rows:
+                    fresh = seen.add_many(load_data.id_keys([row[0] for row in rows]))
+                    rows = [row for row, new in zip(rows, fresh) if new]
+            totals["rows"] += len(rows)
+
+            if write:
+                pending.extend(rows)
+                if len(pending) >= batch_size:
+                    flush()
+        if write and pending:
+            flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        if db is not None:
+            db.rollback()
+            if created:
+                db.execute(text("DELETE FROM properties WHERE id = ANY(:ids)"), {"ids": created})
+                db.commit()
+            db.close()
+            engine.dispose()
+
+    return {
+        "files": len(files),
+        "mb": totals["bytes"] / (1024 * 1024),
+        "records": totals["records"],
+        "rows": totals["rows"],
+        "inserted": totals["inserted"],
+        "updated": totals["updated"],
+        "seconds": elapsed,
+        "files_per_sec": len(files) / elapsed,
+        "rows_per_sec": totals["rows"] / elapsed,
+        "stages": {name: timer.seconds[name] for name in STAGES if write or name != "write"},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "../data"),
+                        help="Directory containing states/<state>/<zip>.json")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per COPY/merge transaction")
+    parser.add_argument("--no-write", action="store_true", help="Skip the database write stage")
+    parser.add_argument("--keep", action="store_true", help="Leave imported rows in the database")
+    parser.add_argument("--json", action="store_true", help="Print one JSON line for tracking results")
+    args = parser.parse_args()
+
+    result = run(args.data_path, args.batch_size, write=not args.no_write, keep=args.keep)
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"📊 {result['files']:,} files, {result['mb']:,.1f} MB, {result['records']:,} records "
+          f"-> {result['rows']:,} rows in {result['seconds']:.2f}s")
+    print(f"  {result['files_per_sec']:10,.1f} files/sec")
+    print(f"  {result['rows_per_sec']:10,.0f} rows/sec")
+    for name, seconds in result["stages"].items():
+        print(f"  {name:<8} {seconds:8.2f}s ({seconds / result['seconds']:5.1%})")
+    if "write" in result["stages"]:
+        print(f"  inserted {result['inserted']:,}, updated {result['updated']:,}")
+    print(f"  peak RSS {result['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
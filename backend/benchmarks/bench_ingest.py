@@ -0,0 +1,94 @@
+"""
+Benchmark peak memory and throughput of whole-file vs streaming JSON parsing.
+
+Each mode runs in a fresh interpreter so peak RSS is not shared between
+them. Nothing is written to the database:
+
+    uv run python benchmarks/bench_ingest.py --data-path ../data --files 50
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# load_data.py lives in the backend directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = ("json", "stream")
+
+
+def pick_files(data_path: str, count: int) -> list:
+    """The `count` largest <zip>.json files, where memory spikes matter most"""
+    files = sorted(Path(data_path).glob("states/*/*.json"), key=lambda f: f.stat().st_size, reverse=True)
+    return [str(f) for f in files[:count]]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+
+
+def run_child(mode: str, files: list) -> dict:
+    """Parse and convert files in this process and return its measurements"""
+    import load_data
+
+    baseline = peak_rss_mb()
+    records = 0
+    start = time.perf_counter()
+    for _, _, rows, error in load_data.iter_parsed_files(files, stream=(mode == "stream")):
+        if error is None:
+            records += len(rows)
+    elapsed = time.perf_counter() - start
+
+    if mode == "stream":
+        parser = "ijson" if load_data.ijson is not None else "json.raw_decode"
+    else:
+        parser = "orjson" if load_data.orjson is not None else "json"
+    return {
+        "mode": mode,
+        "parser": parser,
+        "records": records,
+        "seconds": elapsed,
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "../data"),
+                        help="Directory containing states/<state>/<zip>.json")
+    parser.add_argument("--files", type=int, default=50, help="Number of (largest) files to parse")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    files = pick_files(args.data_path, args.files)
+    if not files:
+        print(f"❌ No files found under {args.data_path}/states")
+        return
+
+    if args.child:
+        print(json.dumps(run_child(args.child, files)))
+        return
+
+    size_mb = sum(os.path.getsize(f) for f in files) / (1024 * 1024)
+    print(f"📊 {len(files)} files, {size_mb:,.1f} MB")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--data-path", args.data_path, "--files", str(args.files), "--child", mode],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {mode:<7} ({result['parser']:<15}) "
+              f"{result['records'] / result['seconds']:10,.0f} records/sec | "
+              f"peak RSS {result['peak_mb']:7.1f} MB "
+              f"(+{result['peak_mb'] - result['baseline_mb']:.1f} MB over imports)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark deep-page latency for offset vs cursor pagination.
+
+Runs the same queries GET /api/properties/ issues, directly against the
+database configured in DATABASE_URL:
+
+    uv run python benchmarks/bench_pagination.py --page 1000 --limit 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.database import SessionLocal
+from app.services.property_service import PropertyService
+
+
+def time_call(fn, repeat: int) -> list:
+    """Run fn `repeat` times and return per-call latencies in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"  {label:<8} median {statistics.median(timings):8.2f} ms | "
+          f"p95 {p95:8.2f} ms | min {timings[0]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page", type=int, default=1000, help="1-based page number to fetch")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per mode")
+    parser.add_argument("--state", default=None, help="Optional state filter, e.g. az")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        service = PropertyService(db)
+        query = service.search_query(service.build_filters(state=args.state))
+        offset = (args.page - 1) * args.limit
+
+        # Locate the last row of the previous page once (untimed) so the cursor
+        # run starts from exactly the same position an infinite-scroll client
+        # would have reached by following next_cursor.
+        cursor = None
+        if offset:
+            boundary = service.order_newest_first(query).offset(offset - 1).limit(1).first()
+            if boundary is None:
+                print(f"❌ Not enough rows for page {args.page} at limit {args.limit}")
+                return
+            cursor = service.encode_cursor(boundary)
+
+        offset_ids = [p.id for p in service.fetch_offset_page(query, args.limit, offset)]
+        cursor_ids = [p.id for p in service.fetch_cursor_page(query, args.limit, cursor)[0]]
+        if offset_ids != cursor_ids:
+            print("⚠️  Offset and cursor pages differ (rows inserted during the run?)")
+
+        print(f"📊 Page {args.page} (offset {offset:,}, limit {args.limit}), {args.repeat} runs each")
+        report("offset", time_call(lambda: service.fetch_offset_page(query, args.limit, offset), args.repeat))
+        report("cursor", time_call(lambda: service.fetch_cursor_page(query, args.limit, cursor), args.repeat))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
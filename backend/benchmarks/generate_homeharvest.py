@@ -0,0 +1,186 @@
+"""
+Generate synthetic HomeHarvest data for import benchmarks.
+
+Writes <out>/states/<state>/<zip>.json files with the same keys, types and
+layout as the scraped data in data/states, including listings that repeat
+across neighbouring zip files:
+
+    uv run python benchmarks/generate_homeharvest.py --out /tmp/hh --files 200
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+STATES = {
+    "az": ("AZ", ["Phoenix", "Scottsdale", "Mesa", "Tempe", "Chandler"], 85001, "Maricopa"),
+    "tx": ("TX", ["Austin", "Dallas", "Houston", "San Antonio", "Plano"], 75001, "Travis"),
+    "fl": ("FL", ["Miami", "Tampa", "Orlando", "Naples", "Jacksonville"], 32003, "Miami-Dade"),
+}
+STYLES = ["SINGLE_FAMILY"] * 10 + ["MOBILE"] * 3 + ["TOWNHOMES"] * 2 + ["LAND"] * 2 + ["CONDOS", "MULTI_FAMILY"]
+STATUSES = ["FOR_SALE"] * 7 + ["PENDING", "CONTINGENT"]
+STREETS = ["Main St", "Oak Ave", "Camelback Rd", "Palm Dr", "Mesa Blvd", "Cactus Ln", "Desert View Way"]
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley"]
+LAST_NAMES = ["Smith", "Garcia", "Nguyen", "Johnson", "Lee", "Brown", "Patel"]
+OFFICES = ["Apex Residential", "Kb Home Sales", "Desert Realty", "HomeSmart", "Realty One Group"]
+
+
+def photo_url(rng: random.Random) -> str:
+    return f"https://ap.rdcpix.com/{rng.getrandbits(128):032x}l-m{rng.randrange(10**9)}od-w480_h360_x2.webp?w=1080&q=75"
+
+
+def phones(rng: random.Random, kind: str):
+    if rng.random() < 0.1:
+        return None
+    return [{"number": f"{rng.randrange(200, 999)}{rng.randrange(10**7):07d}", "type": kind, "primary": True, "ext": None}]
+
+
+def maybe(rng: random.Random, value, none_rate: float):
+    return None if rng.random() < none_rate else value
+
+
+def make_record(rng: random.Random, state: str, zip_code: str, now: datetime) -> dict:
+    """One listing with every key the real scraper writes, in the same order"""
+    state_code, cities, _, county = STATES[state]
+    city = rng.choice(cities)
+    number = rng.randrange(100, 99999)
+    street = f"{number} {rng.choice('NSEW')} {rng.choice(STREETS)}"
+    unit = maybe(rng, f"Unit {rng.randrange(1, 400)}", 0.7)
+    full_street_line = f"{street} {unit}" if unit else street
+    style = rng.choice(STYLES)
+    land = style == "LAND"
+    property_id = str(rng.randrange(10**9, 10**10))
+    mls_id = str(rng.randrange(10**6, 10**7))
+    list_price = rng.randrange(50, 3000) * 1000
+    sqft = None if land else rng.randrange(600, 6000)
+    list_date = now - timedelta(days=rng.randrange(1, 365), seconds=rng.randrange(86400))
+    status = rng.choice(STATUSES)
+    pending_date = list_date + timedelta(days=rng.randrange(1, 60)) if status != "FOR_SALE" else None
+    sold = rng.random() < 0.7
+    agent = maybe(rng, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", 0.05)
+    photos = [photo_url(rng) for _ in range(rng.randrange(1, 40))]
+    slug = f"{full_street_line.replace(' ', '-')}_{city}_{state_code}_{zip_code}_M{property_id[:5]}-{property_id[5:]}"
+    fmt = "%Y-%m-%d %H:%M:%S"
+
+    return {
+        "property_url": f"https://www.realtor.com/realestateandhomes-detail/{slug}",
+        "property_id": property_id,
+        "listing_id": str(rng.randrange(10**9, 10**10)),
+        "permalink": slug,
+        "mls": f"{state_code[0]}{state_code}",
+        "mls_id": mls_id,
+        "status": status,
+        "mls_status": maybe(rng, "Active" if status == "FOR_SALE" else "Pending", 0.04),
+        "text": maybe(rng, " ".join(rng.choice(STREETS).upper() for _ in range(rng.randrange(20, 120))), 0.01),
+        "style": style,
+        "formatted_address": f"{full_street_line}, {city}, {state_code} {zip_code}",
+        "full_street_line": full_street_line,
+        "street": street,
+        "unit": unit,
+        "city": city,
+        "state": state_code.lower(),
+        "zip_code": zip_code,
+        "beds": None if land else maybe(rng, rng.randrange(1, 7), 0.05),
+        "full_baths": None if land else maybe(rng, rng.randrange(1, 5), 0.05),
+        "half_baths": maybe(rng, 1, 0.8),
+        "sqft": sqft,
+        "year_built": None if land else rng.randrange(1900, 2026),
+        "days_on_mls": (now - list_date).days,
+        "list_price": list_price,
+        "list_price_min": None,
+        "list_price_max": None,
+        "list_date": list_date.strftime(fmt),
+        "pending_date": pending_date.strftime(fmt) if pending_date else None,
+        "sold_price": rng.randrange(50, 2000) * 1000 if sold else None,
+        "last_sold_date": (list_date - timedelta(days=rng.randrange(400, 8000))).strftime("%Y-%m-%d") if sold else None,
+        "last_sold_price": rng.randrange(50, 2000) * 1000 if sold else None,
+        "last_status_change_date": (pending_date or list_date).strftime(fmt),
+        "last_update_date": int(now.timestamp() * 1000) - rng.randrange(10**9),
+        "assessed_value": None,
+        "estimated_value": maybe(rng, int(list_price * rng.uniform(0.85, 1.15)), 0.15),
+        "tax": None,
+        "tax_history": None,
+        "new_construction": rng.random() < 0.05,
+        "lot_sqft": maybe(rng, rng.randrange(1000, 50000), 0.15),
+        "price_per_sqft": round(list_price / sqft) if sqft else None,
+        "latitude": maybe(rng, round(rng.uniform(31.3, 37.0), 6), 0.01),
+        "longitude": maybe(rng, round(rng.uniform(-114.8, -109.0), 6), 0.01),
+        "neighborhoods": maybe(rng, f"{city} {rng.choice(['Heights', 'Estates', 'Village'])}", 0.95),
+        "county": county,
+        "fips_code": "04013",
+        "stories": None if land else maybe(rng, rng.randrange(1, 3), 0.2),
+        "hoa_fee": maybe(rng, rng.randrange(0, 600), 0.07),
+        "parking_garage": maybe(rng, float(rng.randrange(1, 4)), 0.4),
+        "agent_id": maybe(rng, str(rng.randrange(10**6, 10**7)), 0.13),
+        "agent_name": agent,
+        "agent_email": maybe(rng, f"agent{rng.randrange(10**5)}@example.com", 0.08),
+        "agent_phones": phones(rng, "Mobile"),
+        "agent_mls_set": f"S-{state_code}-{rng.randrange(10**5)}" if agent else None,
+        "agent_nrds_id": maybe(rng, str(rng.randrange(10**8, 10**9)), 0.5),
+        "broker_id": maybe(rng, str(rng.randrange(10**6)), 0.4),
+        "broker_name": maybe(rng, rng.choice(OFFICES), 0.35),
+        "builder_id": maybe(rng, str(rng.randrange(10**6)), 0.95),
+        "builder_name": maybe(rng, "Synthetic Homes", 0.95),
+        "office_id": maybe(rng, str(rng.randrange(10**6)), 0.3),
+        "office_mls_set": maybe(rng, f"O-{state_code}-{rng.randrange(10**4)}", 0.05),
+        "office_name": maybe(rng, rng.choice(OFFICES), 0.04),
+        "office_email": maybe(rng, f"office{rng.randrange(10**4)}@example.com", 0.09),
+        "office_phones": phones(rng, "Office"),
+        "nearby_schools": None,
+        "primary_photo": photos[0],
+        "alt_photos": ", ".join(photos),
+        "search_zip": zip_code,
+    }
+
+
+def generate(out: Path, files: int, rows_per_file: int, states: list, overlap: float, seed: int) -> int:
+    """Write the files and return the number of records written"""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 15, 12, 0, 0)
+    written = 0
+    previous = {}  # state -> records of its last file
+
+    for i in range(files):
+        state = states[i % len(states)]
+        zip_code = str(STATES[state][2] + i // len(states))
+        # Real zip files range from a handful of listings to several thousand
+        count = max(1, int(rng.expovariate(1 / rows_per_file)))
+        records = [make_record(rng, state, zip_code, now) for _ in range(count)]
+
+        # Search-zip overlap: some listings also show up in the next zip's results
+        carried = [dict(r, search_zip=zip_code) for r in previous.get(state, []) if rng.random() < overlap]
+        records.extend(carried)
+        previous[state] = records
+
+        state_dir = out / "states" / state
+        state_dir.mkdir(parents=True, exist_ok=True)
+        with open(state_dir / f"{zip_code}.json", "w") as f:
+            json.dump(records, f, indent=2)
+        written += len(records)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", required=True, help="Output data directory (files go in <out>/states)")
+    parser.add_argument("--files", type=int, default=100, help="Number of <zip>.json files")
+    parser.add_argument("--rows-per-file", type=int, default=160, help="Mean listings per file")
+    parser.add_argument("--states", default="az", help="Comma-separated states, e.g. az,tx,fl")
+    parser.add_argument("--overlap", type=float, default=0.07,
+                        help="Share of listings repeated in the next zip file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    states = [s.strip().lower() for s in args.states.split(",")]
+    unknown = [s for s in states if s not in STATES]
+    if unknown:
+        parser.error(f"unknown state(s) {unknown}; choose from {sorted(STATES)}")
+
+    records = generate(Path(args.out), args.files, args.rows_per_file, states, args.overlap, args.seed)
+    print(f"✅ Wrote {args.files:,} files, {records:,} records to {Path(args.out) / 'states'}")
+
+
+if __name__ == "__main__":
+    main()
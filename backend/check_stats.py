@@ -1,31 +1,65 @@
+import argparse
 from src.app.db.database import SessionLocal
 from src.app.models.property import Property
 from sqlalchemy import func
+import pandas as pd
 
-db = SessionLocal()
 
-# Total count
-total = db.query(Property).count()
-print(f"🏠 Total Properties: {total:,}\n")
+def database_stats():
+    db = SessionLocal()
 
-# By state
-by_state = db.query(
-    Property.state,
-    func.count(Property.id)
-).group_by(Property.state).all()
+    # Total count
+    total = db.query(Property).count()
+    print(f"🏠 Total Properties: {total:,}\n")
 
-print("📍 Properties by State:")
-for state, count in sorted(by_state, key=lambda x: x[1], reverse=True):
-    print(f"   {state.upper()}: {count:,}")
+    # By state
+    by_state = db.query(
+        Property.state,
+        func.count(Property.id)
+    ).group_by(Property.state).all()
 
-# Price stats
-avg_price = db.query(func.avg(Property.price)).scalar()
-min_price = db.query(func.min(Property.price)).scalar()
-max_price = db.query(func.max(Property.price)).scalar()
+    print("📍 Properties by State:")
+    for state, count in sorted(by_state, key=lambda x: x[1], reverse=True):
+        print(f"   {state.upper()}: {count:,}")
 
-print(f"\n💰 Price Stats:")
-print(f"   Average: ${int(avg_price):,}")
-print(f"   Min: ${int(min_price):,}")
-print(f"   Max: ${int(max_price):,}")
+    # Price stats
+    avg_price = db.query(func.avg(Property.price)).scalar()
+    min_price = db.query(func.min(Property.price)).scalar()
+    max_price = db.query(func.max(Property.price)).scalar()
 
-db.close()
+    print(f"\n💰 Price Stats:")
+    print(f"   Average: ${int(avg_price):,}")
+    print(f"   Min: ${int(min_price):,}")
+    print(f"   Max: ${int(max_price):,}")
+
+    db.close()
+
+
+def parquet_stats(parquet_path: str):
+    """Same report from the raw Parquet cache (load_data.py --build-parquet), no database needed"""
+    # Only the two columns needed are read; source_state comes from the partition directories
+    df = pd.read_parquet(parquet_path, columns=['source_state', 'list_price'])
+    priced = df[df['list_price'] > 0]
+
+    print(f"🏠 Total Records: {len(df):,} ({len(priced):,} with a list price)\n")
+
+    print("📍 Records by State:")
+    for state, count in df['source_state'].astype(str).value_counts().items():
+        print(f"   {state.upper()}: {count:,}")
+
+    print(f"\n💰 Price Stats:")
+    print(f"   Average: ${int(priced['list_price'].mean()):,}")
+    print(f"   Min: ${int(priced['list_price'].min()):,}")
+    print(f"   Max: ${int(priced['list_price'].max()):,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print property counts and price stats")
+    parser.add_argument('--parquet', metavar='PARQUET_PATH',
+                        help="Read the Parquet cache instead of the database")
+    args = parser.parse_args()
+
+    if args.parquet:
+        parquet_stats(args.parquet)
+    else:
+        database_stats()
@@ -12,7 +12,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.db.database import engine, Base
-from app.models.property import Property
+from app.models.property import Property, PropertyCluster, SearchSuggestion
+from app.models.import_state import ImportRun, ImportManifest
 from app.models.inquiry import Inquiry
 from app.models.user import User
 from app.models.agent import Agent
@@ -32,6 +33,10 @@ def create_tables():
     # Import all models to ensure they're registered with Base
     from app.models import (
         Property,
+        PropertyCluster,
+        SearchSuggestion,
+        ImportRun,
+        ImportManifest,
         Inquiry,
         User,
         Agent,
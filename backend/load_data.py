@@ -1,85 +1,357 @@
+import argparse
+import codecs
+import io
+import itertools
 import json
+import multiprocessing
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from src.app.db.database import SessionLocal, engine
-from src.app.models.property import Property, Base
+from src.app.db.database import Base
+from src.app.models import Property, ImportRun, ImportManifest
+from src.app.services.map_service import MapService
+from src.app.services.property_service import PropertyService
+from geoalchemy2 import WKTElement
 from dotenv import load_dotenv
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import hashlib
 from datetime import datetime
-import uuid
+
+# Optional faster parsers: ijson (C backend) streams records, orjson speeds up whole-file loads
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 load_dotenv()
 
-def generate_property_id(data):
-    """Generate unique ID from multiple property fields with fallback"""
-    # Try to use available unique identifiers first
-    if data.get('mls_id'):
-        return hashlib.md5(str(data.get('mls_id')).encode()).hexdigest()[:16]
-    
-    # Use combination of fields with random fallback
-    unique_parts = [
-        str(data.get('street_address', '')),
-        str(data.get('city', '')),
-        str(data.get('zip_code', '')),
-        str(data.get('latitude', '')),
-        str(data.get('longitude', '')),
-        str(data.get('property_url', '')),
+# ================== Field Mapping ==================
+
+# Bump whenever the mapping below changes. The version is part of every row's
+# content_hash and of every manifest entry, so the next import re-reads all
+# files and rewrites every row with the new mapping.
+FIELD_MAPPING_VERSION = 3
+
+# HomeHarvest keys the mapping reads; everything else in a record is dropped
+SOURCE_KEYS = (
+    'property_id', 'listing_id', 'mls', 'mls_id', 'property_url', 'full_street_line', 'street', 'city', 'state', 'zip_code',
+    'list_price', 'beds', 'full_baths', 'sqft', 'lot_sqft', 'year_built', 'style', 'status',
+    'latitude', 'longitude', 'text', 'hoa_fee', 'primary_photo', 'alt_photos',
+    'agent_name', 'agent_email', 'agent_phones', 'office_name',
+    'nearby_schools', 'tax_history', 'estimated_value', 'price_per_sqft', 'days_on_mls',
+    'county', 'neighborhoods',
+)
+
+# Property columns produced by map_records, in order
+PROPERTY_COLUMNS = (
+    'id', 'title', 'address', 'city', 'state', 'zip_code', 'price', 'beds',
+    'baths', 'sqft', 'lot_sqft', 'year_built', 'property_type', 'status',
+    'latitude', 'longitude', 'description', 'hoa_fee', 'image', 'alt_photos',
+    'agent_name', 'agent_email', 'agent_phone', 'agent_phones', 'office_name',
+    'property_url', 'mls_number', 'estimated_value', 'price_per_sqft', 'days_on_mls',
+    'county', 'neighborhoods', 'nearby_schools', 'tax_history', 'content_hash',
+)
+
+# Columns stored as json (the rest of the list-valued columns are text[])
+JSON_COLUMNS = frozenset({'agent_phones', 'nearby_schools', 'tax_history'})
+
+STYLE_PROPERTY_TYPES = {
+    'SINGLE_FAMILY': 'House',
+    'CONDOS': 'Condo',
+    'CONDO': 'Condo',
+    'CONDO_TOWNHOME': 'Condo',
+    'TOWNHOMES': 'Townhouse',
+    'TOWNHOUSE': 'Townhouse',
+    'MULTI_FAMILY': 'Multi-Family',
+    'DUPLEX_TRIPLEX': 'Multi-Family',
+    'MOBILE': 'Mobile',
+    'LAND': 'Land',
+    'FARM': 'Farm',
+}
+
+MAX_ALT_PHOTOS = 10
+
+def _int_column(series: pd.Series) -> pd.Series:
+    """Integer columns sometimes arrive as floats (e.g. 1849.0) or strings; truncate like int()"""
+    return np.trunc(pd.to_numeric(series, errors='coerce')).astype('Int64')
+
+def _split_list(value, limit: int = None):
+    """'a, b, c' (or an existing list) -> ['a', 'b', 'c']"""
+    if isinstance(value, str):
+        # alt_photos carries dozens of URLs; don't split past the ones we keep
+        value = [item.strip() for item in value.split(',', limit or -1)[:limit]]
+    elif not isinstance(value, (list, tuple)):
+        return None
+    items = [str(item) for item in value if item]
+    return items[:limit] if limit else items
+
+def _json_value(value):
+    """Nested source values; the Parquet cache stores them as JSON text"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    if not isinstance(value, (list, dict)) and pd.isna(value):
+        return None
+    return value
+
+def _json_list(value):
+    value = _json_value(value)
+    if value is None or isinstance(value, list):
+        return value
+    return [value]
+
+def _primary_phone(phones):
+    """Number of the phone flagged primary, else the first one"""
+    if not phones:
+        return None
+    phone = next((p for p in phones if isinstance(p, dict) and p.get('primary')), phones[0])
+    return phone.get('number') if isinstance(phone, dict) else str(phone)
+
+def _key_part(series: pd.Series) -> pd.Series:
+    """Trimmed string column with blanks as NA"""
+    series = series.astype('string').str.strip()
+    return series.mask(series == '')
+
+def listing_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Deterministic identity of each listing, strongest identifier first:
+    realtor.com property_id, then MLS + MLS number, then listing_id, then the
+    normalized street address. NA when a record has none of them.
+    
+    The same house found through several search zips gets the same key, on
+    every run.
+    """
+    street = _key_part(df['full_street_line']).fillna(_key_part(df['street'])).str.lower()
+    area = _key_part(df['city']).str.lower().fillna('') + '|' + _key_part(df['zip_code']).fillna('')
+    return (
+        ('pid:' + _key_part(df['property_id']))
+        .fillna('mls:' + _key_part(df['mls']).str.upper() + ':' + _key_part(df['mls_id']))
+        .fillna('lid:' + _key_part(df['listing_id']))
+        .fillna(('addr:' + street + '|' + area).where(area != '|'))
+    )
+
+def property_ids(keys: pd.Series) -> list:
+    """16-hex-digit property ids (md5 of the listing key); None where there is no key"""
+    return [
+        hashlib.md5(key.encode()).hexdigest()[:16] if isinstance(key, str) else None
+        for key in keys.tolist()
     ]
+
+def content_hashes(values: np.ndarray) -> list:
+    """
+    Per-row hash of the mapped columns (every one except id), prefixed with
+    the mapping version; equal hashes mean nothing to update. Expects Python
+    scalars, whose repr is stable.
+    """
+    prefix = f"v{FIELD_MAPPING_VERSION}-"
+    return [prefix + hashlib.md5(repr(tuple(row)).encode()).hexdigest()[:16] for row in values]
+
+def map_records(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Map a frame of HomeHarvest records (columns: SOURCE_KEYS) to Property
+    columns (PROPERTY_COLUMNS), whole columns at a time.
     
-    unique_string = '-'.join(unique_parts).lower()
+    Unpriced listings and records without any identifier (see listing_keys)
+    are dropped; the result keeps the input's index. Missing
+    values come back as None, and int/float values as Python scalars, ready
+    for COPY or the ORM.
+    """
+    df = df.reindex(columns=SOURCE_KEYS)
+    address = df['full_street_line'].fillna(df['street']).fillna('')
+    price = df['list_price'].astype(object).map(
+        lambda v: v.replace('$', '').replace(',', '') if isinstance(v, str) else v
+    )
+    agent_phones = df['agent_phones'].map(_json_list)
     
-    # If string is too generic, add random component
-    if not any(unique_parts[:3]):  # No address, city, or zip
-        unique_string += '-' + str(uuid.uuid4())[:8]
+    mapped = pd.DataFrame({
+        'id': property_ids(listing_keys(df)),
+        'title': address.where(address != '', 'Property'),
+        'address': address,
+        'city': df['city'].fillna(''),
+        'state': df['state'].fillna(''),
+        'zip_code': df['zip_code'].fillna(''),
+        'price': _int_column(price).fillna(0),
+        'beds': _int_column(df['beds']),
+        'baths': pd.to_numeric(df['full_baths'], errors='coerce').astype('Float64'),
+        'sqft': _int_column(df['sqft']),
+        'lot_sqft': _int_column(df['lot_sqft']),
+        'year_built': _int_column(df['year_built']),
+        'property_type': df['style'].map(STYLE_PROPERTY_TYPES).fillna('House'),
+        'status': df['status'].fillna('Active'),
+        'latitude': pd.to_numeric(df['latitude'], errors='coerce').astype('Float64'),
+        'longitude': pd.to_numeric(df['longitude'], errors='coerce').astype('Float64'),
+        'description': df['text'],
+        'hoa_fee': _int_column(df['hoa_fee']),
+        'image': df['primary_photo'],
+        'alt_photos': df['alt_photos'].map(lambda v: _split_list(v, MAX_ALT_PHOTOS) or []),
+        'agent_name': df['agent_name'],
+        'agent_email': df['agent_email'],
+        'agent_phone': agent_phones.map(_primary_phone),
+        'agent_phones': agent_phones,
+        'office_name': df['office_name'],
+        'property_url': df['property_url'],
+        'mls_number': df['mls_id'],
+        'estimated_value': _int_column(df['estimated_value']),
+        'price_per_sqft': _int_column(df['price_per_sqft']),
+        'days_on_mls': _int_column(df['days_on_mls']),
+        'county': df['county'],
+        'neighborhoods': df['neighborhoods'].map(_split_list),
+        'nearby_schools': df['nearby_schools'].map(_json_list),
+        'tax_history': df['tax_history'].map(_json_list),
+    }, index=df.index)
     
-    return hashlib.md5(unique_string.encode()).hexdigest()[:16]
+    mapped = mapped[(mapped['price'] > 0) & mapped['id'].notna()]
+    values = mapped.astype(object).to_numpy()
+    values[pd.isna(values)] = None
+    values = np.column_stack([values, np.array(content_hashes(values[:, 1:]), dtype=object)])
+    return pd.DataFrame(values, index=mapped.index, columns=list(PROPERTY_COLUMNS), dtype=object)
+
+def records_frame(records) -> pd.DataFrame:
+    """Frame of SOURCE_KEYS from an iterable of record dicts, built from compact tuples"""
+    return pd.DataFrame.from_records(
+        (tuple(record.get(key) for key in SOURCE_KEYS) for record in records),
+        columns=SOURCE_KEYS
+    )
+
+def convert_records(records) -> list:
+    """HomeHarvest records -> list of Property column dicts (priced listings only)"""
+    return map_records(records_frame(records)).to_dict('records')
+
+def convert_home_harvest_to_row(data):
+    """Convert one HomeHarvest record to a dict of Property column values"""
+    rows = convert_records([data])
+    return rows[0] if rows else None
+
+def row_to_property(property_data: dict) -> Property:
+    """Property model for a converted row, with its PostGIS point"""
+    latitude = property_data['latitude']
+    longitude = property_data['longitude']
+    if latitude is not None and longitude is not None:
+        property_data['location'] = WKTElement(f"POINT({longitude} {latitude})", srid=4326)
+    
+    return Property(**property_data)
 
 def convert_home_harvest_to_property(data, file_path):
     """Convert HomeHarvest JSON format to our Property model"""
-    try:
-        property_id = generate_property_id(data)
-        
-        street = data.get('street_address', '')
-        title = f"{street}" if street else "Property"
-        
-        price = data.get('list_price', 0)
-        if isinstance(price, str):
-            price = int(price.replace('$', '').replace(',', ''))
-        
-        property_data = {
-            'id': property_id,
-            'title': title,
-            'address': street,
-            'city': data.get('city', ''),
-            'state': data.get('state', ''),
-            'zip_code': data.get('zip_code', ''),
-            'price': int(price) if price else 0,
-            'beds': data.get('beds'),
-            'baths': data.get('full_baths'),
-            'sqft': data.get('sqft'),
-            'lot_sqft': data.get('lot_sqft'),
-            'year_built': data.get('year_built'),
-            'property_type': data.get('property_type', 'House'),
-            'status': data.get('status', 'Active'),
-            'latitude': data.get('latitude'),
-            'longitude': data.get('longitude'),
-            'description': data.get('text', ''),
-            'hoa_fee': data.get('hoa_fee'),
-            'image': data.get('primary_photo'),
-            'alt_photos': data.get('photos', [])[:10] if data.get('photos') else [],
-            'agent_name': data.get('agent', {}).get('name') if isinstance(data.get('agent'), dict) else None,
-            'property_url': data.get('property_url'),
-            'mls_number': data.get('mls_id'),
-        }
-        
-        return Property(**property_data)
-    except Exception as e:
+    property_data = convert_home_harvest_to_row(data)
+    if property_data is None:
         return None
+    return row_to_property(property_data)
+
+def iter_state_files(states_dir: Path):
+    """Yield (state_name, zip_files) for each state directory, both in name order"""
+    for state_dir in sorted(states_dir.iterdir()):
+        if not state_dir.is_dir() or state_dir.name.startswith('.'):
+            continue
+        zip_files = sorted(f for f in state_dir.glob('*.json') if not f.name.startswith('.'))
+        yield state_dir.name, zip_files
+
+def parse_records(raw: bytes):
+    """Parse the contents of a <zip>.json file into a list of HomeHarvest records"""
+    properties_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    if not isinstance(properties_data, list):
+        properties_data = [properties_data]
+    return properties_data
+
+def read_zip_file(zip_file: Path):
+    """Parse one <zip>.json file into a list of HomeHarvest records"""
+    return parse_records(Path(zip_file).read_bytes())
+
+# ================== Streaming Parser ==================
+
+STREAM_CHUNK_SIZE = 1 << 16
+
+class HashingReader:
+    """File wrapper that feeds everything read through sha256"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.sha256.update(data)
+        return data
+    
+    def hexdigest(self) -> str:
+        # Drain anything the parser didn't need (trailing whitespace) so the
+        # hash always covers the whole file, same as the non-streaming path
+        while self.read(STREAM_CHUNK_SIZE):
+            pass
+        return self.sha256.hexdigest()
+
+def _iter_json_values(reader, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Stdlib fallback for ijson: yield the elements of a top-level JSON array
+    (or a single top-level object) one at a time, holding only about one
+    chunk plus one record in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, eof = '', 0, False
+    
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = reader.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+    
+    def skip(chars: str) -> str:
+        """Advance past chars; return the next character ('' at end of input)"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos] if pos < len(buffer) else ''
+            fill()
+    
+    first = skip(' \t\r\n')
+    in_array = first == '['
+    if in_array:
+        pos += 1
+    
+    while True:
+        next_char = skip(' \t\r\n,' if in_array else ' \t\r\n')
+        if next_char in ('', ']'):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()  # Record continues past the buffer
+            continue
+        pos = end
+        yield value
+        if not in_array:
+            return
+
+def iter_records(reader):
+    """Yield HomeHarvest records one at a time, with ijson when it is installed"""
+    if ijson is not None:
+        return ijson.items(reader, 'item', use_float=True)
+    return _iter_json_values(reader)
+
+# ================== ORM Path (fallback) ==================
 
 def load_all_properties(data_path: str, db: Session, batch_size: int = 500):
-    """Load ALL properties with proper error handling"""
+    """Load ALL properties through the ORM, one existence check per row (slow fallback)"""
     states_dir = Path(data_path) / 'states'
     
     if not states_dir.exists():
@@ -94,29 +366,19 @@ def load_all_properties(data_path: str, db: Session, batch_size: int = 500):
     total_files = 0
     batch = []
     
-    for state_dir in states_dir.iterdir():
-        if not state_dir.is_dir() or state_dir.name.startswith('.'):
-            continue
-            
-        state_name = state_dir.name
-        zip_files = [f for f in state_dir.glob('*.json') if not f.name.startswith('.')]
-        
+    for state_name, zip_files in iter_state_files(states_dir):
         print(f"\n📍 {state_name.upper()}: {len(zip_files)} zip codes")
         
         for idx, zip_file in enumerate(zip_files, 1):
             total_files += 1
             
             try:
-                with open(zip_file, 'r') as f:
-                    properties_data = json.load(f)
+                properties_data = read_zip_file(zip_file)
                 
-                if not isinstance(properties_data, list):
-                    properties_data = [properties_data]
-                
-                for prop_data in properties_data:
-                    property_obj = convert_home_harvest_to_property(prop_data, zip_file)
+                for property_data in convert_records(properties_data):
+                    property_obj = row_to_property(property_data)
                     
-                    if property_obj and property_obj.price > 0:
+                    if property_obj:
                         # Check if exists using raw SQL for speed
                         exists = db.execute(
                             text("SELECT 1 FROM properties WHERE id = :id LIMIT 1"),
@@ -172,21 +434,793 @@ def load_all_properties(data_path: str, db: Session, batch_size: int = 500):
     
     return total_loaded
 
+# ================== Cross-file Dedup ==================
+
+class CompactHashSet:
+    """
+    Set of uint64 keys in a numpy open-addressing table: 8 bytes per slot,
+    at most half full, instead of ~70 bytes per entry for a set of ints.
+    Keys are md5-derived, so their low bits index the table directly.
+    """
+    
+    def __init__(self, capacity: int = 1 << 16):
+        self.table = np.zeros(capacity, dtype=np.uint64)  # 0 marks an empty slot
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def _probe(self, keys: np.ndarray) -> np.ndarray:
+        """Slot holding each key, or the first empty slot on its probe path"""
+        mask = np.uint64(len(self.table) - 1)
+        slots = keys & mask
+        moving = np.arange(len(keys))
+        while len(moving):
+            values = self.table[slots[moving]]
+            moving = moving[(values != keys[moving]) & (values != 0)]
+            slots[moving] = (slots[moving] + np.uint64(1)) & mask
+        return slots
+    
+    def add_many(self, keys: np.ndarray) -> np.ndarray:
+        """Insert keys; True where a key was not in the set yet (first occurrence in keys only)"""
+        keys = np.asarray(keys, dtype=np.uint64).copy()
+        keys[keys == 0] = 1  # 0 is the empty marker
+        is_new = np.zeros(len(keys), dtype=bool)
+        pending, positions = np.unique(keys, return_index=True)
+        if (self.size + len(pending)) * 2 > len(self.table):
+            self._grow(self.size + len(pending))
+        
+        while len(pending):
+            slots = self._probe(pending)
+            found = self.table[slots] == pending
+            # Keys probing to the same empty slot: the first claims it, the others retry
+            empty = np.flatnonzero(~found)
+            _, first = np.unique(slots[empty], return_index=True)
+            claim = empty[first]
+            self.table[slots[claim]] = pending[claim]
+            is_new[positions[claim]] = True
+            self.size += len(claim)
+            
+            retry = ~found
+            retry[claim] = False
+            pending, positions = pending[retry], positions[retry]
+        return is_new
+    
+    def _grow(self, needed: int):
+        capacity = len(self.table)
+        while needed * 2 > capacity:
+            capacity *= 2
+        keys = self.table[self.table != 0]
+        self.table = np.zeros(capacity, dtype=np.uint64)
+        self.size = 0
+        self.add_many(keys)
+
+def id_keys(ids: list) -> np.ndarray:
+    """16-hex-digit property ids as uint64 CompactHashSet keys"""
+    return np.frombuffer(bytes.fromhex(''.join(ids)), dtype='>u8').astype(np.uint64)
+
+# ================== Bulk Path (COPY + merge) ==================
+
+# Columns streamed into the staging table, in COPY order. location is not
+# staged; the merge derives it from latitude/longitude inside PostgreSQL.
+COPY_COLUMNS = PROPERTY_COLUMNS
+
+# Columns rewritten when an existing listing's content hash changes
+UPDATE_COLUMNS = tuple(c for c in COPY_COLUMNS if c != 'id') + ('location',)
+
+def _copy_escape(value: str) -> str:
+    """Escape a value for COPY ... FROM STDIN in text format"""
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def _copy_field(value) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, tuple)):
+        # PostgreSQL array literal: {"a","b"} with \ and " escaped per element
+        items = ('"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"' for v in value)
+        return _copy_escape('{' + ','.join(items) + '}')
+    return _copy_escape(str(value))
+
+def _copy_json(value) -> str:
+    if value is None:
+        return '\\N'
+    return _copy_escape(json.dumps(value))
+
+def copy_rows_to_staging(db: Session, rows: list):
+    """Stream row tuples (COPY_COLUMNS order) into the session's staging table"""
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS property_staging (LIKE properties) ON COMMIT DELETE ROWS"
+    ))
+    
+    formatters = [_copy_json if c in JSON_COLUMNS else _copy_field for c in COPY_COLUMNS]
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(fmt(v) for fmt, v in zip(formatters, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    columns = ', '.join(COPY_COLUMNS)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY property_staging ({columns}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+def merge_staging(db: Session):
+    """
+    Upsert staged rows into properties; returns (inserted, updated).
+    
+    Existing rows are only rewritten when their content_hash differs, so
+    unchanged listings cost no writes. A price or status change appends an
+    old -> new entry to price_history and updated_at moves on every rewrite.
+    """
+    columns = ', '.join(COPY_COLUMNS)
+    assignments = ',\n            '.join(f"{c} = EXCLUDED.{c}" for c in UPDATE_COLUMNS)
+    result = db.execute(text(f"""
+        INSERT INTO properties ({columns}, location)
+        SELECT DISTINCT ON (id) {columns},
+               CASE WHEN latitude IS NOT NULL AND longitude IS NOT NULL
+                    THEN ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
+               END
+        FROM property_staging
+        ORDER BY id
+        ON CONFLICT (id) DO UPDATE SET
+            {assignments},
+            price_history = CASE
+                WHEN properties.price IS DISTINCT FROM EXCLUDED.price
+                  OR properties.status IS DISTINCT FROM EXCLUDED.status
+                THEN (
+                    coalesce(properties.price_history::jsonb, '[]'::jsonb)
+                    || jsonb_build_array(jsonb_build_object(
+                        'date', now(),
+                        'old_price', properties.price,
+                        'price', EXCLUDED.price,
+                        'old_status', properties.status,
+                        'status', EXCLUDED.status
+                    ))
+                )::json
+                ELSE properties.price_history
+            END,
+            updated_at = now()
+        WHERE properties.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS inserted
+    """)).scalars().all()
+    inserted = sum(1 for is_insert in result if is_insert)
+    return inserted, len(result) - inserted
+
+def property_references():
+    """(table, column) pairs with a foreign key to properties.id"""
+    return [
+        (table.name, fk.parent.name)
+        for table in Base.metadata.sorted_tables
+        for fk in table.foreign_keys
+        if fk.column.table.name == Property.__tablename__
+    ]
+
+def retire_legacy_ids(db: Session) -> int:
+    """
+    Replace rows stored under the old md5(mls_id) ids by their staged
+    listing-key rows: references (inquiries, CRM records) move to the new id,
+    then the old row is deleted. Run after merge_staging, in the same
+    transaction; returns rows retired.
+
+    Only the md5(mls_id) form is matched. The old fallback for records
+    without an mls_id hashed the raw address, coordinates and URL as Python
+    text (optionally with a random uuid suffix), which the staged columns
+    can't reproduce, so such rows are left in place and have to be removed
+    by hand. Every record in the current HomeHarvest export has an mls_id.
+    """
+    db.execute(text("""
+        CREATE TEMP TABLE IF NOT EXISTS property_id_moves (
+            old_id varchar PRIMARY KEY,
+            new_id varchar NOT NULL
+        ) ON COMMIT DELETE ROWS
+    """))
+    db.execute(text("""
+        INSERT INTO property_id_moves (old_id, new_id)
+        SELECT DISTINCT ON (p.id) p.id, s.id
+        FROM property_staging s
+        JOIN properties p ON p.id = left(md5(s.mls_number), 16)
+        WHERE s.mls_number IS NOT NULL AND p.id <> s.id
+        ORDER BY p.id, s.id
+    """))
+    for table, column in property_references():
+        db.execute(text(f"""
+            UPDATE {table} t SET {column} = m.new_id
+            FROM property_id_moves m
+            WHERE t.{column} = m.old_id
+        """))
+    result = db.execute(text("DELETE FROM properties p USING property_id_moves m WHERE p.id = m.old_id"))
+    return result.rowcount
+
+# ================== Manifest (incremental imports) ==================
+
+def load_manifest(db: Session) -> dict:
+    """
+    {path: (size, mtime, content_hash)} for every file imported with the
+    current FIELD_MAPPING_VERSION; files mapped by older versions count as new.
+    """
+    return {
+        m.path: (m.size, m.mtime, m.content_hash)
+        for m in db.query(ImportManifest.path, ImportManifest.size, ImportManifest.mtime, ImportManifest.content_hash)
+        .filter(ImportManifest.mapping_version == FIELD_MAPPING_VERSION)
+    }
+
+def manifest_key(data_dir: Path, zip_file: Path) -> str:
+    """Manifest path for a file: relative to the data dir, so it survives moving the tree"""
+    return Path(zip_file).relative_to(data_dir).as_posix()
+
+def is_unchanged(manifest: dict, key: str, size: int, mtime: float) -> bool:
+    """Cheap check: same size and mtime as when it was last imported"""
+    entry = manifest.get(key)
+    return entry is not None and entry[0] == size and entry[1] == mtime
+
+def iter_json_sources(data_path: str):
+    """Yield (state_name, {file path: (manifest key, size, mtime)}) for the JSON tree"""
+    data_dir = Path(data_path)
+    for state_name, zip_files in iter_state_files(data_dir / 'states'):
+        sources = {}
+        for zip_file in zip_files:
+            stat = zip_file.stat()
+            sources[str(zip_file)] = (manifest_key(data_dir, zip_file), stat.st_size, stat.st_mtime)
+        yield state_name, sources
+
+def record_manifest(db: Session, entries: list):
+    """Upsert manifest rows; call inside the transaction that wrote the files' data"""
+    if not entries:
+        return
+    db.execute(text("""
+        INSERT INTO import_manifest
+            (path, state, size, mtime, content_hash, row_count, run_id, mapping_version, imported_at)
+        VALUES (:path, :state, :size, :mtime, :content_hash, :row_count, :run_id, :mapping_version, now())
+        ON CONFLICT (path) DO UPDATE SET
+            size = EXCLUDED.size,
+            mtime = EXCLUDED.mtime,
+            content_hash = EXCLUDED.content_hash,
+            row_count = EXCLUDED.row_count,
+            run_id = EXCLUDED.run_id,
+            mapping_version = EXCLUDED.mapping_version,
+            imported_at = now()
+    """), entries)
+
+# ================== Checkpoints (resumable runs) ==================
+
+def start_run(db: Session, data_path: str, full: bool = False, resume: bool = False):
+    """
+    Return (run, committed_paths).
+    
+    With resume=True the latest unfinished run for data_path is picked up
+    again and committed_paths holds the files it already committed; otherwise
+    a new run is started and committed_paths is empty.
+    """
+    data_path = str(Path(data_path).resolve())
+    if resume:
+        run = (
+            db.query(ImportRun)
+            .filter(ImportRun.data_path == data_path, ImportRun.status != 'completed')
+            .order_by(ImportRun.id.desc())
+            .first()
+        )
+        if run is None:
+            print("ℹ️  No unfinished import to resume, starting a new run")
+        else:
+            committed = {
+                path for (path,) in db.query(ImportManifest.path).filter(ImportManifest.run_id == run.id)
+            }
+            print(f"⏯️  Resuming run #{run.id} after {run.last_file or 'the start'} "
+                  f"({len(committed):,} files already committed)")
+            run.status = 'running'
+            db.commit()
+            return run, committed
+    
+    run = ImportRun(data_path=data_path, full=full, status='running')
+    db.add(run)
+    db.commit()
+    return run, set()
+
+def advance_checkpoint(run: ImportRun, entries: list, rows: int):
+    """Move the run's checkpoint past entries; committed with the batch they describe"""
+    if not entries:
+        return
+    run.last_state = entries[-1]['state']
+    run.last_file = entries[-1]['path']
+    run.files_done += len(entries)
+    run.rows_done += rows
+
+def finish_run(db: Session, run: ImportRun, status: str):
+    """Mark the run completed or failed"""
+    run.status = status
+    run.finished_at = datetime.now().astimezone()
+    db.commit()
+
+# ================== Parsing (inline or process pool) ==================
+
+# Source bytes per parse task. The field mapping runs once per task, so its
+# fixed pandas overhead is shared by a few thousand rows; capping by bytes
+# rather than file count keeps a task's working set flat on the largest zips.
+PARSE_BYTES_PER_TASK = 4 * 1024 * 1024
+
+def convert_to_tuples(records):
+    """Convert HomeHarvest records into compact COPY_COLUMNS tuples, skipping unpriced ones"""
+    return list(map_records(records_frame(records)).itertuples(index=False, name=None))
+
+def read_source_tuples(zip_file: str, stream: bool = False):
+    """
+    Read and hash one file; return (content_hash, records as SOURCE_KEYS tuples).
+    
+    With stream=True records are parsed one at a time, so the file is never
+    held as a list of 60-key dicts; only the compact tuples are kept.
+    """
+    if stream:
+        with open(zip_file, 'rb') as f:
+            reader = HashingReader(f)
+            records = [tuple(r.get(key) for key in SOURCE_KEYS) for r in iter_records(reader)]
+            return reader.hexdigest(), records
+    raw = Path(zip_file).read_bytes()
+    return (
+        hashlib.sha256(raw).hexdigest(),
+        [tuple(r.get(key) for key in SOURCE_KEYS) for r in parse_records(raw)]
+    )
+
+def parse_zip_files(zip_files: list, stream: bool = False) -> list:
+    """
+    Read, hash, parse and convert a group of files into COPY tuples with a
+    single field-mapping pass.
+    Runs in worker processes with --workers, so it returns only plain,
+    picklable values: [(zip_file, content_hash, rows, error), ...].
+    """
+    results = []
+    source_rows = []
+    owners = []
+    for zip_file in zip_files:
+        try:
+            content_hash, records = read_source_tuples(zip_file, stream)
+        except Exception as e:
+            results.append((zip_file, None, None, str(e)))
+            continue
+        owners.extend([len(results)] * len(records))
+        source_rows.extend(records)
+        results.append((zip_file, content_hash, [], None))
+    
+    mapped = map_records(pd.DataFrame.from_records(source_rows, columns=SOURCE_KEYS))
+    for owner, row in zip(np.asarray(owners, dtype=np.int64)[mapped.index], mapped.itertuples(index=False, name=None)):
+        results[owner][2].append(row)
+    return results
+
+def parse_zip_file(zip_file: str, stream: bool = False):
+    """parse_zip_files for one file: (zip_file, content_hash, rows, error)"""
+    return parse_zip_files([zip_file], stream)[0]
+
+def group_files_by_size(zip_files: list, max_bytes: int):
+    """Yield lists of paths totalling about max_bytes (a larger file gets a list of its own)"""
+    group, group_bytes = [], 0
+    for zip_file in zip_files:
+        size = os.path.getsize(zip_file)
+        if group and group_bytes + size > max_bytes:
+            yield group
+            group, group_bytes = [], 0
+        group.append(str(zip_file))
+        group_bytes += size
+    if group:
+        yield group
+
+def iter_parsed_files(
+    zip_files: list,
+    executor: ProcessPoolExecutor = None,
+    max_pending: int = 8,
+    stream: bool = False
+):
+    """
+    Yield parse_zip_file results for each file, parsed in groups of about
+    PARSE_BYTES_PER_TASK.
+    
+    With an executor, at most `max_pending` groups are in flight or waiting
+    for the writer. That bounded window is the backpressure: when the single
+    writer falls behind, workers idle instead of piling parsed rows up in
+    memory. Results come back in file order whichever worker finishes
+    first, so the cross-file dedup keeps the same copy of a listing on
+    every run.
+    """
+    groups = group_files_by_size(zip_files, PARSE_BYTES_PER_TASK)
+    
+    if executor is None:
+        for group in groups:
+            yield from parse_zip_files(group, stream)
+        return
+    
+    pending = deque(
+        executor.submit(parse_zip_files, group, stream) for group in itertools.islice(groups, max_pending)
+    )
+    while pending:
+        results = pending.popleft().result()
+        next_group = next(groups, None)
+        if next_group is not None:
+            pending.append(executor.submit(parse_zip_files, next_group, stream))
+        yield from results
+
+# ================== Parquet Cache ==================
+
+# Typed schema of the raw HomeHarvest records. Listed keys are cast to these
+# types, every other known key is stored as a string, and nested values
+# (phones, schools, tax history) as JSON text. Keys not listed here are dropped.
+PARQUET_INT_COLUMNS = (
+    'beds', 'full_baths', 'half_baths', 'sqft', 'year_built', 'days_on_mls',
+    'list_price', 'list_price_min', 'list_price_max', 'sold_price', 'last_sold_price',
+    'last_update_date', 'assessed_value', 'estimated_value', 'tax', 'lot_sqft',
+    'price_per_sqft', 'stories', 'hoa_fee',
+)
+PARQUET_FLOAT_COLUMNS = ('latitude', 'longitude', 'parking_garage')
+PARQUET_BOOL_COLUMNS = ('new_construction',)
+PARQUET_DATETIME_COLUMNS = ('list_date', 'pending_date', 'last_sold_date', 'last_status_change_date')
+PARQUET_JSON_COLUMNS = ('agent_phones', 'office_phones', 'tax_history', 'nearby_schools')
+PARQUET_STRING_COLUMNS = (
+    'property_url', 'property_id', 'listing_id', 'permalink', 'mls', 'mls_id', 'status',
+    'mls_status', 'text', 'style', 'formatted_address', 'full_street_line', 'street', 'unit',
+    'city', 'state', 'zip_code', 'neighborhoods', 'county', 'fips_code', 'agent_id',
+    'agent_name', 'agent_email', 'agent_mls_set', 'agent_nrds_id', 'broker_id', 'broker_name',
+    'builder_id', 'builder_name', 'office_id', 'office_mls_set', 'office_name', 'office_email',
+    'primary_photo', 'alt_photos', 'search_zip',
+    'source_file',  # Manifest key of the JSON file the record came from
+)
+
+# Per-file size/mtime/hash at build time, so Parquet imports use the manifest too.
+# Leading underscore: pyarrow dataset discovery skips it.
+PARQUET_FILES_INDEX = '_files.parquet'
+PARQUET_FILES_PER_ROW_GROUP = 50
+
+def parquet_schema() -> pa.Schema:
+    fields = (
+        [pa.field(c, pa.int64()) for c in PARQUET_INT_COLUMNS]
+        + [pa.field(c, pa.float64()) for c in PARQUET_FLOAT_COLUMNS]
+        + [pa.field(c, pa.bool_()) for c in PARQUET_BOOL_COLUMNS]
+        + [pa.field(c, pa.timestamp('us')) for c in PARQUET_DATETIME_COLUMNS]
+        + [pa.field(c, pa.string()) for c in PARQUET_JSON_COLUMNS + PARQUET_STRING_COLUMNS]
+    )
+    return pa.schema(fields)
+
+def _is_missing(value) -> bool:
+    # None, or the NaN pandas fills in for keys absent from a record
+    return value is None or (isinstance(value, float) and value != value)
+
+def records_to_table(records: list, schema: pa.Schema) -> pa.Table:
+    """Cast raw HomeHarvest dicts to the Parquet schema"""
+    df = pd.DataFrame.from_records(records, columns=schema.names)
+    for c in PARQUET_INT_COLUMNS:
+        # Truncate like _int_column(): some integer fields arrive as floats or strings
+        df[c] = pd.to_numeric(df[c], errors='coerce').apply(lambda v: v if pd.isna(v) else int(v)).astype('Int64')
+    for c in PARQUET_FLOAT_COLUMNS:
+        df[c] = pd.to_numeric(df[c], errors='coerce')
+    for c in PARQUET_BOOL_COLUMNS:
+        df[c] = df[c].astype('boolean')
+    for c in PARQUET_DATETIME_COLUMNS:
+        df[c] = pd.to_datetime(df[c], errors='coerce', format='ISO8601')
+    for c in PARQUET_JSON_COLUMNS:
+        df[c] = df[c].map(lambda v: None if _is_missing(v) else json.dumps(v))
+    for c in PARQUET_STRING_COLUMNS:
+        df[c] = df[c].map(lambda v: None if _is_missing(v) else v if isinstance(v, str) else str(v))
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+def build_parquet_cache(data_path: str, parquet_path: str) -> int:
+    """
+    Convert data/states/<state>/<zip>.json into a Parquet dataset partitioned
+    by state: <parquet_path>/source_state=<state>/data.parquet.
+    
+    A state is rewritten only when one of its files changed size or mtime
+    since the last build. Returns the number of states written.
+    """
+    out_dir = Path(parquet_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / PARQUET_FILES_INDEX
+    previous = pd.read_parquet(index_path) if index_path.exists() else pd.DataFrame(
+        columns=['path', 'state', 'size', 'mtime', 'content_hash', 'records']
+    )
+    schema = parquet_schema()
+    entries = []
+    written = 0
+    
+    for state_name, sources in iter_json_sources(data_path):
+        partition = out_dir / f"source_state={state_name}"
+        built = previous[previous['state'] == state_name]
+        built = {row.path: (row.size, row.mtime) for row in built.itertuples()}
+        current = {key: (size, mtime) for key, size, mtime in sources.values()}
+        if built == current and (partition / 'data.parquet').exists():
+            entries.extend(previous[previous['state'] == state_name].to_dict('records'))
+            print(f"   ⏭️  {state_name.upper()}: unchanged")
+            continue
+        
+        partition.mkdir(exist_ok=True)
+        tmp_path = partition / 'data.parquet.tmp'
+        records_total = 0
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            paths = list(sources)
+            for i in range(0, len(paths), PARQUET_FILES_PER_ROW_GROUP):
+                records = []
+                for zip_file in paths[i:i + PARQUET_FILES_PER_ROW_GROUP]:
+                    key, size, mtime = sources[zip_file]
+                    with open(zip_file, 'rb') as f:
+                        reader = HashingReader(f)
+                        count = 0
+                        for record in iter_records(reader):
+                            record['source_file'] = key
+                            records.append(record)
+                            count += 1
+                        content_hash = reader.hexdigest()
+                    entries.append({
+                        'path': key, 'state': state_name, 'size': size, 'mtime': mtime,
+                        'content_hash': content_hash, 'records': count,
+                    })
+                    records_total += count
+                if records:
+                    writer.write_table(records_to_table(records, schema))
+        os.replace(tmp_path, partition / 'data.parquet')
+        written += 1
+        print(f"   💾 {state_name.upper()}: {len(sources)} files, {records_total:,} records")
+    
+    pd.DataFrame(entries, columns=previous.columns).to_parquet(index_path, index=False)
+    return written
+
+def iter_parquet_sources(parquet_path: str):
+    """Yield (state_name, {manifest key: (manifest key, size, mtime)}) from the cache index"""
+    index = pd.read_parquet(Path(parquet_path) / PARQUET_FILES_INDEX)
+    for state_name, files in index.sort_values('path').groupby('state'):
+        yield state_name, {
+            row.path: (row.path, int(row.size), float(row.mtime)) for row in files.itertuples()
+        }
+
+def iter_parquet_files(parquet_path: str, state_name: str, files: dict):
+    """
+    parse_zip_file equivalent for the cache: yield (key, content_hash, rows, None)
+    for each requested file, in the order of `files`, reading only the
+    columns the converter uses.
+    """
+    if not files:
+        return
+    index = pd.read_parquet(Path(parquet_path) / PARQUET_FILES_INDEX, filters=[('state', '==', state_name)])
+    hashes = dict(zip(index['path'], index['content_hash']))
+    
+    schema = pq.read_schema(Path(parquet_path) / f"source_state={state_name}" / 'data.parquet')
+    columns = [c for c in SOURCE_KEYS if c in schema.names] + ['source_file']
+    df = pd.read_parquet(
+        Path(parquet_path) / f"source_state={state_name}" / 'data.parquet',
+        columns=columns,
+        filters=[('source_file', 'in', list(files))],
+        dtype_backend='numpy_nullable'  # Keep nullable ints as ints, not floats
+    )
+    
+    # One mapping pass for the whole state, then split back into files
+    mapped = map_records(df)
+    source_files = df.loc[mapped.index, 'source_file']
+    positions = mapped.groupby(source_files.values, sort=False).indices
+    for key in files:
+        # Files without priced records have no positions and get no rows
+        group = mapped.iloc[positions.get(key, [])]
+        yield key, hashes[key], list(group.itertuples(index=False, name=None)), None
+
+def bulk_load_properties(
+    data_path: str,
+    db: Session,
+    batch_size: int = 5000,
+    workers: int = 1,
+    full: bool = False,
+    resume: bool = False,
+    stream: bool = False,
+    parquet_path: str = None
+):
+    """
+    Load ALL properties by COPYing batches into a staging table and merging with ON CONFLICT.
+    With workers > 1, files are parsed and converted in a process pool while
+    this process stays the only database writer.
+    
+    Files recorded in import_manifest with the same size and mtime are
+    skipped without being read; files whose content hash still matches are
+    skipped after hashing. Pass full=True to reprocess everything.
+    
+    A listing found in several zip files is written once per run (the first
+    file in path order wins, however many workers parse), and rows still stored under the old md5(mls_id) ids are retired
+    as their listings come through (see retire_legacy_ids).
+    
+    Each batch commits together with its manifest rows and the run
+    checkpoint. A failed batch rolls back, marks the run failed and stops;
+    resume=True then continues after the last committed file.
+    
+    stream=True parses files record by record (see parse_zip_file) to keep
+    memory flat on the largest zip codes. parquet_path reads the cache built
+    by build_parquet_cache instead of the JSON tree.
+    """
+    if parquet_path:
+        if not (Path(parquet_path) / PARQUET_FILES_INDEX).exists():
+            print(f"❌ Parquet cache not found: {parquet_path} (build it with --build-parquet)")
+            return 0
+        print(f"📂 Bulk loading properties from Parquet cache: {parquet_path}")
+        sources_by_state = iter_parquet_sources(parquet_path)
+    else:
+        states_dir = Path(data_path) / 'states'
+        if not states_dir.exists():
+            print(f"❌ States directory not found: {states_dir}")
+            return 0
+        print(f"📂 Bulk loading properties from: {states_dir} ({workers} worker{'s' if workers != 1 else ''})")
+        sources_by_state = iter_json_sources(data_path)
+    start = time.perf_counter()
+    
+    run, committed = start_run(db, parquet_path or data_path, full=full, resume=resume)
+    manifest = {} if run.full else load_manifest(db)
+    if manifest:
+        print(f"📒 Manifest: {len(manifest):,} previously imported files")
+    
+    # spawn, not fork: the parent holds open database connections
+    executor = None
+    if workers > 1 and not parquet_path:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    
+    total_loaded = 0
+    total_updated = 0
+    total_retired = 0
+    total_duplicates = 0
+    total_skipped = 0
+    total_files = 0
+    unchanged_files = 0
+    resumed_files = 0
+    batch = []
+    batch_manifest = []
+    
+    def flush():
+        nonlocal total_loaded, total_updated, total_retired, total_skipped, batch, batch_manifest
+        if not batch and not batch_manifest:
+            return
+        try:
+            inserted = updated = 0
+            if batch:
+                copy_rows_to_staging(db, batch)
+                inserted, updated = merge_staging(db)
+                total_retired += retire_legacy_ids(db)
+            record_manifest(db, batch_manifest)
+            advance_checkpoint(run, batch_manifest, len(batch))
+            db.commit()
+            total_loaded += inserted
+            total_updated += updated
+            total_skipped += len(batch) - inserted - updated
+            rate = (total_loaded + total_updated + total_skipped) / (time.perf_counter() - start)
+            print(f"   💾 Batch merged: {total_loaded:,} new | {total_updated:,} updated | "
+                  f"{total_skipped:,} unchanged | {rate:,.0f} rows/sec")
+        except Exception as e:
+            print(f"   ⚠️  Batch error, rolling back: {str(e)[:100]}")
+            db.rollback()
+            raise
+        batch = []
+        batch_manifest = []
+    
+    seen = CompactHashSet()
+    
+    try:
+        for state_name, sources in sources_by_state:
+            files = {}
+            for source, (key, size, mtime) in sources.items():
+                if key in committed:
+                    resumed_files += 1
+                elif is_unchanged(manifest, key, size, mtime):
+                    unchanged_files += 1
+                else:
+                    files[source] = (key, size, mtime)
+            
+            print(f"\n📍 {state_name.upper()}: {len(sources)} zip codes, {len(files)} new or changed")
+            
+            if parquet_path:
+                parsed = iter_parquet_files(parquet_path, state_name, files)
+            else:
+                parsed = iter_parsed_files(list(files), executor, max_pending=workers * 2, stream=stream)
+            
+            for source, content_hash, rows, error in parsed:
+                total_files += 1
+                if error is not None:
+                    print(f"   ⚠️  File error in {Path(source).name}")
+                    continue
+                
+                key, size, mtime = files[source]
+                # Listings already taken from another file in this run are dropped here,
+                # before they cost a COPY and a merge
+                first_seen = seen.add_many(id_keys([row[0] for row in rows]))
+                previous = manifest.get(key)
+                if previous is None or previous[2] != content_hash:
+                    # Touched-but-identical files only refresh their manifest row
+                    batch.extend(row for row, is_new in zip(rows, first_seen) if is_new)
+                    total_duplicates += len(rows) - int(first_seen.sum())
+                else:
+                    unchanged_files += 1
+                batch_manifest.append({
+                    'path': key,
+                    'state': state_name,
+                    'size': size,
+                    'mtime': mtime,
+                    'content_hash': content_hash,
+                    'row_count': len(rows),
+                    'run_id': run.id,
+                    'mapping_version': FIELD_MAPPING_VERSION,
+                })
+                if len(batch) >= batch_size:
+                    flush()
+            
+            flush()
+        
+        finish_run(db, run, 'completed')
+    except BaseException:
+        db.rollback()
+        finish_run(db, run, 'failed')
+        print(f"\n⏸️  Run #{run.id} stopped after {run.last_file or 'no files'}; "
+              f"re-run with --resume to continue from there")
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    
+    elapsed = time.perf_counter() - start
+    print(f"\n{'='*60}")
+    print(f"✅ Bulk Import Complete!")
+    print(f"📊 Total Properties Loaded: {total_loaded:,}")
+    print(f"🔄 Updated (changed since last import): {total_updated:,}")
+    print(f"⏭️  Skipped (unchanged): {total_skipped:,}")
+    print(f"🧬 Duplicates Dropped (same listing in several files): {total_duplicates:,}")
+    if total_retired:
+        print(f"🧹 Legacy Ids Retired: {total_retired:,}")
+    print(f"📁 Files Processed: {total_files:,}")
+    print(f"📒 Unchanged Files Skipped: {unchanged_files:,}")
+    if resumed_files:
+        print(f"⏯️  Already Committed (resumed): {resumed_files:,}")
+    print(f"⏱️  Time Elapsed: {elapsed:,.1f}s "
+          f"({(total_loaded + total_updated + total_skipped) / max(elapsed, 1e-9):,.0f} rows/sec)")
+    print(f"{'='*60}")
+    
+    return total_loaded
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import HomeHarvest JSON data into PostgreSQL")
+    parser.add_argument('--data-path', default=os.getenv('DATA_PATH', '/Users/shyamway/Desktop/Projects/homefinder/data'),
+                        help="Directory containing states/<state>/<zip>.json (default: $DATA_PATH)")
+    parser.add_argument('--orm', action='store_true',
+                        help="Use the slower per-row ORM path instead of COPY")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes parsing JSON in parallel (bulk path only; default: 1)")
+    parser.add_argument('--full', action='store_true',
+                        help="Ignore the import manifest and reprocess every file")
+    parser.add_argument('--build-parquet', metavar='PARQUET_PATH',
+                        help="Convert the JSON tree into a Parquet cache partitioned by state, then exit")
+    parser.add_argument('--from-parquet', metavar='PARQUET_PATH',
+                        help="Import from a Parquet cache instead of the JSON tree")
+    parser.add_argument('--stream', action='store_true',
+                        help="Parse files record by record to bound memory (uses ijson if installed)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the last unfinished bulk import after its last committed file")
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help="Rows per commit (default: 5000 bulk, 500 ORM)")
+    parser.add_argument('--yes', action='store_true', help="Skip the confirmation prompt")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    
+    if args.build_parquet:
+        print(f"🧱 Building Parquet cache: {args.data_path} -> {args.build_parquet}")
+        start = time.perf_counter()
+        written = build_parquet_cache(args.data_path, args.build_parquet)
+        print(f"✅ {written} state partition(s) written in {time.perf_counter() - start:,.1f}s")
+        exit()
+    
     print("🚀 Tailor Home Finder - FULL DATA IMPORT v2")
     print("=" * 60)
     print("⚠️  This will import ALL remaining property data!")
     print("=" * 60)
     
-    confirm = input("\n👉 Type 'YES' to proceed: ")
-    if confirm.upper() != 'YES':
-        print("❌ Import cancelled.")
-        exit()
+    if not args.yes:
+        confirm = input("\n👉 Type 'YES' to proceed: ")
+        if confirm.upper() != 'YES':
+            print("❌ Import cancelled.")
+            exit()
     
     print("\n📊 Ensuring database tables exist...")
     Base.metadata.create_all(bind=engine)
     
-    data_path = os.getenv('DATA_PATH', '/Users/shyamway/Desktop/Projects/homefinder/data')
     db = SessionLocal()
     
     try:
@@ -194,11 +1228,26 @@ if __name__ == "__main__":
         print(f"📈 Current properties in database: {current_count:,}")
         
         print(f"\n🔄 Starting FULL import...")
-        loaded = load_all_properties(data_path, db, batch_size=500)
+        if args.orm:
+            loaded = load_all_properties(args.data_path, db, batch_size=args.batch_size or 500)
+        else:
+            loaded = bulk_load_properties(
+                args.data_path, db, batch_size=args.batch_size or 5000,
+                workers=max(1, args.workers), full=args.full, resume=args.resume,
+                stream=args.stream, parquet_path=args.from_parquet
+            )
         
         final_count = db.query(Property).count()
         print(f"\n🎉 Final database count: {final_count:,} properties!")
         
+        print(f"\n🗺️  Refreshing map clusters...")
+        clusters = MapService(db).refresh_clusters()
+        print(f"   ✅ {clusters:,} clusters across all zoom levels")
+        
+        print(f"\n🔎 Refreshing search suggestions...")
+        suggestions = PropertyService(db).refresh_suggestions()
+        print(f"   ✅ {suggestions:,} city/zip/address suggestions")
+        
     except Exception as e:
         print(f"\n❌ Fatal Error: {e}")
         db.rollback()
@@ -1,14 +1,19 @@
 """
 Admin API endpoints - Dashboard stats, feature settings, activity logs
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
+from typing import Optional, Literal
 from datetime import datetime, timedelta
+import secrets
 import uuid
 
-from ..db.database import get_db
+from ..core.config import settings
+from ..db.database import get_async_db
+from ..db.pool import pool_stats
+from ..db.query_log import query_stats, reset_query_stats
+from ..db.routing import get_read_db
 from ..models import (
     User,
     Agent,
@@ -37,56 +42,69 @@ from ..schemas import (
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 
+# ================== Auth ==================
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Only callers presenting ADMIN_API_KEY get through; nobody does while it's unset"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API key is not configured")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+
 # ================== Dashboard Stats ==================
 
 @router.get("/stats", response_model=AdminDashboardStats)
-async def get_admin_dashboard_stats(db: Session = Depends(get_db)):
+async def get_admin_dashboard_stats(db: AsyncSession = Depends(get_read_db)):
     """Get admin dashboard overview statistics"""
     now = datetime.utcnow()
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
+    def count(model):
+        return select(func.count()).select_from(model)
+
     # User stats
-    total_customers = db.query(User).filter(User.role == "customer").count()
-    active_customers = db.query(User).filter(
+    total_customers = await db.scalar(count(User).where(User.role == "customer"))
+    active_customers = await db.scalar(count(User).where(
         and_(User.role == "customer", User.status == UserStatus.ACTIVE.value)
-    ).count()
+    ))
 
     # Agent stats
-    total_agents = db.query(Agent).count()
-    active_agents = db.query(Agent).filter(
+    total_agents = await db.scalar(count(Agent))
+    active_agents = await db.scalar(count(Agent).where(
         Agent.status == AgentStatus.ACTIVE.value
-    ).count()
+    ))
 
     # Inquiry stats
-    total_inquiries = db.query(Inquiry).count()
-    new_inquiries = db.query(Inquiry).filter(
+    total_inquiries = await db.scalar(count(Inquiry))
+    new_inquiries = await db.scalar(count(Inquiry).where(
         Inquiry.status == InquiryStatus.NEW.value
-    ).count()
+    ))
 
     # Property stats
-    total_properties = db.query(Property).count()
+    total_properties = await db.scalar(count(Property))
     # For properties_viewed, we'd need a views table - using 0 for now
     properties_viewed = 0
 
     # Pipeline stats this month
-    leads_this_month = db.query(CustomerPipeline).filter(
+    leads_this_month = await db.scalar(count(CustomerPipeline).where(
         CustomerPipeline.created_at >= month_start
-    ).count()
+    ))
 
-    conversions_this_month = db.query(CustomerPipeline).filter(
+    conversions_this_month = await db.scalar(count(CustomerPipeline).where(
         and_(
             CustomerPipeline.stage == PipelineStage.CLOSED_WON.value,
             CustomerPipeline.last_stage_change >= month_start
         )
-    ).count()
+    ))
 
     # Revenue this month (sum of deal values for closed deals)
-    revenue = db.query(func.sum(CustomerPipeline.deal_value)).filter(
+    revenue = await db.scalar(select(func.sum(CustomerPipeline.deal_value)).where(
         and_(
             CustomerPipeline.stage == PipelineStage.CLOSED_WON.value,
             CustomerPipeline.last_stage_change >= month_start
         )
-    ).scalar()
+    ))
 
     return AdminDashboardStats(
         total_customers=total_customers,
@@ -103,23 +121,58 @@ async def get_admin_dashboard_stats(db: Session = Depends(get_db)):
     )
 
 
+@router.get("/stats/queries", dependencies=[Depends(require_admin_key)])
+async def get_query_stats(
+    sort: Literal["total", "count", "p95", "max"] = "total",
+    limit: int = Query(50, ge=1, le=500),
+    include_explain: bool = True
+):
+    """
+    Statement profile for this worker: count, total, p95 and max time per
+    normalized SQL fingerprint, with the last EXPLAIN (ANALYZE, BUFFERS)
+    captured for slow SELECTs
+    """
+    return {"queries": query_stats(sort, limit, include_explain)}
+
+
+@router.delete("/stats/queries", dependencies=[Depends(require_admin_key)])
+async def clear_query_stats():
+    """Clear this worker's statement profile"""
+    reset_query_stats()
+    return {"success": True}
+
+
+# ================== Metrics ==================
+
+@router.get("/metrics/pool")
+async def get_pool_metrics():
+    """
+    Connection pool metrics for each database engine in this worker:
+    checkout wait histogram, in-use/overflow gauges, timeouts and the cost
+    of idle-connection validation. Each uvicorn worker reports its own pools.
+    """
+    return {"pools": pool_stats()}
+
+
 # ================== Feature Settings ==================
 
 @router.get("/features", response_model=FeatureSettingList)
 async def get_feature_settings(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     category: Optional[str] = None,
     is_enabled: Optional[bool] = None
 ):
     """Get all feature settings"""
-    query = db.query(FeatureSettings)
+    query = select(FeatureSettings)
 
     if category:
-        query = query.filter(FeatureSettings.category == category)
+        query = query.where(FeatureSettings.category == category)
     if is_enabled is not None:
-        query = query.filter(FeatureSettings.is_enabled == is_enabled)
+        query = query.where(FeatureSettings.is_enabled == is_enabled)
 
-    features = query.order_by(FeatureSettings.display_order, FeatureSettings.feature_key).all()
+    features = (await db.scalars(
+        query.order_by(FeatureSettings.display_order, FeatureSettings.feature_key)
+    )).all()
 
     return FeatureSettingList(
         total=len(features),
@@ -128,11 +181,11 @@ async def get_feature_settings(
 
 
 @router.get("/features/{feature_key}", response_model=FeatureSettingResponse)
-async def get_feature_setting(feature_key: str, db: Session = Depends(get_db)):
+async def get_feature_setting(feature_key: str, db: AsyncSession = Depends(get_async_db)):
     """Get single feature setting by key"""
-    feature = db.query(FeatureSettings).filter(
-        FeatureSettings.feature_key == feature_key
-    ).first()
+    feature = await db.scalar(
+        select(FeatureSettings).where(FeatureSettings.feature_key == feature_key)
+    )
     if not feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
@@ -142,12 +195,12 @@ async def get_feature_setting(feature_key: str, db: Session = Depends(get_db)):
 @router.post("/features", response_model=FeatureSettingResponse)
 async def create_feature_setting(
     data: FeatureSettingCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new feature setting"""
-    existing = db.query(FeatureSettings).filter(
-        FeatureSettings.feature_key == data.feature_key
-    ).first()
+    existing = await db.scalar(
+        select(FeatureSettings).where(FeatureSettings.feature_key == data.feature_key)
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Feature key already exists")
 
@@ -157,8 +210,8 @@ async def create_feature_setting(
     )
 
     db.add(feature)
-    db.commit()
-    db.refresh(feature)
+    await db.commit()
+    await db.refresh(feature)
 
     return FeatureSettingResponse.model_validate(feature)
 
@@ -167,12 +220,12 @@ async def create_feature_setting(
 async def update_feature_setting(
     feature_key: str,
     data: FeatureSettingUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a feature setting"""
-    feature = db.query(FeatureSettings).filter(
-        FeatureSettings.feature_key == feature_key
-    ).first()
+    feature = await db.scalar(
+        select(FeatureSettings).where(FeatureSettings.feature_key == feature_key)
+    )
     if not feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
@@ -180,8 +233,8 @@ async def update_feature_setting(
         if value is not None:
             setattr(feature, key, value)
 
-    db.commit()
-    db.refresh(feature)
+    await db.commit()
+    await db.refresh(feature)
 
     return FeatureSettingResponse.model_validate(feature)
 
@@ -190,12 +243,12 @@ async def update_feature_setting(
 async def toggle_feature(
     feature_key: str,
     toggle: FeatureToggle,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle a feature on/off"""
-    feature = db.query(FeatureSettings).filter(
-        FeatureSettings.feature_key == feature_key
-    ).first()
+    feature = await db.scalar(
+        select(FeatureSettings).where(FeatureSettings.feature_key == feature_key)
+    )
     if not feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
@@ -203,28 +256,28 @@ async def toggle_feature(
     feature.enabled_by = toggle.enabled_by
     feature.enabled_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(feature)
+    await db.commit()
+    await db.refresh(feature)
 
     return FeatureSettingResponse.model_validate(feature)
 
 
 @router.delete("/features/{feature_key}")
-async def delete_feature_setting(feature_key: str, db: Session = Depends(get_db)):
+async def delete_feature_setting(feature_key: str, db: AsyncSession = Depends(get_async_db)):
     """Delete a feature setting"""
-    feature = db.query(FeatureSettings).filter(
-        FeatureSettings.feature_key == feature_key
-    ).first()
+    feature = await db.scalar(
+        select(FeatureSettings).where(FeatureSettings.feature_key == feature_key)
+    )
     if not feature:
         raise HTTPException(status_code=404, detail="Feature not found")
 
-    db.delete(feature)
-    db.commit()
+    await db.delete(feature)
+    await db.commit()
     return {"success": True}
 
 
 @router.post("/features/seed")
-async def seed_default_features(db: Session = Depends(get_db)):
+async def seed_default_features(db: AsyncSession = Depends(get_async_db)):
     """Seed default feature settings"""
     default_features = [
         {
@@ -327,9 +380,9 @@ async def seed_default_features(db: Session = Depends(get_db)):
 
     created = 0
     for feature_data in default_features:
-        existing = db.query(FeatureSettings).filter(
-            FeatureSettings.feature_key == feature_data["feature_key"]
-        ).first()
+        existing = await db.scalar(
+            select(FeatureSettings).where(FeatureSettings.feature_key == feature_data["feature_key"])
+        )
         if not existing:
             feature = FeatureSettings(
                 id=str(uuid.uuid4()),
@@ -338,7 +391,7 @@ async def seed_default_features(db: Session = Depends(get_db)):
             db.add(feature)
             created += 1
 
-    db.commit()
+    await db.commit()
     return {"success": True, "created": created}
 
 
@@ -346,7 +399,7 @@ async def seed_default_features(db: Session = Depends(get_db)):
 
 @router.get("/activity", response_model=ActivityLogList)
 async def get_activity_logs(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     actor_id: Optional[str] = None,
     actor_type: Optional[str] = None,
     action: Optional[str] = None,
@@ -357,23 +410,25 @@ async def get_activity_logs(
     offset: int = Query(0, ge=0)
 ):
     """Get activity logs with filters"""
-    query = db.query(ActivityLog)
+    query = select(ActivityLog)
 
     if actor_id:
-        query = query.filter(ActivityLog.actor_id == actor_id)
+        query = query.where(ActivityLog.actor_id == actor_id)
     if actor_type:
-        query = query.filter(ActivityLog.actor_type == actor_type)
+        query = query.where(ActivityLog.actor_type == actor_type)
     if action:
-        query = query.filter(ActivityLog.action == action)
+        query = query.where(ActivityLog.action == action)
     if action_category:
-        query = query.filter(ActivityLog.action_category == action_category)
+        query = query.where(ActivityLog.action_category == action_category)
     if target_type:
-        query = query.filter(ActivityLog.target_type == target_type)
+        query = query.where(ActivityLog.target_type == target_type)
     if target_id:
-        query = query.filter(ActivityLog.target_id == target_id)
+        query = query.where(ActivityLog.target_id == target_id)
 
-    total = query.count()
-    activities = query.order_by(ActivityLog.created_at.desc()).offset(offset).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    activities = (await db.scalars(
+        query.order_by(ActivityLog.created_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     return ActivityLogList(
         total=total,
@@ -386,7 +441,7 @@ async def get_activity_logs(
 @router.post("/activity", response_model=ActivityLogResponse)
 async def create_activity_log(
     data: ActivityLogCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new activity log entry"""
     activity = ActivityLog(
@@ -395,24 +450,23 @@ async def create_activity_log(
     )
 
     db.add(activity)
-    db.commit()
-    db.refresh(activity)
+    await db.commit()
+    await db.refresh(activity)
 
     return ActivityLogResponse.model_validate(activity)
 
 
 @router.get("/activity/recent")
 async def get_recent_activity(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     limit: int = Query(10, ge=1, le=50)
 ):
     """Get recent activity for admin dashboard"""
-    activities = (
-        db.query(ActivityLog)
+    activities = (await db.scalars(
+        select(ActivityLog)
         .order_by(ActivityLog.created_at.desc())
         .limit(limit)
-        .all()
-    )
+    )).all()
 
     return {
         "activities": [
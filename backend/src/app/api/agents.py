@@ -2,13 +2,14 @@
 Agent management API endpoints - Admin only
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select
 from typing import Optional
 from datetime import datetime
 import uuid
 
-from ..db.database import get_db
+from ..db.database import get_async_db
+from ..db.routing import get_read_db
 from ..models import Agent, AgentStatus, AgentRole, User
 from ..schemas import (
     AgentCreate,
@@ -24,7 +25,7 @@ router = APIRouter(prefix="/api/agents", tags=["Agents"])
 
 @router.get("/", response_model=AgentList)
 async def get_agents(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status: Optional[str] = None,
     role: Optional[str] = None,
     is_admin: Optional[bool] = None,
@@ -33,18 +34,18 @@ async def get_agents(
     offset: int = Query(0, ge=0)
 ):
     """Get all agents with optional filters"""
-    query = db.query(Agent)
+    query = select(Agent)
 
     # Apply filters
     if status:
-        query = query.filter(Agent.status == status)
+        query = query.where(Agent.status == status)
     if role:
-        query = query.filter(Agent.role == role)
+        query = query.where(Agent.role == role)
     if is_admin is not None:
-        query = query.filter(Agent.is_admin == is_admin)
+        query = query.where(Agent.is_admin == is_admin)
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Agent.email.ilike(search_term),
                 Agent.first_name.ilike(search_term),
@@ -54,10 +55,12 @@ async def get_agents(
         )
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Apply pagination and ordering
-    agents = query.order_by(Agent.created_at.desc()).offset(offset).limit(limit).all()
+    agents = (await db.scalars(
+        query.order_by(Agent.created_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     # Convert to response with computed fields
     agent_responses = []
@@ -78,46 +81,43 @@ async def get_agents(
 
 
 @router.get("/stats", response_model=AgentStats)
-async def get_agent_stats(db: Session = Depends(get_db)):
+async def get_agent_stats(db: AsyncSession = Depends(get_read_db)):
     """Get agent statistics"""
-    total = db.query(Agent).count()
-    active = db.query(Agent).filter(Agent.status == AgentStatus.ACTIVE.value).count()
+    count_agents = select(func.count()).select_from(Agent)
+    total = await db.scalar(count_agents)
+    active = await db.scalar(count_agents.where(Agent.status == AgentStatus.ACTIVE.value))
 
     # Total customers managed
-    total_customers = db.query(func.sum(Agent.total_customers)).scalar() or 0
+    total_customers = await db.scalar(select(func.sum(Agent.total_customers))) or 0
 
     # Average customers per agent
-    avg_customers = (
-        db.query(func.avg(Agent.active_customers))
-        .filter(Agent.status == AgentStatus.ACTIVE.value)
-        .scalar() or 0
-    )
+    avg_customers = await db.scalar(
+        select(func.avg(Agent.active_customers))
+        .where(Agent.status == AgentStatus.ACTIVE.value)
+    ) or 0
 
     # Total closed deals
-    total_deals = db.query(func.sum(Agent.closed_deals)).scalar() or 0
+    total_deals = await db.scalar(select(func.sum(Agent.closed_deals))) or 0
 
     # Agents by status
-    status_counts = db.query(
-        Agent.status,
-        func.count(Agent.id)
-    ).group_by(Agent.status).all()
+    status_counts = (await db.execute(
+        select(Agent.status, func.count(Agent.id)).group_by(Agent.status)
+    )).all()
     agents_by_status = {status: count for status, count in status_counts}
 
     # Agents by role
-    role_counts = db.query(
-        Agent.role,
-        func.count(Agent.id)
-    ).group_by(Agent.role).all()
+    role_counts = (await db.execute(
+        select(Agent.role, func.count(Agent.id)).group_by(Agent.role)
+    )).all()
     agents_by_role = {role: count for role, count in role_counts}
 
     # Top performers (by closed deals)
-    top_agents = (
-        db.query(Agent)
-        .filter(Agent.status == AgentStatus.ACTIVE.value)
+    top_agents = (await db.scalars(
+        select(Agent)
+        .where(Agent.status == AgentStatus.ACTIVE.value)
         .order_by(Agent.closed_deals.desc())
         .limit(5)
-        .all()
-    )
+    )).all()
     top_performers = [
         {
             "id": a.id,
@@ -142,9 +142,9 @@ async def get_agent_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/{agent_id}", response_model=AgentResponse)
-async def get_agent(agent_id: str, db: Session = Depends(get_db)):
+async def get_agent(agent_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get agent by ID"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -157,9 +157,9 @@ async def get_agent(agent_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/firebase/{firebase_uid}", response_model=AgentResponse)
-async def get_agent_by_firebase_uid(firebase_uid: str, db: Session = Depends(get_db)):
+async def get_agent_by_firebase_uid(firebase_uid: str, db: AsyncSession = Depends(get_async_db)):
     """Get agent by Firebase UID"""
-    agent = db.query(Agent).filter(Agent.firebase_uid == firebase_uid).first()
+    agent = await db.scalar(select(Agent).where(Agent.firebase_uid == firebase_uid).limit(1))
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -172,10 +172,10 @@ async def get_agent_by_firebase_uid(firebase_uid: str, db: Session = Depends(get
 
 
 @router.post("/", response_model=AgentResponse)
-async def create_agent(agent_data: AgentCreate, db: Session = Depends(get_db)):
+async def create_agent(agent_data: AgentCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new agent (Admin only)"""
     # Check if email already exists
-    existing = db.query(Agent).filter(Agent.email == agent_data.email).first()
+    existing = await db.scalar(select(Agent).where(Agent.email == agent_data.email).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered as agent")
 
@@ -185,8 +185,8 @@ async def create_agent(agent_data: AgentCreate, db: Session = Depends(get_db)):
     )
 
     db.add(agent)
-    db.commit()
-    db.refresh(agent)
+    await db.commit()
+    await db.refresh(agent)
 
     agent_dict = {
         **agent.__dict__,
@@ -200,10 +200,10 @@ async def create_agent(agent_data: AgentCreate, db: Session = Depends(get_db)):
 async def update_agent(
     agent_id: str,
     agent_data: AgentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update agent information (Admin only)"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -212,8 +212,8 @@ async def update_agent(
         if value is not None:
             setattr(agent, key, value)
 
-    db.commit()
-    db.refresh(agent)
+    await db.commit()
+    await db.refresh(agent)
 
     agent_dict = {
         **agent.__dict__,
@@ -227,10 +227,10 @@ async def update_agent(
 async def update_agent_status(
     agent_id: str,
     status: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update agent status (Admin only)"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -238,7 +238,7 @@ async def update_agent_status(
         raise HTTPException(status_code=400, detail="Invalid status")
 
     agent.status = status
-    db.commit()
+    await db.commit()
 
     return {"success": True, "status": status}
 
@@ -250,10 +250,10 @@ async def update_agent_metrics(
     active_customers: Optional[int] = None,
     closed_deals: Optional[int] = None,
     rating: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update agent performance metrics"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -266,7 +266,7 @@ async def update_agent_metrics(
     if rating is not None:
         agent.rating = rating
 
-    db.commit()
+    await db.commit()
 
     return {"success": True}
 
@@ -274,11 +274,11 @@ async def update_agent_metrics(
 @router.post("/assign-customer")
 async def assign_customer_to_agent(
     assignment: AgentAssignment,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign a customer to an agent"""
     # Verify agent exists and is active
-    agent = db.query(Agent).filter(Agent.id == assignment.agent_id).first()
+    agent = await db.get(Agent, assignment.agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
     if agent.status != AgentStatus.ACTIVE.value:
@@ -287,7 +287,7 @@ async def assign_customer_to_agent(
         raise HTTPException(status_code=400, detail="Agent is at capacity")
 
     # Verify customer exists
-    customer = db.query(User).filter(User.id == assignment.customer_id).first()
+    customer = await db.get(User, assignment.customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
@@ -298,7 +298,7 @@ async def assign_customer_to_agent(
     agent.active_customers = (agent.active_customers or 0) + 1
     agent.total_customers = (agent.total_customers or 0) + 1
 
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -311,18 +311,20 @@ async def assign_customer_to_agent(
 @router.get("/{agent_id}/customers", response_model=dict)
 async def get_agent_customers(
     agent_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Get all customers assigned to an agent"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    query = db.query(User).filter(User.assigned_agent_id == agent_id)
-    total = query.count()
-    customers = query.order_by(User.created_at.desc()).offset(offset).limit(limit).all()
+    query = select(User).where(User.assigned_agent_id == agent_id)
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    customers = (await db.scalars(
+        query.order_by(User.created_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     return {
         "total": total,
@@ -343,14 +345,14 @@ async def get_agent_customers(
 
 
 @router.delete("/{agent_id}")
-async def delete_agent(agent_id: str, db: Session = Depends(get_db)):
+async def delete_agent(agent_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete an agent (soft delete - sets status to terminated)"""
-    agent = db.query(Agent).filter(Agent.id == agent_id).first()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
     # Soft delete
     agent.status = AgentStatus.TERMINATED.value
-    db.commit()
+    await db.commit()
 
     return {"success": True, "message": "Agent terminated"}
@@ -2,13 +2,14 @@
 CRM API endpoints - Interactions, Notes, Tasks, Pipeline
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 
-from ..db.database import get_db
+from ..db.database import get_async_db
+from ..db.routing import get_read_db
 from ..models import (
     CustomerInteraction,
     CustomerNote,
@@ -54,7 +55,7 @@ router = APIRouter(prefix="/api/crm", tags=["CRM"])
 
 @router.get("/interactions", response_model=InteractionList)
 async def get_interactions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     customer_id: Optional[str] = None,
     agent_id: Optional[str] = None,
     interaction_type: Optional[str] = None,
@@ -62,23 +63,25 @@ async def get_interactions(
     offset: int = Query(0, ge=0)
 ):
     """Get customer interactions with filters"""
-    query = db.query(CustomerInteraction)
+    query = select(CustomerInteraction)
 
     if customer_id:
-        query = query.filter(CustomerInteraction.customer_id == customer_id)
+        query = query.where(CustomerInteraction.customer_id == customer_id)
     if agent_id:
-        query = query.filter(CustomerInteraction.agent_id == agent_id)
+        query = query.where(CustomerInteraction.agent_id == agent_id)
     if interaction_type:
-        query = query.filter(CustomerInteraction.interaction_type == interaction_type)
+        query = query.where(CustomerInteraction.interaction_type == interaction_type)
 
-    total = query.count()
-    interactions = query.order_by(CustomerInteraction.created_at.desc()).offset(offset).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    interactions = (await db.scalars(
+        query.order_by(CustomerInteraction.created_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     # Populate names
     interaction_responses = []
     for i in interactions:
-        customer = db.query(User).filter(User.id == i.customer_id).first()
-        agent = db.query(Agent).filter(Agent.id == i.agent_id).first() if i.agent_id else None
+        customer = await db.get(User, i.customer_id)
+        agent = await db.get(Agent, i.agent_id) if i.agent_id else None
 
         resp = InteractionResponse(
             **i.__dict__,
@@ -96,16 +99,14 @@ async def get_interactions(
 
 
 @router.get("/interactions/{interaction_id}", response_model=InteractionResponse)
-async def get_interaction(interaction_id: str, db: Session = Depends(get_db)):
+async def get_interaction(interaction_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get single interaction by ID"""
-    interaction = db.query(CustomerInteraction).filter(
-        CustomerInteraction.id == interaction_id
-    ).first()
+    interaction = await db.get(CustomerInteraction, interaction_id)
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
 
-    customer = db.query(User).filter(User.id == interaction.customer_id).first()
-    agent = db.query(Agent).filter(Agent.id == interaction.agent_id).first() if interaction.agent_id else None
+    customer = await db.get(User, interaction.customer_id)
+    agent = await db.get(Agent, interaction.agent_id) if interaction.agent_id else None
 
     return InteractionResponse(
         **interaction.__dict__,
@@ -117,7 +118,7 @@ async def get_interaction(interaction_id: str, db: Session = Depends(get_db)):
 @router.post("/interactions", response_model=InteractionResponse)
 async def create_interaction(
     data: InteractionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new interaction"""
     interaction = CustomerInteraction(
@@ -126,11 +127,11 @@ async def create_interaction(
     )
 
     db.add(interaction)
-    db.commit()
-    db.refresh(interaction)
+    await db.commit()
+    await db.refresh(interaction)
 
-    customer = db.query(User).filter(User.id == interaction.customer_id).first()
-    agent = db.query(Agent).filter(Agent.id == interaction.agent_id).first() if interaction.agent_id else None
+    customer = await db.get(User, interaction.customer_id)
+    agent = await db.get(Agent, interaction.agent_id) if interaction.agent_id else None
 
     return InteractionResponse(
         **interaction.__dict__,
@@ -143,12 +144,10 @@ async def create_interaction(
 async def update_interaction(
     interaction_id: str,
     data: InteractionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an interaction"""
-    interaction = db.query(CustomerInteraction).filter(
-        CustomerInteraction.id == interaction_id
-    ).first()
+    interaction = await db.get(CustomerInteraction, interaction_id)
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
 
@@ -156,11 +155,11 @@ async def update_interaction(
         if value is not None:
             setattr(interaction, key, value)
 
-    db.commit()
-    db.refresh(interaction)
+    await db.commit()
+    await db.refresh(interaction)
 
-    customer = db.query(User).filter(User.id == interaction.customer_id).first()
-    agent = db.query(Agent).filter(Agent.id == interaction.agent_id).first() if interaction.agent_id else None
+    customer = await db.get(User, interaction.customer_id)
+    agent = await db.get(Agent, interaction.agent_id) if interaction.agent_id else None
 
     return InteractionResponse(
         **interaction.__dict__,
@@ -170,16 +169,14 @@ async def update_interaction(
 
 
 @router.delete("/interactions/{interaction_id}")
-async def delete_interaction(interaction_id: str, db: Session = Depends(get_db)):
+async def delete_interaction(interaction_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete an interaction"""
-    interaction = db.query(CustomerInteraction).filter(
-        CustomerInteraction.id == interaction_id
-    ).first()
+    interaction = await db.get(CustomerInteraction, interaction_id)
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
 
-    db.delete(interaction)
-    db.commit()
+    await db.delete(interaction)
+    await db.commit()
     return {"success": True}
 
 
@@ -187,7 +184,7 @@ async def delete_interaction(interaction_id: str, db: Session = Depends(get_db))
 
 @router.get("/notes", response_model=NoteList)
 async def get_notes(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     customer_id: Optional[str] = None,
     agent_id: Optional[str] = None,
     category: Optional[str] = None,
@@ -196,31 +193,30 @@ async def get_notes(
     offset: int = Query(0, ge=0)
 ):
     """Get customer notes with filters"""
-    query = db.query(CustomerNote)
+    query = select(CustomerNote)
 
     if customer_id:
-        query = query.filter(CustomerNote.customer_id == customer_id)
+        query = query.where(CustomerNote.customer_id == customer_id)
     if agent_id:
-        query = query.filter(CustomerNote.agent_id == agent_id)
+        query = query.where(CustomerNote.agent_id == agent_id)
     if category:
-        query = query.filter(CustomerNote.category == category)
+        query = query.where(CustomerNote.category == category)
     if is_pinned is not None:
-        query = query.filter(CustomerNote.is_pinned == is_pinned)
+        query = query.where(CustomerNote.is_pinned == is_pinned)
 
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Order pinned first, then by date
-    notes = (
+    notes = (await db.scalars(
         query
         .order_by(CustomerNote.is_pinned.desc(), CustomerNote.created_at.desc())
         .offset(offset)
         .limit(limit)
-        .all()
-    )
+    )).all()
 
     note_responses = []
     for n in notes:
-        agent = db.query(Agent).filter(Agent.id == n.agent_id).first() if n.agent_id else None
+        agent = await db.get(Agent, n.agent_id) if n.agent_id else None
         resp = NoteResponse(
             **n.__dict__,
             agent_name=agent.full_name if agent else None
@@ -236,7 +232,7 @@ async def get_notes(
 
 
 @router.post("/notes", response_model=NoteResponse)
-async def create_note(data: NoteCreate, db: Session = Depends(get_db)):
+async def create_note(data: NoteCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new note"""
     note = CustomerNote(
         id=str(uuid.uuid4()),
@@ -244,10 +240,10 @@ async def create_note(data: NoteCreate, db: Session = Depends(get_db)):
     )
 
     db.add(note)
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await db.refresh(note)
 
-    agent = db.query(Agent).filter(Agent.id == note.agent_id).first() if note.agent_id else None
+    agent = await db.get(Agent, note.agent_id) if note.agent_id else None
 
     return NoteResponse(
         **note.__dict__,
@@ -259,10 +255,10 @@ async def create_note(data: NoteCreate, db: Session = Depends(get_db)):
 async def update_note(
     note_id: str,
     data: NoteUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a note"""
-    note = db.query(CustomerNote).filter(CustomerNote.id == note_id).first()
+    note = await db.get(CustomerNote, note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
@@ -270,10 +266,10 @@ async def update_note(
         if value is not None:
             setattr(note, key, value)
 
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await db.refresh(note)
 
-    agent = db.query(Agent).filter(Agent.id == note.agent_id).first() if note.agent_id else None
+    agent = await db.get(Agent, note.agent_id) if note.agent_id else None
 
     return NoteResponse(
         **note.__dict__,
@@ -282,14 +278,14 @@ async def update_note(
 
 
 @router.delete("/notes/{note_id}")
-async def delete_note(note_id: str, db: Session = Depends(get_db)):
+async def delete_note(note_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete a note"""
-    note = db.query(CustomerNote).filter(CustomerNote.id == note_id).first()
+    note = await db.get(CustomerNote, note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
-    db.delete(note)
-    db.commit()
+    await db.delete(note)
+    await db.commit()
     return {"success": True}
 
 
@@ -297,7 +293,7 @@ async def delete_note(note_id: str, db: Session = Depends(get_db)):
 
 @router.get("/tasks", response_model=TaskList)
 async def get_tasks(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     customer_id: Optional[str] = None,
     assigned_agent_id: Optional[str] = None,
     status: Optional[str] = None,
@@ -307,26 +303,28 @@ async def get_tasks(
     offset: int = Query(0, ge=0)
 ):
     """Get tasks with filters"""
-    query = db.query(CustomerTask)
+    query = select(CustomerTask)
 
     if customer_id:
-        query = query.filter(CustomerTask.customer_id == customer_id)
+        query = query.where(CustomerTask.customer_id == customer_id)
     if assigned_agent_id:
-        query = query.filter(CustomerTask.assigned_agent_id == assigned_agent_id)
+        query = query.where(CustomerTask.assigned_agent_id == assigned_agent_id)
     if status:
-        query = query.filter(CustomerTask.status == status)
+        query = query.where(CustomerTask.status == status)
     if priority:
-        query = query.filter(CustomerTask.priority == priority)
+        query = query.where(CustomerTask.priority == priority)
     if due_before:
-        query = query.filter(CustomerTask.due_date <= due_before)
+        query = query.where(CustomerTask.due_date <= due_before)
 
-    total = query.count()
-    tasks = query.order_by(CustomerTask.due_date.asc().nullslast(), CustomerTask.priority.desc()).offset(offset).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    tasks = (await db.scalars(
+        query.order_by(CustomerTask.due_date.asc().nullslast(), CustomerTask.priority.desc()).offset(offset).limit(limit)
+    )).all()
 
     task_responses = []
     for t in tasks:
-        customer = db.query(User).filter(User.id == t.customer_id).first() if t.customer_id else None
-        agent = db.query(Agent).filter(Agent.id == t.assigned_agent_id).first() if t.assigned_agent_id else None
+        customer = await db.get(User, t.customer_id) if t.customer_id else None
+        agent = await db.get(Agent, t.assigned_agent_id) if t.assigned_agent_id else None
 
         resp = TaskResponse(
             **t.__dict__,
@@ -345,14 +343,14 @@ async def get_tasks(
 
 @router.get("/tasks/overdue", response_model=TaskList)
 async def get_overdue_tasks(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     assigned_agent_id: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Get overdue tasks"""
     now = datetime.utcnow()
-    query = db.query(CustomerTask).filter(
+    query = select(CustomerTask).where(
         and_(
             CustomerTask.due_date < now,
             CustomerTask.status.in_([TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value])
@@ -360,15 +358,17 @@ async def get_overdue_tasks(
     )
 
     if assigned_agent_id:
-        query = query.filter(CustomerTask.assigned_agent_id == assigned_agent_id)
+        query = query.where(CustomerTask.assigned_agent_id == assigned_agent_id)
 
-    total = query.count()
-    tasks = query.order_by(CustomerTask.due_date.asc()).offset(offset).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    tasks = (await db.scalars(
+        query.order_by(CustomerTask.due_date.asc()).offset(offset).limit(limit)
+    )).all()
 
     task_responses = []
     for t in tasks:
-        customer = db.query(User).filter(User.id == t.customer_id).first() if t.customer_id else None
-        agent = db.query(Agent).filter(Agent.id == t.assigned_agent_id).first() if t.assigned_agent_id else None
+        customer = await db.get(User, t.customer_id) if t.customer_id else None
+        agent = await db.get(Agent, t.assigned_agent_id) if t.assigned_agent_id else None
 
         resp = TaskResponse(
             **t.__dict__,
@@ -386,7 +386,7 @@ async def get_overdue_tasks(
 
 
 @router.post("/tasks", response_model=TaskResponse)
-async def create_task(data: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(data: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new task"""
     task = CustomerTask(
         id=str(uuid.uuid4()),
@@ -394,11 +394,11 @@ async def create_task(data: TaskCreate, db: Session = Depends(get_db)):
     )
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
 
-    customer = db.query(User).filter(User.id == task.customer_id).first() if task.customer_id else None
-    agent = db.query(Agent).filter(Agent.id == task.assigned_agent_id).first() if task.assigned_agent_id else None
+    customer = await db.get(User, task.customer_id) if task.customer_id else None
+    agent = await db.get(Agent, task.assigned_agent_id) if task.assigned_agent_id else None
 
     return TaskResponse(
         **task.__dict__,
@@ -411,10 +411,10 @@ async def create_task(data: TaskCreate, db: Session = Depends(get_db)):
 async def update_task(
     task_id: str,
     data: TaskUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a task"""
-    task = db.query(CustomerTask).filter(CustomerTask.id == task_id).first()
+    task = await db.get(CustomerTask, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -426,11 +426,11 @@ async def update_task(
     if data.status == TaskStatus.COMPLETED and not task.completed_at:
         task.completed_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
 
-    customer = db.query(User).filter(User.id == task.customer_id).first() if task.customer_id else None
-    agent = db.query(Agent).filter(Agent.id == task.assigned_agent_id).first() if task.assigned_agent_id else None
+    customer = await db.get(User, task.customer_id) if task.customer_id else None
+    agent = await db.get(Agent, task.assigned_agent_id) if task.assigned_agent_id else None
 
     return TaskResponse(
         **task.__dict__,
@@ -440,28 +440,28 @@ async def update_task(
 
 
 @router.patch("/tasks/{task_id}/complete")
-async def complete_task(task_id: str, db: Session = Depends(get_db)):
+async def complete_task(task_id: str, db: AsyncSession = Depends(get_async_db)):
     """Mark a task as completed"""
-    task = db.query(CustomerTask).filter(CustomerTask.id == task_id).first()
+    task = await db.get(CustomerTask, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
     task.status = TaskStatus.COMPLETED.value
     task.completed_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     return {"success": True}
 
 
 @router.delete("/tasks/{task_id}")
-async def delete_task(task_id: str, db: Session = Depends(get_db)):
+async def delete_task(task_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete a task"""
-    task = db.query(CustomerTask).filter(CustomerTask.id == task_id).first()
+    task = await db.get(CustomerTask, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     return {"success": True}
 
 
@@ -469,27 +469,29 @@ async def delete_task(task_id: str, db: Session = Depends(get_db)):
 
 @router.get("/pipeline", response_model=PipelineList)
 async def get_pipeline(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     stage: Optional[str] = None,
     assigned_agent_id: Optional[str] = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0)
 ):
     """Get pipeline entries"""
-    query = db.query(CustomerPipeline)
+    query = select(CustomerPipeline)
 
     if stage:
-        query = query.filter(CustomerPipeline.stage == stage)
+        query = query.where(CustomerPipeline.stage == stage)
     if assigned_agent_id:
-        query = query.filter(CustomerPipeline.assigned_agent_id == assigned_agent_id)
+        query = query.where(CustomerPipeline.assigned_agent_id == assigned_agent_id)
 
-    total = query.count()
-    pipelines = query.order_by(CustomerPipeline.stage_entered_at.desc()).offset(offset).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    pipelines = (await db.scalars(
+        query.order_by(CustomerPipeline.stage_entered_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     pipeline_responses = []
     for p in pipelines:
-        customer = db.query(User).filter(User.id == p.customer_id).first()
-        agent = db.query(Agent).filter(Agent.id == p.assigned_agent_id).first() if p.assigned_agent_id else None
+        customer = await db.get(User, p.customer_id)
+        agent = await db.get(Agent, p.assigned_agent_id) if p.assigned_agent_id else None
 
         resp = PipelineResponse(
             **p.__dict__,
@@ -508,33 +510,34 @@ async def get_pipeline(
 
 
 @router.get("/pipeline/stats", response_model=PipelineStats)
-async def get_pipeline_stats(db: Session = Depends(get_db)):
+async def get_pipeline_stats(db: AsyncSession = Depends(get_read_db)):
     """Get pipeline statistics"""
-    total = db.query(CustomerPipeline).count()
+    count_pipelines = select(func.count()).select_from(CustomerPipeline)
+    total = await db.scalar(count_pipelines)
 
     # Leads by stage
-    stage_counts = db.query(
-        CustomerPipeline.stage,
-        func.count(CustomerPipeline.id)
-    ).group_by(CustomerPipeline.stage).all()
+    stage_counts = (await db.execute(
+        select(CustomerPipeline.stage, func.count(CustomerPipeline.id))
+        .group_by(CustomerPipeline.stage)
+    )).all()
     leads_by_stage = {stage: count for stage, count in stage_counts}
 
     # Total deal value
-    total_value = db.query(func.sum(CustomerPipeline.deal_value)).scalar() or 0
+    total_value = await db.scalar(select(func.sum(CustomerPipeline.deal_value))) or 0
 
     # Average deal value
-    avg_value = db.query(func.avg(CustomerPipeline.deal_value)).scalar() or 0
+    avg_value = await db.scalar(select(func.avg(CustomerPipeline.deal_value))) or 0
 
     # Conversion rate (closed won / total that reached closing stages)
-    closed_won = db.query(CustomerPipeline).filter(
+    closed_won = await db.scalar(count_pipelines.where(
         CustomerPipeline.stage == PipelineStage.CLOSED_WON.value
-    ).count()
-    closed_total = db.query(CustomerPipeline).filter(
+    ))
+    closed_total = await db.scalar(count_pipelines.where(
         CustomerPipeline.stage.in_([
             PipelineStage.CLOSED_WON.value,
             PipelineStage.CLOSED_LOST.value
         ])
-    ).count()
+    ))
     conversion_rate = (closed_won / closed_total * 100) if closed_total > 0 else 0
 
     return PipelineStats(
@@ -547,12 +550,12 @@ async def get_pipeline_stats(db: Session = Depends(get_db)):
 
 
 @router.post("/pipeline", response_model=PipelineResponse)
-async def create_pipeline_entry(data: PipelineCreate, db: Session = Depends(get_db)):
+async def create_pipeline_entry(data: PipelineCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new pipeline entry for a customer"""
     # Check if customer already has pipeline entry
-    existing = db.query(CustomerPipeline).filter(
-        CustomerPipeline.customer_id == data.customer_id
-    ).first()
+    existing = await db.scalar(
+        select(CustomerPipeline).where(CustomerPipeline.customer_id == data.customer_id).limit(1)
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Customer already in pipeline")
 
@@ -562,11 +565,11 @@ async def create_pipeline_entry(data: PipelineCreate, db: Session = Depends(get_
     )
 
     db.add(pipeline)
-    db.commit()
-    db.refresh(pipeline)
+    await db.commit()
+    await db.refresh(pipeline)
 
-    customer = db.query(User).filter(User.id == pipeline.customer_id).first()
-    agent = db.query(Agent).filter(Agent.id == pipeline.assigned_agent_id).first() if pipeline.assigned_agent_id else None
+    customer = await db.get(User, pipeline.customer_id)
+    agent = await db.get(Agent, pipeline.assigned_agent_id) if pipeline.assigned_agent_id else None
 
     return PipelineResponse(
         **pipeline.__dict__,
@@ -580,12 +583,10 @@ async def create_pipeline_entry(data: PipelineCreate, db: Session = Depends(get_
 async def update_pipeline(
     pipeline_id: str,
     data: PipelineUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update pipeline entry"""
-    pipeline = db.query(CustomerPipeline).filter(
-        CustomerPipeline.id == pipeline_id
-    ).first()
+    pipeline = await db.get(CustomerPipeline, pipeline_id)
     if not pipeline:
         raise HTTPException(status_code=404, detail="Pipeline entry not found")
 
@@ -602,11 +603,11 @@ async def update_pipeline(
             else:
                 setattr(pipeline, key, value)
 
-    db.commit()
-    db.refresh(pipeline)
+    await db.commit()
+    await db.refresh(pipeline)
 
-    customer = db.query(User).filter(User.id == pipeline.customer_id).first()
-    agent = db.query(Agent).filter(Agent.id == pipeline.assigned_agent_id).first() if pipeline.assigned_agent_id else None
+    customer = await db.get(User, pipeline.customer_id)
+    agent = await db.get(Agent, pipeline.assigned_agent_id) if pipeline.assigned_agent_id else None
 
     return PipelineResponse(
         **pipeline.__dict__,
@@ -620,12 +621,12 @@ async def update_pipeline(
 async def update_customer_pipeline_stage(
     customer_id: str,
     stage: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update pipeline stage by customer ID"""
-    pipeline = db.query(CustomerPipeline).filter(
-        CustomerPipeline.customer_id == customer_id
-    ).first()
+    pipeline = await db.scalar(
+        select(CustomerPipeline).where(CustomerPipeline.customer_id == customer_id).limit(1)
+    )
     if not pipeline:
         raise HTTPException(status_code=404, detail="Customer not in pipeline")
 
@@ -637,7 +638,7 @@ async def update_customer_pipeline_stage(
     pipeline.last_stage_change = datetime.utcnow()
     pipeline.stage_entered_at = datetime.utcnow()
 
-    db.commit()
+    await db.commit()
 
     return {"success": True, "stage": stage}
 
@@ -645,43 +646,46 @@ async def update_customer_pipeline_stage(
 # ================== Dashboard Stats ==================
 
 @router.get("/stats", response_model=CRMDashboardStats)
-async def get_crm_stats(db: Session = Depends(get_db)):
+async def get_crm_stats(db: AsyncSession = Depends(get_read_db)):
     """Get CRM dashboard statistics"""
     now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    total_interactions = db.query(CustomerInteraction).count()
-    interactions_today = db.query(CustomerInteraction).filter(
+    count_interactions = select(func.count()).select_from(CustomerInteraction)
+    count_tasks = select(func.count()).select_from(CustomerTask)
+
+    total_interactions = await db.scalar(count_interactions)
+    interactions_today = await db.scalar(count_interactions.where(
         CustomerInteraction.created_at >= today_start
-    ).count()
+    ))
 
-    pending_tasks = db.query(CustomerTask).filter(
+    pending_tasks = await db.scalar(count_tasks.where(
         CustomerTask.status == TaskStatus.PENDING.value
-    ).count()
+    ))
 
-    overdue_tasks = db.query(CustomerTask).filter(
+    overdue_tasks = await db.scalar(count_tasks.where(
         and_(
             CustomerTask.due_date < now,
             CustomerTask.status.in_([TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value])
         )
-    ).count()
+    ))
 
     # Follow-ups due (interactions with follow_up_required and date passed)
-    follow_ups_due = db.query(CustomerInteraction).filter(
+    follow_ups_due = await db.scalar(count_interactions.where(
         and_(
             CustomerInteraction.follow_up_required == True,
             CustomerInteraction.follow_up_date <= now
         )
-    ).count()
+    ))
 
     # Pipeline value
-    pipeline_value = db.query(func.sum(CustomerPipeline.deal_value)).scalar() or 0
-    customers_in_pipeline = db.query(CustomerPipeline).filter(
+    pipeline_value = await db.scalar(select(func.sum(CustomerPipeline.deal_value))) or 0
+    customers_in_pipeline = await db.scalar(select(func.count()).select_from(CustomerPipeline).where(
         CustomerPipeline.stage.notin_([
             PipelineStage.CLOSED_WON.value,
             PipelineStage.CLOSED_LOST.value
         ])
-    ).count()
+    ))
 
     return CRMDashboardStats(
         total_interactions=total_interactions,
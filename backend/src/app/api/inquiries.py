@@ -2,13 +2,14 @@
 API endpoints for property inquiries and contact form submissions
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
 from typing import Optional
 from datetime import datetime
 import logging
 
-from ..db.database import get_db
+from ..db.database import AsyncSessionLocal, get_async_db
+from ..db.routing import get_read_db
 from ..models.inquiry import Inquiry, InquiryType as ModelInquiryType, InquiryStatus as ModelInquiryStatus
 from ..models.property import Property
 from ..schemas.inquiry import (
@@ -43,7 +44,7 @@ def map_inquiry_type(frontend_type: Optional[str]) -> ModelInquiryType:
 async def submit_contact_form(
     submission: ContactFormSubmission,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit a contact form inquiry for a property
@@ -61,7 +62,7 @@ async def submit_contact_form(
         property_price = submission.propertyPrice
 
         if submission.propertyId:
-            property_data = db.query(Property).filter(Property.id == submission.propertyId).first()
+            property_data = await db.get(Property, submission.propertyId)
             if property_data:
                 property_address = property_address or property_data.address
                 property_price = property_price or property_data.price
@@ -91,8 +92,8 @@ async def submit_contact_form(
         )
 
         db.add(inquiry)
-        db.commit()
-        db.refresh(inquiry)
+        await db.commit()
+        await db.refresh(inquiry)
 
         logger.info(f"Created inquiry {inquiry.id} from {submission.email}")
 
@@ -113,7 +114,6 @@ async def submit_contact_form(
         # Update inquiry to mark email as sent
         background_tasks.add_task(
             mark_email_sent,
-            db=db,
             inquiry_id=inquiry.id
         )
 
@@ -125,21 +125,23 @@ async def submit_contact_form(
 
     except Exception as e:
         logger.error(f"Failed to process inquiry: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="Failed to process your inquiry. Please try again later."
         )
 
 
-async def mark_email_sent(db: Session, inquiry_id: str):
+async def mark_email_sent(inquiry_id: str):
     """Background task to mark email as sent"""
     try:
-        inquiry = db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
-        if inquiry:
-            inquiry.email_sent = True
-            inquiry.email_sent_at = datetime.utcnow()
-            db.commit()
+        # The request's session is closed by the time background tasks run
+        async with AsyncSessionLocal() as db:
+            inquiry = await db.get(Inquiry, inquiry_id)
+            if inquiry:
+                inquiry.email_sent = True
+                inquiry.email_sent_at = datetime.utcnow()
+                await db.commit()
     except Exception as e:
         logger.error(f"Failed to mark email sent for inquiry {inquiry_id}: {str(e)}")
 
@@ -150,7 +152,7 @@ async def list_inquiries(
     property_id: Optional[str] = None,
     limit: int = Query(default=20, le=100),
     offset: int = 0,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all inquiries with optional filtering
@@ -159,20 +161,22 @@ async def list_inquiries(
     - Filter by property_id
     - Pagination support
     """
-    query = db.query(Inquiry)
+    query = select(Inquiry)
 
     # Apply filters
     if status:
-        query = query.filter(Inquiry.status == ModelInquiryStatus[status.value.upper()])
+        query = query.where(Inquiry.status == ModelInquiryStatus[status.value.upper()])
 
     if property_id:
-        query = query.filter(Inquiry.property_id == property_id)
+        query = query.where(Inquiry.property_id == property_id)
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Apply pagination and ordering
-    inquiries = query.order_by(desc(Inquiry.created_at)).offset(offset).limit(limit).all()
+    inquiries = (await db.scalars(
+        query.order_by(desc(Inquiry.created_at)).offset(offset).limit(limit)
+    )).all()
 
     return InquiryList(
         total=total,
@@ -183,9 +187,9 @@ async def list_inquiries(
 
 
 @router.get("/{inquiry_id}", response_model=InquiryResponse)
-async def get_inquiry(inquiry_id: str, db: Session = Depends(get_db)):
+async def get_inquiry(inquiry_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a specific inquiry by ID"""
-    inquiry = db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
+    inquiry = await db.get(Inquiry, inquiry_id)
 
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
@@ -197,35 +201,36 @@ async def get_inquiry(inquiry_id: str, db: Session = Depends(get_db)):
 async def update_inquiry_status(
     inquiry_id: str,
     status_update: InquiryUpdateStatus,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update the status of an inquiry"""
-    inquiry = db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
+    inquiry = await db.get(Inquiry, inquiry_id)
 
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
 
     inquiry.status = ModelInquiryStatus[status_update.status.value.upper()]
-    db.commit()
-    db.refresh(inquiry)
+    await db.commit()
+    await db.refresh(inquiry)
 
     return InquiryResponse.model_validate(inquiry)
 
 
 @router.get("/stats/overview")
-async def get_inquiry_stats(db: Session = Depends(get_db)):
+async def get_inquiry_stats(db: AsyncSession = Depends(get_read_db)):
     """Get inquiry statistics for the admin dashboard"""
-    total = db.query(Inquiry).count()
-    new_count = db.query(Inquiry).filter(Inquiry.status == ModelInquiryStatus.NEW).count()
-    responded_count = db.query(Inquiry).filter(Inquiry.status == ModelInquiryStatus.RESPONDED).count()
+    count_inquiries = select(func.count()).select_from(Inquiry)
+    total = await db.scalar(count_inquiries)
+    new_count = await db.scalar(count_inquiries.where(Inquiry.status == ModelInquiryStatus.NEW))
+    responded_count = await db.scalar(count_inquiries.where(Inquiry.status == ModelInquiryStatus.RESPONDED))
 
     # Count by type
-    tour_requests = db.query(Inquiry).filter(
-        Inquiry.inquiry_type == ModelInquiryType.SCHEDULE_TOUR
-    ).count()
-    offer_inquiries = db.query(Inquiry).filter(
-        Inquiry.inquiry_type == ModelInquiryType.MAKE_OFFER
-    ).count()
+    tour_requests = await db.scalar(
+        count_inquiries.where(Inquiry.inquiry_type == ModelInquiryType.SCHEDULE_TOUR)
+    )
+    offer_inquiries = await db.scalar(
+        count_inquiries.where(Inquiry.inquiry_type == ModelInquiryType.MAKE_OFFER)
+    )
 
     return {
         "total_inquiries": total,
@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import Optional
-from ..db.database import get_db
+from sqlalchemy import func, select
+from typing import Optional, Literal
+from ..core.config import settings
+from ..db.routing import get_read_db
 from ..models.property import Property
-from ..schemas.property import PropertyResponse, PropertyList
+from ..schemas.property import (
+    PropertyResponse,
+    PropertyList,
+    PropertyBatchRequest,
+    PropertyBatchResponse,
+    CountStrategy,
+    PropertyView,
+    PropertyClusterList,
+    AutocompleteResponse
+)
+from ..services.property_service import PropertyService, InvalidCursorError, InvalidSearchError
+from ..services.map_service import MapService
 
 router = APIRouter(prefix="/api/properties", tags=["Properties"])
 
 @router.get("/", response_model=PropertyList)
 async def get_properties(
+    q: Optional[str] = Query(default=None, max_length=200, description="Full-text search over title, address and description"),
     city: Optional[str] = None,
     state: Optional[str] = None,
     zip_code: Optional[str] = None,
@@ -19,44 +33,166 @@ async def get_properties(
     baths: Optional[float] = None,
     property_type: Optional[str] = None,
     status: Optional[str] = None,
+    bbox: Optional[str] = Query(default=None, description="min_lng,min_lat,max_lng,max_lat"),
+    near: Optional[str] = Query(default=None, description="lat,lng"),
+    radius_m: Optional[float] = Query(default=None, gt=0, le=200_000),
     limit: int = Query(default=20, le=100),
     offset: int = 0,
-    db: Session = Depends(get_db)
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    count: CountStrategy = CountStrategy.EXACT,
+    facets: Optional[str] = Query(default=None, description="Comma-separated: property_type,status,beds,price"),
+    view: PropertyView = PropertyView.FULL,
+    fields: Optional[str] = Query(default=None, description="Comma-separated response fields; overrides view"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    query = db.query(Property)
-    filters = []
-    
-    if city:
-        filters.append(Property.city.ilike(f"%{city}%"))
-    if state:
-        filters.append(Property.state == state)
-    if zip_code:
-        filters.append(Property.zip_code == zip_code)
-    if min_price:
-        filters.append(Property.price >= min_price)
-    if max_price:
-        filters.append(Property.price <= max_price)
-    if beds:
-        filters.append(Property.beds >= beds)
-    if baths:
-        filters.append(Property.baths >= baths)
-    if property_type:
-        filters.append(Property.property_type == property_type)
-    if status:
-        filters.append(Property.status == status)
-    
-    if filters:
-        query = query.filter(and_(*filters))
-    
-    total = query.count()
-    properties = query.order_by(Property.created_at.desc()).offset(offset).limit(limit).all()
-    
-    return PropertyList(total=total, properties=properties, limit=limit, offset=offset)
+    try:
+        bbox_bounds = PropertyService.parse_bbox(bbox) if bbox else None
+        near_point = PropertyService.parse_point(near) if near else None
+        facet_fields = PropertyService.parse_facets(facets) if facets else None
+        selected_fields = PropertyService.resolve_fields(view, fields)
+    except InvalidSearchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if near_point and not radius_m:
+        raise HTTPException(status_code=400, detail="radius_m is required with near")
+
+    search_params = dict(
+        q=q,
+        city=city,
+        state=state,
+        zip_code=zip_code,
+        min_price=min_price,
+        max_price=max_price,
+        beds=beds,
+        baths=baths,
+        property_type=property_type,
+        status=status,
+        bbox=bbox_bounds,
+        near=near_point,
+        radius_m=radius_m
+    )
+
+    def search(session: Session) -> PropertyList:
+        service = PropertyService(session)
+        query = service.search_query(service.build_filters(**search_params))
+
+        total, total_strategy = service.count(query, count, search_params)
+        facet_counts = service.facets(query, facet_fields, search_params) if facet_fields else None
+
+        page_query = service.load_fields(query, selected_fields) if selected_fields else query
+
+        # Passing a cursor implies cursor mode, so clients can just follow next_cursor.
+        # Cursor pages stay newest-first even with q; relevance ranking is offset-only.
+        if pagination == "cursor" or cursor:
+            try:
+                properties, next_cursor = service.fetch_cursor_page(page_query, limit, cursor)
+            except InvalidCursorError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            if selected_fields:
+                properties = service.project(properties, selected_fields)
+            return PropertyList(
+                total=total,
+                total_strategy=total_strategy,
+                properties=properties,
+                limit=limit,
+                offset=0,
+                next_cursor=next_cursor,
+                facets=facet_counts
+            )
+
+        properties = service.fetch_offset_page(page_query, limit, offset, q=q)
+        if selected_fields:
+            properties = service.project(properties, selected_fields)
+
+        return PropertyList(
+            total=total,
+            total_strategy=total_strategy,
+            properties=properties,
+            limit=limit,
+            offset=offset,
+            facets=facet_counts
+        )
+
+    return await db.run_sync(search)
+
+@router.post("/batch", response_model=PropertyBatchResponse)
+async def get_properties_batch(
+    data: PropertyBatchRequest,
+    view: PropertyView = PropertyView.FULL,
+    fields: Optional[str] = Query(default=None, description="Comma-separated response fields; overrides view"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        selected_fields = PropertyService.resolve_fields(view, fields)
+    except InvalidSearchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    properties, missing = await db.run_sync(
+        lambda session: PropertyService(session).get_many(data.ids, selected_fields)
+    )
+    if selected_fields:
+        properties = PropertyService.project(properties, selected_fields)
+
+    return PropertyBatchResponse(properties=properties, missing=missing)
+
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete_properties(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=25),
+    db: AsyncSession = Depends(get_read_db)
+):
+    suggestions = await db.run_sync(
+        lambda session: PropertyService(session).autocomplete(prefix, limit)
+    )
+    return AutocompleteResponse(prefix=prefix, suggestions=suggestions)
+
+@router.get("/clusters", response_model=PropertyClusterList)
+async def get_property_clusters(
+    bbox: str = Query(..., description="min_lng,min_lat,max_lng,max_lat"),
+    zoom: int = Query(..., ge=0, le=22),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        bounds = PropertyService.parse_bbox(bbox)
+    except InvalidSearchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cluster_zoom = MapService.clamp_zoom(zoom)
+    clusters = await db.run_sync(
+        lambda session: MapService(session).get_clusters(cluster_zoom, bounds)
+    )
+
+    return PropertyClusterList(
+        zoom=cluster_zoom,
+        total=sum(c.count for c in clusters),
+        clusters=clusters
+    )
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_property_tile(z: int, x: int, y: int, db: AsyncSession = Depends(get_read_db)):
+    if z < settings.TILE_MIN_ZOOM:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tiles start at zoom {settings.TILE_MIN_ZOOM}; use /api/properties/clusters below that"
+        )
+    if z > 22 or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Tile coordinates out of range")
+
+    tile = await MapService.get_tile(db, z, x, y)
+    if not tile:
+        return Response(status_code=204)
+
+    return Response(
+        content=tile,
+        media_type="application/vnd.mapbox-vector-tile",
+        headers={"Cache-Control": f"public, max-age={settings.TILE_VERSION_TTL_SECONDS}"}
+    )
 
 @router.get("/stats/overview")
-async def get_stats(db: Session = Depends(get_db)):
-    total = db.query(func.count(Property.id)).scalar() or 0
-    avg_price = db.query(func.avg(Property.price)).scalar()
+async def get_stats(db: AsyncSession = Depends(get_read_db)):
+    total, avg_price = (await db.execute(
+        select(func.count(Property.id), func.avg(Property.price))
+    )).one()
 
     return {
         "total_properties": total,
@@ -64,8 +200,8 @@ async def get_stats(db: Session = Depends(get_db)):
     }
 
 @router.get("/{property_id}", response_model=PropertyResponse)
-async def get_property(property_id: str, db: Session = Depends(get_db)):
-    property = db.query(Property).filter(Property.id == property_id).first()
+async def get_property(property_id: str, db: AsyncSession = Depends(get_read_db)):
+    property = await db.get(Property, property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
     return property
@@ -2,13 +2,14 @@
 User management API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 
-from ..db.database import get_db
+from ..db.database import get_async_db
+from ..db.routing import get_read_db
 from ..models import User, UserStatus, UserRole
 from ..schemas import (
     UserCreate,
@@ -24,7 +25,7 @@ router = APIRouter(prefix="/api/users", tags=["Users"])
 
 @router.get("/", response_model=UserList)
 async def get_users(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status: Optional[str] = None,
     role: Optional[str] = None,
     assigned_agent_id: Optional[str] = None,
@@ -33,18 +34,18 @@ async def get_users(
     offset: int = Query(0, ge=0)
 ):
     """Get all users with optional filters"""
-    query = db.query(User)
+    query = select(User)
 
     # Apply filters
     if status:
-        query = query.filter(User.status == status)
+        query = query.where(User.status == status)
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
     if assigned_agent_id:
-        query = query.filter(User.assigned_agent_id == assigned_agent_id)
+        query = query.where(User.assigned_agent_id == assigned_agent_id)
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 User.email.ilike(search_term),
                 User.first_name.ilike(search_term),
@@ -54,10 +55,12 @@ async def get_users(
         )
 
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
     # Apply pagination and ordering
-    users = query.order_by(User.created_at.desc()).offset(offset).limit(limit).all()
+    users = (await db.scalars(
+        query.order_by(User.created_at.desc()).offset(offset).limit(limit)
+    )).all()
 
     # Convert to response with full_name
     user_responses = []
@@ -77,33 +80,32 @@ async def get_users(
 
 
 @router.get("/stats", response_model=UserStats)
-async def get_user_stats(db: Session = Depends(get_db)):
+async def get_user_stats(db: AsyncSession = Depends(get_read_db)):
     """Get user statistics"""
     now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=now.weekday())
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    total = db.query(User).count()
-    active = db.query(User).filter(User.status == UserStatus.ACTIVE.value).count()
-    inactive = db.query(User).filter(User.status == UserStatus.INACTIVE.value).count()
+    count_users = select(func.count()).select_from(User)
+    total = await db.scalar(count_users)
+    active = await db.scalar(count_users.where(User.status == UserStatus.ACTIVE.value))
+    inactive = await db.scalar(count_users.where(User.status == UserStatus.INACTIVE.value))
 
-    new_today = db.query(User).filter(User.created_at >= today_start).count()
-    new_week = db.query(User).filter(User.created_at >= week_start).count()
-    new_month = db.query(User).filter(User.created_at >= month_start).count()
+    new_today = await db.scalar(count_users.where(User.created_at >= today_start))
+    new_week = await db.scalar(count_users.where(User.created_at >= week_start))
+    new_month = await db.scalar(count_users.where(User.created_at >= month_start))
 
     # Users by status
-    status_counts = db.query(
-        User.status,
-        func.count(User.id)
-    ).group_by(User.status).all()
+    status_counts = (await db.execute(
+        select(User.status, func.count(User.id)).group_by(User.status)
+    )).all()
     users_by_status = {status: count for status, count in status_counts}
 
     # Users by role
-    role_counts = db.query(
-        User.role,
-        func.count(User.id)
-    ).group_by(User.role).all()
+    role_counts = (await db.execute(
+        select(User.role, func.count(User.id)).group_by(User.role)
+    )).all()
     users_by_role = {role: count for role, count in role_counts}
 
     return UserStats(
@@ -119,9 +121,9 @@ async def get_user_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: str, db: Session = Depends(get_db)):
+async def get_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get user by ID"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -130,9 +132,9 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/firebase/{firebase_uid}", response_model=UserResponse)
-async def get_user_by_firebase_uid(firebase_uid: str, db: Session = Depends(get_db)):
+async def get_user_by_firebase_uid(firebase_uid: str, db: AsyncSession = Depends(get_async_db)):
     """Get user by Firebase UID"""
-    user = db.query(User).filter(User.firebase_uid == firebase_uid).first()
+    user = await db.scalar(select(User).where(User.firebase_uid == firebase_uid).limit(1))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -141,18 +143,18 @@ async def get_user_by_firebase_uid(firebase_uid: str, db: Session = Depends(get_
 
 
 @router.post("/", response_model=UserResponse)
-async def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new user"""
     # Check if email already exists
-    existing = db.query(User).filter(User.email == user_data.email).first()
+    existing = await db.scalar(select(User).where(User.email == user_data.email).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Check if firebase_uid already exists
     if user_data.firebase_uid:
-        existing_firebase = db.query(User).filter(
-            User.firebase_uid == user_data.firebase_uid
-        ).first()
+        existing_firebase = await db.scalar(
+            select(User).where(User.firebase_uid == user_data.firebase_uid).limit(1)
+        )
         if existing_firebase:
             raise HTTPException(status_code=400, detail="Firebase UID already registered")
 
@@ -162,27 +164,27 @@ async def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     user_dict = {**user.__dict__, "full_name": user.full_name}
     return UserResponse.model_validate(user_dict)
 
 
 @router.post("/sync", response_model=UserResponse)
-async def sync_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def sync_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Sync user from Firebase - create if not exists, update if exists"""
     existing = None
 
     # First try to find by firebase_uid
     if user_data.firebase_uid:
-        existing = db.query(User).filter(
-            User.firebase_uid == user_data.firebase_uid
-        ).first()
+        existing = await db.scalar(
+            select(User).where(User.firebase_uid == user_data.firebase_uid).limit(1)
+        )
 
     # If not found by firebase_uid, try email
     if not existing:
-        existing = db.query(User).filter(User.email == user_data.email).first()
+        existing = await db.scalar(select(User).where(User.email == user_data.email).limit(1))
 
     if existing:
         # Update existing user
@@ -190,8 +192,8 @@ async def sync_user(user_data: UserCreate, db: Session = Depends(get_db)):
             if value is not None:
                 setattr(existing, key, value)
         existing.last_login_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         user_dict = {**existing.__dict__, "full_name": existing.full_name}
         return UserResponse.model_validate(user_dict)
     else:
@@ -201,8 +203,8 @@ async def sync_user(user_data: UserCreate, db: Session = Depends(get_db)):
             **user_data.model_dump()
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         user_dict = {**user.__dict__, "full_name": user.full_name}
         return UserResponse.model_validate(user_dict)
 
@@ -211,10 +213,10 @@ async def sync_user(user_data: UserCreate, db: Session = Depends(get_db)):
 async def update_user(
     user_id: str,
     user_data: UserUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user information"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -223,8 +225,8 @@ async def update_user(
         if value is not None:
             setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     user_dict = {**user.__dict__, "full_name": user.full_name}
     return UserResponse.model_validate(user_dict)
@@ -234,10 +236,10 @@ async def update_user(
 async def update_user_status(
     user_id: str,
     status: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user status (active/inactive/suspended)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -245,7 +247,7 @@ async def update_user_status(
         raise HTTPException(status_code=400, detail="Invalid status")
 
     user.status = status
-    db.commit()
+    await db.commit()
 
     return {"success": True, "status": status}
 
@@ -254,15 +256,15 @@ async def update_user_status(
 async def assign_agent_to_user(
     user_id: str,
     agent_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign an agent to a user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     user.assigned_agent_id = agent_id
-    db.commit()
+    await db.commit()
 
     return {"success": True, "assigned_agent_id": agent_id}
 
@@ -271,10 +273,10 @@ async def assign_agent_to_user(
 async def update_user_activity(
     user_id: str,
     activity: UserActivityUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user activity metrics"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -282,22 +284,22 @@ async def update_user_activity(
         if value is not None:
             setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     user_dict = {**user.__dict__, "full_name": user.full_name}
     return UserResponse.model_validate(user_dict)
 
 
 @router.delete("/{user_id}")
-async def delete_user(user_id: str, db: Session = Depends(get_db)):
+async def delete_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Delete a user (soft delete - sets status to inactive)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Soft delete - just set status to inactive
     user.status = UserStatus.INACTIVE.value
-    db.commit()
+    await db.commit()
 
     return {"success": True, "message": "User deactivated"}
@@ -0,0 +1,134 @@
+"""
+Small in-process caches shared by the API
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+import os
+import shutil
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Each uvicorn worker holds its own copy, so values may differ between
+    workers for up to `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskLRUCache:
+    """
+    Size-bounded on-disk byte cache; least recently read files are evicted first.
+
+    Keys are tuples of path-safe parts, stored as nested directories under
+    `directory`. Writes go through a temp file and os.replace, so several
+    uvicorn workers can share one directory; each worker tracks the total
+    size separately, so the bound is approximate when they do.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # Computed lazily on first write
+        self._lock = threading.Lock()
+
+    def _path(self, key: tuple) -> Path:
+        return self.directory.joinpath(*(str(part) for part in key))
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-access time for eviction
+        except FileNotFoundError:
+            pass  # Evicted by another worker since the read
+        return data
+
+    def set(self, key: tuple, value: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(value)
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(value)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def purge_except(self, keep: str):
+        """Delete every top-level entry except `keep`, e.g. stale data versions"""
+        if not self.directory.exists():
+            return
+        with self._lock:
+            for child in self.directory.iterdir():
+                if child.name != keep:
+                    shutil.rmtree(child, ignore_errors=True)
+            self._size = None
+
+    def _files(self) -> list:
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.rglob("*") if p.is_file() and not p.name.startswith(".")]
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self._files())
+
+    def _evict(self):
+        """Drop least recently used files until the cache is at 90% of max_bytes"""
+        entries = []
+        for p in self._files():
+            try:
+                stat = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        size = sum(e[1] for e in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, file_size, p in entries:
+            if size <= target:
+                break
+            p.unlink(missing_ok=True)
+            size -= file_size
+        self._size = size
@@ -0,0 +1,84 @@
+"""
+Application configuration for TailorHomeFinder
+"""
+from pydantic_settings import BaseSettings
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+
+    # Property search - total counts
+    COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "300"))
+    COUNT_CACHE_MAX_ENTRIES: int = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
+    # Below this planner estimate an exact count is cheap, so just run it
+    COUNT_ESTIMATE_EXACT_BELOW: int = int(os.getenv("COUNT_ESTIMATE_EXACT_BELOW", "1000"))
+
+    # Property search - facet counts (?facets=)
+    FACET_CACHE_TTL_SECONDS: int = int(os.getenv("FACET_CACHE_TTL_SECONDS", "300"))
+    FACET_CACHE_MAX_ENTRIES: int = int(os.getenv("FACET_CACHE_MAX_ENTRIES", "1024"))
+    # Upper bounds of the price facet buckets; the last bucket is open-ended
+    FACET_PRICE_BUCKETS: str = os.getenv("FACET_PRICE_BUCKETS", "250000,500000,750000,1000000,2000000,5000000")
+
+    # Map clusters - precomputed for zoom levels MIN..MAX
+    CLUSTER_MIN_ZOOM: int = int(os.getenv("CLUSTER_MIN_ZOOM", "0"))
+    CLUSTER_MAX_ZOOM: int = int(os.getenv("CLUSTER_MAX_ZOOM", "12"))
+    # Each map tile is split into 2^bits x 2^bits cluster cells
+    CLUSTER_CELL_BITS: int = int(os.getenv("CLUSTER_CELL_BITS", "3"))
+
+    # Vector tiles - below TILE_MIN_ZOOM the map should use clusters instead
+    TILE_MIN_ZOOM: int = int(os.getenv("TILE_MIN_ZOOM", "8"))
+    TILE_CACHE_DIR: str = os.getenv("TILE_CACHE_DIR", "/tmp/tailorhomefinder/tiles")
+    TILE_CACHE_MAX_MB: int = int(os.getenv("TILE_CACHE_MAX_MB", "512"))
+    # How long a worker trusts its cached data version before re-checking
+    TILE_VERSION_TTL_SECONDS: int = int(os.getenv("TILE_VERSION_TTL_SECONDS", "60"))
+
+    # Connection pools - DB_CONNECTION_BUDGET connections per database, split across
+    # WEB_CONCURRENCY uvicorn workers and the engines each opens on it (the primary has
+    # a sync and an async one), a third kept open and the rest as overflow.
+    # DB_POOL_SIZE / DB_MAX_OVERFLOW override the derived split per engine when set.
+    DB_CONNECTION_BUDGET: int = int(os.getenv("DB_CONNECTION_BUDGET", "30"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "0"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "-1"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    # Connections idle longer than this are pinged on checkout; fresher ones are trusted
+    DB_POOL_VALIDATE_AFTER_SECONDS: float = float(os.getenv("DB_POOL_VALIDATE_AFTER_SECONDS", "60"))
+
+    # Per-request query budget - requests over either limit are logged with
+    # any statement repeated N_PLUS_ONE_THRESHOLD times; strict mode (for tests)
+    # raises on the statement that goes over QUERY_BUDGET instead
+    QUERY_BUDGET: int = int(os.getenv("QUERY_BUDGET", "20"))
+    QUERY_TIME_BUDGET_MS: int = int(os.getenv("QUERY_TIME_BUDGET_MS", "500"))
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+    QUERY_BUDGET_STRICT: bool = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+
+    # Slow query log - statements aggregated by normalized fingerprint; slow
+    # SELECTs get an EXPLAIN (ANALYZE, BUFFERS) in the background, at most once
+    # per fingerprint per interval because ANALYZE runs the statement again
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))
+    QUERY_LOG_MAX_FINGERPRINTS: int = int(os.getenv("QUERY_LOG_MAX_FINGERPRINTS", "1000"))
+    # Recent durations kept per fingerprint for p95
+    QUERY_LOG_SAMPLES: int = int(os.getenv("QUERY_LOG_SAMPLES", "200"))
+
+    # Operational admin endpoints (/api/admin/stats/queries) expose SQL and plans;
+    # they need this key in an X-Admin-Key header and are closed while it's unset
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
+
+    # Read replica - after a write, send that client's reads to the primary
+    # for this many seconds so it sees its own change; 0 disables. Tracked in a
+    # cookie, so clients must send credentials (frontend apiFetch does)
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "0"))
+
+    class Config:
+        env_file = ".env"
+        extra = "allow"
+
+
+settings = Settings()
@@ -1,24 +1,90 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 import os
 from dotenv import load_dotenv
 
+from ..core.config import settings
+from .pool import PoolMetrics, instrument_engine, instrumented_pool_class, pool_sizing
+from .query_budget import track_queries
+from .query_log import log_queries
+
 load_dotenv()
 
+
+def asyncpg_url(url):
+    """`url` with its driver swapped for asyncpg"""
+    return make_url(url).set(drivername="postgresql+asyncpg") if url else None
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Same database through asyncpg unless overridden
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or asyncpg_url(DATABASE_URL)
+# Read-only replica for the read-heavy GET endpoints; unset means the primary
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# Engines each worker opens on the primary (sync and async); they split its connection budget
+PRIMARY_ENGINES = 2
+
+
+def create_instrumented_engine(name: str, url, is_async: bool = False, budget_share: int = 1, **kwargs):
+    """
+    Engine with a per-worker sized, instrumented pool (see db/pool.py),
+    taking 1/`budget_share` of its database's connection budget.
+
+    Connections are validated on checkout only after sitting idle, rather
+    than with pool_pre_ping on every checkout.
+    """
+    pool_size, max_overflow = pool_sizing(budget_share)
+    metrics = PoolMetrics(name, max_overflow)
+    poolclass = AsyncAdaptedQueuePool if is_async else QueuePool
+    created = (create_async_engine if is_async else create_engine)(
+        url,
+        poolclass=instrumented_pool_class(poolclass, metrics),
+        pool_size=pool_size,  # Connections kept open
+        max_overflow=max_overflow,  # Max connections beyond pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        **kwargs
+    )
+    instrument_engine(name, created, metrics)
+    track_queries(created)
+    log_queries(name, created)
+    return created
+
 
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,  # Connection pool size
-    max_overflow=20  # Max connections beyond pool_size
+engine = create_instrumented_engine("primary_sync", DATABASE_URL, budget_share=PRIMARY_ENGINES)
+
+# Async engine for the API; scripts and benchmarks keep using `engine`
+async_engine = create_instrumented_engine(
+    "primary", ASYNC_DATABASE_URL, is_async=True, budget_share=PRIMARY_ENGINES
 )
 
+# Read-only view of the primary: its transactions start READ ONLY, so a write
+# routed through get_read_db fails instead of landing on the primary
+primary_read_engine = async_engine.execution_options(postgresql_readonly=True)
+
+# Replica engine, read-only at the session level; the read-only primary when
+# no replica is configured
+read_engine = create_instrumented_engine(
+    "replica",
+    asyncpg_url(READ_DATABASE_URL),
+    is_async=True,
+    connect_args={"server_settings": {"default_transaction_read_only": "on"}}
+) if READ_DATABASE_URL else primary_read_engine
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions can't lazy-load expired attributes, so keep them after commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+PrimaryReadSessionLocal = async_sessionmaker(primary_read_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -29,3 +95,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    AsyncSession dependency for the async def handlers.
+
+    Queries await asyncpg instead of blocking the event loop. Code written
+    against the sync Session API (PropertyService, MapService) runs through
+    `await db.run_sync(...)`, which drives it on the same async connection.
+    """
+    async with AsyncSessionLocal() as db:
+        # Lets the read-your-writes middleware see whether this request committed
+        db.info["request_state"] = request.state
+        yield db
@@ -0,0 +1,32 @@
+"""
+EXPLAIN as an executable SQLAlchemy construct.
+
+Wrapping the statement (rather than prefixing its SQL string) keeps bound
+parameters parameterized, so user-supplied filter values never get inlined.
+"""
+import json
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class explain(Executable, ClauseElement):
+    """EXPLAIN (<options>) <statement>"""
+    inherit_cache = False
+
+    def __init__(self, statement, options: str = "FORMAT JSON"):
+        self.statement = statement
+        self.options = options
+
+
+@compiles(explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return f"EXPLAIN ({element.options}) " + compiler.process(element.statement, **kw)
+
+
+def planner_row_estimate(db, statement) -> int:
+    """Row count the PostgreSQL planner expects `statement` to return"""
+    plan = db.execute(explain(statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)  # asyncpg returns untyped json columns as text
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,197 @@
+"""
+Connection pool sizing and instrumentation.
+
+Every engine is registered under a name and gets:
+
+- checkout wait histogram and timeout counter, timed around the pool's
+  `connect()` (pool events only fire once a connection is in hand)
+- connect / invalidate / checkout counters and a peak in-use gauge from
+  SQLAlchemy pool events
+- validation on checkout only for connections idle longer than
+  DB_POOL_VALIDATE_AFTER_SECONDS, instead of pool_pre_ping on every checkout
+
+Metrics live in the worker process, so each uvicorn worker reports its own.
+"""
+from sqlalchemy import event, exc
+from typing import Dict, List, Tuple
+import bisect
+import threading
+import time
+
+from ..core.config import settings
+
+# Upper bounds of the checkout wait buckets; the last bucket is open-ended
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def pool_sizing(engines: int = 1) -> Tuple[int, int]:
+    """
+    pool_size and max_overflow for one of `engines` engines that share a
+    database, in one worker.
+
+    Splits DB_CONNECTION_BUDGET evenly across WEB_CONCURRENCY workers and
+    the engines each worker opens on that database, so together they stay
+    within the budget however many workers run. DB_POOL_SIZE and
+    DB_MAX_OVERFLOW, when set, apply to every engine as-is.
+    """
+    per_engine = max(2, settings.DB_CONNECTION_BUDGET // (max(1, settings.WEB_CONCURRENCY) * max(1, engines)))
+    pool_size = settings.DB_POOL_SIZE or max(1, per_engine // 3)
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW >= 0 else per_engine - pool_size
+    return pool_size, max(0, max_overflow)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class PoolMetrics:
+    """Counters for one engine's pool"""
+
+    def __init__(self, name: str, max_overflow: int):
+        self.name = name
+        self.max_overflow = max_overflow
+        self.checkout_wait = Histogram(CHECKOUT_BUCKETS_MS)
+        self.validation = Histogram(CHECKOUT_BUCKETS_MS)
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.failed_validations = 0
+        self.peak_in_use = 0
+        self._lock = threading.Lock()
+
+    def observe_wait(self, ms: float, timed_out: bool = False):
+        with self._lock:
+            self.checkout_wait.observe(ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def observe_validation(self, ms: float, ok: bool):
+        with self._lock:
+            self.validation.observe(ms)
+            if not ok:
+                self.failed_validations += 1
+
+    def observe_in_use(self, in_use: int):
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool) -> dict:
+        size = pool.size()
+        in_use = pool.checkedout()
+        capacity = size + self.max_overflow
+        with self._lock:
+            return {
+                "pool_size": size,
+                "max_overflow": self.max_overflow,
+                "in_use": in_use,
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "peak_in_use": self.peak_in_use,
+                "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "checkout_wait": self.checkout_wait.snapshot(),
+                "validation": {
+                    **self.validation.snapshot(),
+                    "failed": self.failed_validations
+                }
+            }
+
+
+# Registered engines by name, in registration order
+_engines: Dict[str, Tuple[object, PoolMetrics]] = {}
+
+
+def instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """
+    Subclass of `base` that times how long checkouts wait for a connection.
+
+    Times connect() rather than _do_get(), which QueuePool calls again
+    itself when it retries, so each checkout is observed exactly once.
+    Pool.recreate() (engine.dispose) builds the new pool from self.__class__,
+    so the timing survives a dispose.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = base.connect(self)
+        except exc.TimeoutError:
+            metrics.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+def instrument_engine(name: str, engine, metrics: PoolMetrics):
+    """Attach pool event listeners to `engine` (sync or async) and register it"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    validate_after = settings.DB_POOL_VALIDATE_AFTER_SECONDS
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, record):
+        metrics.increment("connects")
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, record, exception):
+        metrics.increment("invalidations")
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        metrics.observe_in_use(sync_engine.pool.checkedout())
+
+        idle = time.monotonic() - record.info.get("checked_in_at", 0)
+        if idle < validate_after:
+            return
+        start = time.perf_counter()
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            metrics.observe_validation((time.perf_counter() - start) * 1000, ok=False)
+            # The pool discards this connection and retries with a new one
+            raise exc.DisconnectionError()
+        metrics.observe_validation((time.perf_counter() - start) * 1000, ok=True)
+
+    _engines[name] = (sync_engine, metrics)
+
+
+def pool_stats() -> List[dict]:
+    """Current metrics of every registered pool in this worker"""
+    return [
+        {"engine": name, **metrics.snapshot(sync_engine.pool)}
+        for name, (sync_engine, metrics) in _engines.items()
+    ]
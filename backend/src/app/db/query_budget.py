@@ -0,0 +1,107 @@
+"""
+Per-request SQL statement counting, query budgets and N+1 detection.
+
+Engine events count every statement and its time into the stats object of
+the request being served, which QueryBudgetMiddleware keeps in a context
+variable (SQLAlchemy's async greenlets inherit it, so run_sync code counts
+too). Each response gets a Server-Timing header. Requests over
+QUERY_BUDGET statements or QUERY_TIME_BUDGET_MS of database time are
+logged, along with any statement repeated N_PLUS_ONE_THRESHOLD times or
+more, the usual sign of a per-row lookup.
+
+With QUERY_BUDGET_STRICT (meant for tests) the statement that goes over
+the budget raises QueryBudgetExceeded instead, so the failure points at it.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from typing import List, Optional, Tuple
+import logging
+import time
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a request issues more than QUERY_BUDGET statements"""
+
+
+class RequestQueryStats:
+    """Statements issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times, most repeated first"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def track_queries(engine):
+    """Count statements run on `engine` (sync or async) into the current request"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        stats.count += 1
+        stats.statements[statement] += 1
+        if settings.QUERY_BUDGET_STRICT and stats.count > settings.QUERY_BUDGET:
+            raise QueryBudgetExceeded(
+                f"Query budget of {settings.QUERY_BUDGET} exceeded by: {statement}"
+            )
+        # On the execution context, so a statement that raises leaves nothing behind
+        context._query_budget_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        start = getattr(context, "_query_budget_start", None)
+        if stats is None or start is None:
+            return
+        stats.total_ms += (time.perf_counter() - start) * 1000
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """Collects per-request query stats, sets Server-Timing and logs budget overruns"""
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+
+        timing = f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        if (
+            stats.count > settings.QUERY_BUDGET
+            or stats.total_ms > settings.QUERY_TIME_BUDGET_MS
+            or repeated
+        ):
+            logger.warning(
+                "%s %s ran %d queries in %.1f ms (budget %d queries / %d ms)%s",
+                request.method,
+                request.url.path,
+                stats.count,
+                stats.total_ms,
+                settings.QUERY_BUDGET,
+                settings.QUERY_TIME_BUDGET_MS,
+                "".join(f"\n  possible N+1, {n}x: {sql}" for sql, n in repeated)
+            )
+        return response
@@ -0,0 +1,267 @@
+"""
+Statement profiler: per-fingerprint timings and a slow query log.
+
+Every statement is normalized into a fingerprint (literals, bound
+parameters and IN-lists replaced, whitespace collapsed), so the many
+ad-hoc `db.query(...)` shapes aggregate no matter which values they ran
+with. Statements slower than SLOW_QUERY_MS are logged by fingerprint
+(never with their parameters). For slow SELECTs, `EXPLAIN (ANALYZE,
+BUFFERS)` is captured off the request path on a connection of its own,
+at most once per fingerprint every SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+since ANALYZE runs the statement again; literals are stripped from the
+stored plan like they are from the fingerprint.
+
+Stats live in the worker process, so each uvicorn worker reports its own.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+# pyformat (psycopg2), numeric (asyncpg), qmark and named bind styles; "::" casts are left alone
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|(?<![:\w]):\w+")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+# IN-lists of any length, with asyncpg's "$1::VARCHAR" style casts on each item
+_LIST_ITEM = r"\?(?:::\w+(?:\(\?(?:,\s*\?)?\))?(?:\[\])?)?"
+_LISTS = re.compile(rf"\b(IN\s*)\(\s*{_LIST_ITEM}(?:\s*,\s*{_LIST_ITEM})*\s*\)", re.I)
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+# Plan properties holding SQL expressions, and with them the statement's literals
+_PLAN_EXPRESSIONS = re.compile(r"(Cond|Condition|Filter|Key|Output|Order By|Call|Parameters|Seed)$")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement text with every literal and parameter replaced by ?"""
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _LISTS.sub(r"\1(?+)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+def strip_plan_literals(node):
+    """EXPLAIN (FORMAT JSON) output with literals in its expressions replaced by ?"""
+    if isinstance(node, list):
+        return [strip_plan_literals(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    stripped = {}
+    for key, value in node.items():
+        if _PLAN_EXPRESSIONS.search(key):
+            # Sort/Group keys and Output are lists of expressions, conditions a single one
+            if isinstance(value, list):
+                value = [normalize_sql(v) if isinstance(v, str) else v for v in value]
+            elif isinstance(value, str):
+                value = normalize_sql(value)
+        else:
+            value = strip_plan_literals(value)
+        stripped[key] = value
+    return stripped
+
+
+class StatementStats:
+    """Timings of one fingerprint on one engine"""
+
+    def __init__(self, engine: str, normalized: str):
+        self.engine = engine
+        self.fingerprint = fingerprint(normalized)
+        self.statement = normalized
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        # Recent durations for the percentile; bounded so hot statements don't grow it
+        self.samples = deque(maxlen=settings.QUERY_LOG_SAMPLES)
+        self.explain: Optional[dict] = None
+        self.explained_at = 0.0
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.samples.append(ms)
+        if ms >= settings.SLOW_QUERY_MS:
+            self.slow_count += 1
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def snapshot(self, include_explain: bool = True) -> dict:
+        entry = {
+            "fingerprint": self.fingerprint,
+            "engine": self.engine,
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "slow_count": self.slow_count
+        }
+        if include_explain:
+            entry["explain"] = self.explain
+        return entry
+
+
+# (engine name, normalized statement) -> stats
+_stats: Dict[tuple, StatementStats] = {}
+_lock = threading.Lock()
+
+
+def _record(engine: str, statement: str, ms: float) -> StatementStats:
+    normalized = normalize_sql(statement)
+    key = (engine, normalized)
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            if len(_stats) >= settings.QUERY_LOG_MAX_FINGERPRINTS:
+                # Make room by dropping the fingerprint that cost the least so far
+                del _stats[min(_stats, key=lambda k: _stats[k].total_ms)]
+            entry = _stats[key] = StatementStats(engine, normalized)
+        entry.observe(ms)
+        return entry
+
+
+def _claim_explain(entry: StatementStats) -> bool:
+    """True if this caller should capture a plan for `entry` now"""
+    now = time.monotonic()
+    with _lock:
+        if entry.explained_at and now - entry.explained_at < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return False
+        entry.explained_at = now
+        return True
+
+
+def _capture_explain(conn, statement: str, parameters) -> Optional[dict]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) of `statement` on `conn`, a connection of its own.
+
+    Runs on a fresh DBAPI cursor so it fires no engine events; the
+    transaction it opens is rolled back when `conn` goes back to the pool.
+    """
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    if isinstance(plan, str):
+        plan = json.loads(plan)  # asyncpg returns untyped json columns as text
+    return strip_plan_literals(plan[0])
+
+
+def _store_explain(entry: StatementStats, plan: dict, ms: float):
+    with _lock:
+        entry.explain = {"duration_ms": round(ms, 3), "captured_at": time.time(), "plan": plan}
+
+
+# Plans are captured after the slow statement has returned, so the request never
+# waits for ANALYZE: sync engines on this thread, async ones as a task on the
+# request's event loop. Either way the plan sees only committed data.
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-log-explain")
+# Running capture tasks, referenced so they aren't garbage collected mid-flight
+_explain_tasks = set()
+
+
+def _explain_sync(engine, entry: StatementStats, statement: str, parameters, ms: float):
+    try:
+        with engine.connect() as conn:
+            plan = _capture_explain(conn, statement, parameters)
+    except Exception as e:
+        logger.warning("EXPLAIN failed for [%s]: %s", entry.fingerprint, e)
+        return
+    _store_explain(entry, plan, ms)
+
+
+async def _explain_async(engine, entry: StatementStats, statement: str, parameters, ms: float):
+    try:
+        async with engine.connect() as conn:
+            plan = await conn.run_sync(_capture_explain, statement, parameters)
+    except Exception as e:
+        logger.warning("EXPLAIN failed for [%s]: %s", entry.fingerprint, e)
+        return
+    _store_explain(entry, plan, ms)
+
+
+def _schedule_explain(engine, entry: StatementStats, statement: str, parameters, ms: float):
+    """Capture a plan for `entry` in the background"""
+    if getattr(engine, "sync_engine", None) is None:
+        _explain_executor.submit(_explain_sync, engine, entry, statement, parameters, ms)
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # async engine driven outside a loop; nowhere to run the capture
+    task = loop.create_task(_explain_async(engine, entry, statement, parameters, ms))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+def log_queries(name: str, engine):
+    """Profile every statement run on `engine` (sync or async) under `name`"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, so a statement that raises leaves nothing behind
+        context._query_log_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_log_start", None)
+        if start is None:
+            return
+        ms = (time.perf_counter() - start) * 1000
+        entry = _record(name, statement, ms)
+        if ms < settings.SLOW_QUERY_MS:
+            return
+
+        logger.warning("Slow query %.1f ms on %s [%s]: %s", ms, name, entry.fingerprint, entry.statement)
+        if (
+            settings.SLOW_QUERY_EXPLAIN
+            and not executemany
+            and _EXPLAINABLE.match(statement)
+            and _claim_explain(entry)
+        ):
+            _schedule_explain(engine, entry, statement, parameters, ms)
+
+
+SORT_KEYS = {
+    "total": lambda e: e.total_ms,
+    "count": lambda e: e.count,
+    "p95": lambda e: e.percentile(0.95),
+    "max": lambda e: e.max_ms
+}
+
+
+def query_stats(sort: str = "total", limit: int = 50, include_explain: bool = True) -> List[dict]:
+    """Fingerprints in this worker, most expensive first by `sort`"""
+    with _lock:
+        entries = sorted(_stats.values(), key=SORT_KEYS[sort], reverse=True)[:limit]
+        return [e.snapshot(include_explain) for e in entries]
+
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
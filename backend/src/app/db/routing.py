@@ -0,0 +1,69 @@
+"""
+Read-replica routing for the read-heavy GET endpoints.
+
+Handlers that only read take `get_read_db`, which hands out a session on
+the replica engine. With READ_YOUR_WRITES_SECONDS set, a request that
+commits on the primary stamps the client with a cookie, and for that many
+seconds its reads go to the primary instead, so replication lag never
+hides its own change. The cookie keeps the window consistent across
+uvicorn workers; cross-origin clients only send it back when they fetch
+with credentials (the frontend's apiFetch does).
+"""
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+import time
+
+from ..core.config import settings
+from .database import PrimaryReadSessionLocal, ReadSessionLocal
+
+LAST_WRITE_COOKIE = "thf_last_write"
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_request_wrote(session):
+    """Flag the request that owns a get_async_db session once it commits"""
+    state = session.info.get("request_state")
+    if state is not None:
+        state.wrote_to_primary = True
+
+
+def wrote_recently(request: Request) -> bool:
+    """True while the client is inside its read-your-writes window"""
+    if settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+async def get_read_db(request: Request):
+    """
+    Read-only AsyncSession on the replica, or on the primary right after a
+    write. Either way a write through it fails instead of being applied.
+    """
+    session_factory = PrimaryReadSessionLocal if wrote_recently(request) else ReadSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Stamps clients with the time of their last committed write"""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            settings.READ_YOUR_WRITES_SECONDS > 0
+            and getattr(request.state, "wrote_to_primary", False)
+        ):
+            response.set_cookie(
+                LAST_WRITE_COOKIE,
+                f"{time.time():.3f}",
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax"
+            )
+        return response
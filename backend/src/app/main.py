@@ -9,6 +9,8 @@ from .api import users
 from .api import agents
 from .api import crm
 from .api import admin
+from .db.query_budget import QueryBudgetMiddleware
+from .db.routing import ReadYourWritesMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +26,9 @@ app = FastAPI(
     description="API for TailorHomeFinder luxury real estate platform with admin dashboard and CRM"
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryBudgetMiddleware)
+
 CORS_ORIGINS = eval(os.getenv("CORS_ORIGINS", '["http://localhost:5173", "http://localhost:5174"]'))
 app.add_middleware(
     CORSMiddleware,
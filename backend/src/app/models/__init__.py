@@ -1,7 +1,8 @@
 """
 SQLAlchemy models for TailorHomeFinder
 """
-from .property import Property
+from .property import Property, PropertyCluster, SearchSuggestion
+from .import_state import ImportRun, ImportManifest
 from .inquiry import Inquiry, InquiryType, InquiryStatus
 from .user import User, UserStatus, UserRole
 from .agent import Agent, AgentStatus, AgentRole
@@ -22,6 +23,11 @@ from .crm import (
 __all__ = [
     # Property
     "Property",
+    "PropertyCluster",
+    "SearchSuggestion",
+    # Import bookkeeping
+    "ImportRun",
+    "ImportManifest",
     # Inquiry
     "Inquiry",
     "InquiryType",
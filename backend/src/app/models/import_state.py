@@ -0,0 +1,49 @@
+"""
+Import bookkeeping for load_data.py
+"""
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, Boolean, ForeignKey
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class ImportRun(Base):
+    """
+    One row per load_data.py bulk run. The checkpoint columns move forward in
+    the same transaction as each committed batch, so after a crash they point
+    at the last file whose rows are actually in the database.
+    """
+    __tablename__ = "import_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    data_path = Column(String, nullable=False)
+    full = Column(Boolean, nullable=False, default=False)  # Started with --full (manifest ignored)
+    status = Column(String, nullable=False, default="running")  # running, failed, completed
+
+    # Checkpoint
+    last_state = Column(String)
+    last_file = Column(String)
+    files_done = Column(Integer, nullable=False, default=0)
+    rows_done = Column(Integer, nullable=False, default=0)
+
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+
+class ImportManifest(Base):
+    """
+    One row per imported source file, written in the same transaction as
+    the file's properties. Re-runs skip files whose size/mtime (or, failing
+    that, content hash) still match.
+    """
+    __tablename__ = "import_manifest"
+
+    path = Column(String, primary_key=True)  # Relative to the data dir, e.g. states/az/85001.json
+    state = Column(String, index=True)
+    size = Column(BigInteger, nullable=False)
+    mtime = Column(Float, nullable=False)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the raw file
+    row_count = Column(Integer, nullable=False, default=0)
+    run_id = Column(Integer, ForeignKey("import_runs.id"), index=True)  # Run that last imported the file
+    mapping_version = Column(Integer)  # load_data.FIELD_MAPPING_VERSION the rows were mapped with
+    imported_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,8 +1,20 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ARRAY, Boolean, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ARRAY, Boolean, JSON, Index, Computed, DDL, cast, event, false
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
-from geoalchemy2 import Geometry
+from geoalchemy2 import Geometry, Geography
 from ..db.database import Base
 
+# Full-text search document: title outranks address/city/zip, which outrank description.
+# A stored generated column, so PostgreSQL keeps it current on every insert/update.
+TEXT_SEARCH_CONFIG = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(address, '') || ' ' || coalesce(city, '') "
+    "|| ' ' || coalesce(zip_code, '')), 'B') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
 class Property(Base):
     __tablename__ = "properties"
 
@@ -28,10 +40,17 @@ class Property(Base):
     property_type = Column(String, index=True)  # House, Condo, Townhouse, etc.
     status = Column(String, index=True)  # Active, Pending, Sold
     
+    # Market Info
+    estimated_value = Column(Integer)
+    price_per_sqft = Column(Integer)
+    days_on_mls = Column(Integer)
+    
     # Location (for geospatial queries)
+    county = Column(String, index=True)
+    neighborhoods = Column(ARRAY(String))
     latitude = Column(Float)
     longitude = Column(Float)
-    location = Column(Geometry('POINT', srid=4326))  # PostGIS point
+    location = Column(Geometry('POINT', srid=4326))  # PostGIS point, GiST-indexed by GeoAlchemy2
     
     # Additional Details
     description = Column(Text)
@@ -44,22 +63,111 @@ class Property(Base):
     
     # Agent Info
     agent_name = Column(String)
-    agent_phone = Column(String)
+    agent_email = Column(String)
+    agent_phone = Column(String)  # Primary number from agent_phones
+    agent_phones = Column(JSON)  # [{number, type, primary, ext}, ...]
     office_name = Column(String)
     
+    # Nearby schools and tax records (stored as JSON, as HomeHarvest provides them)
+    nearby_schools = Column(JSON)
+    tax_history = Column(JSON)
+    
     # External Links
     property_url = Column(String)
     mls_number = Column(String, index=True)
     
-    # Price History (stored as JSON)
+    # Price History (stored as JSON): [{date, old_price, price, old_status, status}, ...]
+    # appended by the importer when a listing's price or status changes
     price_history = Column(JSON)
     
+    # Hash of the imported column values; re-imports only rewrite rows whose hash changed
+    content_hash = Column(String(32))
+    
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Search optimization
-    is_featured = Column(Boolean, default=False, index=True)
+    # server_default too: the bulk importer's INSERT doesn't list this column
+    is_featured = Column(Boolean, default=False, server_default=false(), index=True)
+    # Deferred so normal property loads don't pull the tsvector
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_properties_created_at_id", "created_at", "id"),
+        Index("ix_properties_search_vector", "search_vector", postgresql_using="gin"),
+        # Lets the leading-wildcard city ILIKE filter use an index
+        Index(
+            "ix_properties_city_trgm", "city",
+            postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}
+        ),
+    )
     
     def __repr__(self):
-        return f"<Property {self.id}: {self.title} - ${self.price}>"
\ No newline at end of file
+        return f"<Property {self.id}: {self.title} - ${self.price}>"
+
+
+# Trigram indexes need pg_trgm before the table is created
+event.listen(Property.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+# Radius search runs ST_DWithin on geography (metres), which the plain
+# geometry GiST index cannot serve, so index the cast expression as well.
+Index(
+    "ix_properties_location_geog",
+    cast(Property.location, Geography(srid=4326)),
+    postgresql_using="gist"
+)
+
+
+class PropertyCluster(Base):
+    """
+    Precomputed map clusters: property counts per grid cell per zoom level.
+    Rebuilt after each import by MapService.refresh_clusters.
+    """
+    __tablename__ = "property_clusters"
+
+    # Grid cell; the composite primary key doubles as the lookup index
+    zoom = Column(Integer, primary_key=True)
+    cell_x = Column(Integer, primary_key=True)
+    cell_y = Column(Integer, primary_key=True)
+
+    count = Column(Integer, nullable=False)
+    avg_price = Column(Integer)
+    latitude = Column(Float, nullable=False)  # Centroid of the cell's properties
+    longitude = Column(Float, nullable=False)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class SearchSuggestion(Base):
+    """
+    Precomputed autocomplete entries: distinct cities, zip codes and addresses.
+    Rebuilt after each import by PropertyService.refresh_suggestions.
+    """
+    __tablename__ = "search_suggestions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    kind = Column(String, nullable=False)  # city, zip, address
+    value = Column(String, nullable=False)  # Filter value, e.g. the city name
+    label = Column(String, nullable=False)  # Display text, e.g. "Phoenix, AZ"
+    search_text = Column(String, nullable=False)  # lower(label), trigram-indexed
+    state = Column(String)
+    count = Column(Integer, nullable=False)
+    property_id = Column(String)  # Set when the suggestion matches exactly one property
+
+    __table_args__ = (
+        Index(
+            "ix_search_suggestions_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}
+        ),
+        # Prefixes too short for trigrams: LIKE 'x%' in any collation
+        Index(
+            "ix_search_suggestions_prefix", "search_text",
+            postgresql_ops={"search_text": "text_pattern_ops"}
+        ),
+    )
+
+
+event.listen(SearchSuggestion.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
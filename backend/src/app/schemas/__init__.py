@@ -5,8 +5,19 @@ from .property import (
     PropertyBase,
     PropertyCreate,
     PropertyResponse,
+    PropertyPartialResponse,
+    PropertyView,
     PropertySearch,
-    PropertyList
+    PropertyList,
+    PropertyBatchRequest,
+    PropertyBatchResponse,
+    PropertyClusterResponse,
+    PropertyClusterList,
+    AutocompleteSuggestion,
+    AutocompleteResponse,
+    FacetBucket,
+    FacetField,
+    CountStrategy
 )
 from .inquiry import (
     InquiryCreate,
@@ -87,8 +98,19 @@ __all__ = [
     "PropertyBase",
     "PropertyCreate",
     "PropertyResponse",
+    "PropertyPartialResponse",
+    "PropertyView",
     "PropertySearch",
     "PropertyList",
+    "PropertyBatchRequest",
+    "PropertyBatchResponse",
+    "PropertyClusterResponse",
+    "PropertyClusterList",
+    "AutocompleteSuggestion",
+    "AutocompleteResponse",
+    "FacetBucket",
+    "FacetField",
+    "CountStrategy",
     # Inquiry schemas
     "InquiryCreate",
     "InquiryResponse",
@@ -1,6 +1,40 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, create_model, model_serializer
+from typing import Optional, List, Dict, Union, Any
 from datetime import datetime
+from enum import Enum
+
+
+class CountStrategy(str, Enum):
+    """How PropertyList.total was computed"""
+    EXACT = "exact"          # COUNT(*) over the filtered set
+    ESTIMATED = "estimated"  # PostgreSQL planner row estimate
+    CACHED = "cached"        # Exact count reused from a recent identical search
+
+
+class FacetField(str, Enum):
+    """Facets that can be requested with ?facets="""
+    PROPERTY_TYPE = "property_type"
+    STATUS = "status"
+    BEDS = "beds"    # 0..4, 5+, unknown
+    PRICE = "price"  # Ranges from FACET_PRICE_BUCKETS
+
+
+class PropertyView(str, Enum):
+    """Named field sets for property list responses (?view=)"""
+    CARD = "card"  # Search result cards
+    MAP = "map"    # Map markers
+    FULL = "full"  # Every column (default)
+
+
+# Fields loaded and returned per view; FULL means all PropertyResponse fields
+PROPERTY_VIEW_FIELDS = {
+    PropertyView.CARD: [
+        "id", "title", "address", "city", "state", "zip_code", "price", "beds",
+        "baths", "sqft", "property_type", "status", "image", "is_featured"
+    ],
+    PropertyView.MAP: ["id", "latitude", "longitude", "price", "beds", "status"],
+}
+
 
 class PropertyBase(BaseModel):
     title: str
@@ -21,11 +55,20 @@ class PropertyBase(BaseModel):
     description: Optional[str] = None
     features: Optional[List[str]] = []
     hoa_fee: Optional[int] = None
+    estimated_value: Optional[int] = None
+    price_per_sqft: Optional[int] = None
+    days_on_mls: Optional[int] = None
+    county: Optional[str] = None
+    neighborhoods: Optional[List[str]] = None
     image: Optional[str] = None
     alt_photos: Optional[List[str]] = []
     agent_name: Optional[str] = None
+    agent_email: Optional[str] = None
     agent_phone: Optional[str] = None
+    agent_phones: Optional[List[dict]] = None
     office_name: Optional[str] = None
+    nearby_schools: Optional[List[Any]] = None
+    tax_history: Optional[List[Any]] = None
     property_url: Optional[str] = None
     mls_number: Optional[str] = None
     price_history: Optional[List[dict]] = []
@@ -42,6 +85,26 @@ class PropertyResponse(PropertyBase):
     class Config:
         from_attributes = True
 
+class _SelectedFieldsOnly(BaseModel):
+    """Serializes only the fields that were explicitly set"""
+
+    @model_serializer(mode="wrap")
+    def _dump_selected(self, handler):
+        data = handler(self)
+        return {key: value for key, value in data.items() if key in self.model_fields_set}
+
+# PropertyResponse with every field optional except id, for ?view= / ?fields= projections
+PropertyPartialResponse = create_model(
+    "PropertyPartialResponse",
+    __base__=_SelectedFieldsOnly,
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in PropertyResponse.model_fields.items()
+        if name != "id"
+    },
+    id=(str, ...)
+)
+
 class PropertySearch(BaseModel):
     query: Optional[str] = None
     city: Optional[str] = None
@@ -58,8 +121,51 @@ class PropertySearch(BaseModel):
     limit: int = Field(default=20, le=100)
     offset: int = 0
 
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
 class PropertyList(BaseModel):
     total: int
-    properties: List[PropertyResponse]
+    properties: List[Union[PropertyResponse, PropertyPartialResponse]]
     limit: int
     offset: int
+    total_strategy: CountStrategy = CountStrategy.EXACT
+    next_cursor: Optional[str] = None  # Set in cursor mode when more rows follow
+    facets: Optional[Dict[str, List[FacetBucket]]] = None  # Only when ?facets= is given
+
+class PropertyBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=300)
+
+class PropertyBatchResponse(BaseModel):
+    properties: List[Union[PropertyResponse, PropertyPartialResponse]]  # In request order
+    missing: List[str]  # Requested ids with no matching property
+
+class PropertyClusterResponse(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    avg_price: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class PropertyClusterList(BaseModel):
+    zoom: int  # Zoom level the clusters were built for (requested zoom, clamped)
+    total: int  # Properties represented by all returned clusters
+    clusters: List[PropertyClusterResponse]
+
+class AutocompleteSuggestion(BaseModel):
+    kind: str  # city, zip, address
+    value: str
+    label: str
+    state: Optional[str] = None
+    count: int
+    property_id: Optional[str] = None  # Set when exactly one property matches
+
+    class Config:
+        from_attributes = True
+
+class AutocompleteResponse(BaseModel):
+    prefix: str
+    suggestions: List[AutocompleteSuggestion]
@@ -2,10 +2,12 @@
 Services for TailorHomeFinder API
 """
 from .property_service import PropertyService
+from .map_service import MapService
 from .email_service import EmailService, email_service, send_inquiry_emails
 
 __all__ = [
     "PropertyService",
+    "MapService",
     "EmailService",
     "email_service",
     "send_inquiry_emails"
@@ -0,0 +1,181 @@
+"""
+Map service - precomputed marker clusters and vector tiles for the map view
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
+import math
+
+from ..core.cache import TTLCache, DiskLRUCache
+from ..core.config import settings
+from ..models.property import PropertyCluster
+
+# Rendered tiles, shared by all workers on this host
+_tile_cache = DiskLRUCache(settings.TILE_CACHE_DIR, settings.TILE_CACHE_MAX_MB * 1024 * 1024)
+# Current data version, so tile requests don't each query it
+_version_cache = TTLCache(ttl=settings.TILE_VERSION_TTL_SECONDS, max_entries=1)
+
+
+class MapService:
+    """Clusters and vector tiles for the property map"""
+
+    # Data version whose tiles are on disk; older versions get purged
+    _last_tile_version = None
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ================== Clusters ==================
+
+    @staticmethod
+    def clamp_zoom(zoom: int) -> int:
+        """Nearest zoom level that has precomputed clusters"""
+        return max(settings.CLUSTER_MIN_ZOOM, min(settings.CLUSTER_MAX_ZOOM, zoom))
+
+    @staticmethod
+    def cell_size(zoom: int) -> float:
+        """Cluster cell edge in degrees; each map tile holds 2^CLUSTER_CELL_BITS cells per side"""
+        return 360.0 / (2 ** (zoom + settings.CLUSTER_CELL_BITS))
+
+    def get_clusters(
+        self,
+        zoom: int,
+        bbox: Tuple[float, float, float, float]
+    ) -> List[PropertyCluster]:
+        """
+        Clusters intersecting bbox at the given zoom.
+
+        The bbox is converted to a cell range, so this is a single range
+        scan on the (zoom, cell_x, cell_y) primary key.
+        """
+        min_lng, min_lat, max_lng, max_lat = bbox
+        size = self.cell_size(zoom)
+
+        return (
+            self.db.query(PropertyCluster)
+            .filter(
+                PropertyCluster.zoom == zoom,
+                PropertyCluster.cell_x.between(
+                    math.floor((min_lng + 180) / size), math.floor((max_lng + 180) / size)
+                ),
+                PropertyCluster.cell_y.between(
+                    math.floor((min_lat + 90) / size), math.floor((max_lat + 90) / size)
+                )
+            )
+            .all()
+        )
+
+    def refresh_clusters(self) -> int:
+        """
+        Rebuild property_clusters for every configured zoom level.
+
+        Runs in one transaction, so readers keep seeing the previous
+        clusters until the new set is committed. Returns the row count.
+        """
+        self.db.execute(text("DELETE FROM property_clusters"))
+        result = self.db.execute(
+            text("""
+                INSERT INTO property_clusters
+                    (zoom, cell_x, cell_y, count, avg_price, latitude, longitude, refreshed_at)
+                SELECT
+                    z.zoom,
+                    floor((p.longitude + 180) / (360.0 / power(2, z.zoom + :cell_bits)))::int,
+                    floor((p.latitude + 90) / (360.0 / power(2, z.zoom + :cell_bits)))::int,
+                    count(*),
+                    avg(p.price)::int,
+                    avg(p.latitude),
+                    avg(p.longitude),
+                    now()
+                FROM properties p
+                CROSS JOIN generate_series(:min_zoom, :max_zoom) AS z(zoom)
+                WHERE p.latitude IS NOT NULL AND p.longitude IS NOT NULL
+                GROUP BY 1, 2, 3
+            """),
+            {
+                "cell_bits": settings.CLUSTER_CELL_BITS,
+                "min_zoom": settings.CLUSTER_MIN_ZOOM,
+                "max_zoom": settings.CLUSTER_MAX_ZOOM
+            }
+        )
+        self.db.commit()
+        return result.rowcount
+
+    # ================== Vector Tiles ==================
+
+    def data_version(self) -> str:
+        """
+        Identifier of the currently imported data set.
+
+        refresh_clusters runs after every import and stamps all cluster rows
+        with one refreshed_at, so any row carries the version.
+        """
+        refreshed_at = self.db.execute(
+            text("SELECT refreshed_at FROM property_clusters LIMIT 1")
+        ).scalar()
+        return refreshed_at.strftime("%Y%m%d%H%M%S%f") if refreshed_at else "0"
+
+    @staticmethod
+    def use_data_version(version: str):
+        """Remember `version` as current, purging tiles of older imports from disk"""
+        if version != MapService._last_tile_version:
+            _tile_cache.purge_except(version)
+            MapService._last_tile_version = version
+        _version_cache.set("version", version)
+
+    @staticmethod
+    def cached_tile(version: str, z: int, x: int, y: int) -> Optional[bytes]:
+        return _tile_cache.get((version, z, x, f"{y}.mvt"))
+
+    @staticmethod
+    def store_tile(version: str, z: int, x: int, y: int, tile: bytes):
+        _tile_cache.set((version, z, x, f"{y}.mvt"), tile)
+
+    @staticmethod
+    async def get_tile(db: AsyncSession, z: int, x: int, y: int) -> bytes:
+        """
+        Mapbox Vector Tile of property points, served from the disk cache when possible.
+
+        Only the queries run through `db.run_sync`, which drives them on the
+        event loop thread; the disk cache reads, writes and purges go to the
+        threadpool so they never block the loop.
+        """
+        version = _version_cache.get("version")
+        if version is None:
+            version = await db.run_sync(lambda session: MapService(session).data_version())
+            await run_in_threadpool(MapService.use_data_version, version)
+
+        tile = await run_in_threadpool(MapService.cached_tile, version, z, x, y)
+        if tile is None:
+            tile = await db.run_sync(lambda session: MapService(session).render_tile(z, x, y))
+            await run_in_threadpool(MapService.store_tile, version, z, x, y, tile)
+        return tile
+
+    def render_tile(self, z: int, x: int, y: int) -> bytes:
+        """
+        Build the tile in PostGIS with ST_AsMVT.
+
+        Only id, price, beds and status are encoded; the && against the
+        tile envelope (in 4326) uses the location GiST index.
+        """
+        tile = self.db.execute(
+            text("""
+                WITH bounds AS (
+                    SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+                ),
+                points AS (
+                    SELECT
+                        ST_AsMVTGeom(ST_Transform(p.location, 3857), bounds.geom) AS geom,
+                        p.id,
+                        p.price,
+                        p.beds,
+                        p.status
+                    FROM properties p, bounds
+                    WHERE p.location && ST_Transform(bounds.geom, 4326)
+                )
+                SELECT ST_AsMVT(points.*, 'properties') FROM points
+            """),
+            {"z": z, "x": x, "y": y}
+        ).scalar()
+        return bytes(tile) if tile else b""
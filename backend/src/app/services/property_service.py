@@ -0,0 +1,506 @@
+"""
+Property search service - filter building and pagination helpers
+"""
+from sqlalchemy.orm import Session, Query, load_only
+from sqlalchemy import and_, tuple_, literal, func, cast, case, text, String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from geoalchemy2 import Geography
+from typing import Optional, List, Tuple, Dict
+from datetime import datetime
+import base64
+import json
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..db.explain import planner_row_estimate
+from ..models.property import Property, SearchSuggestion, TEXT_SEARCH_CONFIG
+from ..schemas.property import (
+    CountStrategy,
+    FacetField,
+    PropertyResponse,
+    PropertyPartialResponse,
+    PropertyView,
+    PROPERTY_VIEW_FIELDS
+)
+
+# Exact totals per normalized filter set, shared across requests in this worker
+_count_cache = TTLCache(
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.COUNT_CACHE_MAX_ENTRIES
+)
+# Facet counts per (normalized filter set, requested facets)
+_facet_cache = TTLCache(
+    ttl=settings.FACET_CACHE_TTL_SECONDS,
+    max_entries=settings.FACET_CACHE_MAX_ENTRIES
+)
+
+
+# pg_trgm can't use its index for patterns shorter than one trigram, so shorter
+# autocomplete prefixes only match at the start of a label (btree-indexed)
+TRIGRAM_MIN_LENGTH = 3
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class InvalidSearchError(ValueError):
+    """Raised when a search parameter cannot be parsed"""
+
+
+class PropertyService:
+    """Builds property search queries shared by the property endpoints"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ================== Filters ==================
+
+    def build_filters(
+        self,
+        q: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        zip_code: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        beds: Optional[int] = None,
+        baths: Optional[float] = None,
+        property_type: Optional[str] = None,
+        status: Optional[str] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        near: Optional[Tuple[float, float]] = None,
+        radius_m: Optional[float] = None
+    ) -> list:
+        """Translate search parameters into SQLAlchemy filter clauses"""
+        filters = []
+
+        if q:
+            filters.append(Property.search_vector.op("@@")(self.text_query(q)))
+        if city:
+            filters.append(Property.city.ilike(f"%{city}%"))
+        if state:
+            filters.append(Property.state == state)
+        if zip_code:
+            filters.append(Property.zip_code == zip_code)
+        if min_price:
+            filters.append(Property.price >= min_price)
+        if max_price:
+            filters.append(Property.price <= max_price)
+        if beds:
+            filters.append(Property.beds >= beds)
+        if baths:
+            filters.append(Property.baths >= baths)
+        if property_type:
+            filters.append(Property.property_type == property_type)
+        if status:
+            filters.append(Property.status == status)
+        if bbox:
+            filters.append(self.within_bbox(bbox))
+        if near and radius_m:
+            filters.append(self.within_radius(near, radius_m))
+
+        return filters
+
+    @staticmethod
+    def text_query(q: str):
+        """Parse free text the way web search boxes do: quotes, OR, -exclusions"""
+        return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, q)
+
+    @staticmethod
+    def within_bbox(bbox: Tuple[float, float, float, float]):
+        """Envelope overlap (&&), answered from the location GiST index"""
+        min_lng, min_lat, max_lng, max_lat = bbox
+        envelope = func.ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326)
+        return Property.location.op("&&")(envelope)
+
+    @staticmethod
+    def within_radius(near: Tuple[float, float], radius_m: float):
+        """
+        Properties within radius_m metres of (lat, lng).
+
+        Both sides are cast to geography so the distance is in metres; the
+        cast matches the ix_properties_location_geog expression index.
+        """
+        lat, lng = near
+        origin = func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326)
+        return func.ST_DWithin(
+            cast(Property.location, Geography(srid=4326)),
+            cast(origin, Geography(srid=4326)),
+            radius_m
+        )
+
+    @staticmethod
+    def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+        """Parse `min_lng,min_lat,max_lng,max_lat` (west, south, east, north)"""
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(v) for v in value.split(","))
+        except ValueError:
+            raise InvalidSearchError("bbox must be min_lng,min_lat,max_lng,max_lat")
+        if not (-180 <= min_lng <= max_lng <= 180 and -90 <= min_lat <= max_lat <= 90):
+            raise InvalidSearchError("bbox is outside valid longitude/latitude ranges")
+        return min_lng, min_lat, max_lng, max_lat
+
+    @staticmethod
+    def parse_point(value: str) -> Tuple[float, float]:
+        """Parse `lat,lng`"""
+        try:
+            lat, lng = (float(v) for v in value.split(","))
+        except ValueError:
+            raise InvalidSearchError("near must be lat,lng")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise InvalidSearchError("near is outside valid latitude/longitude ranges")
+        return lat, lng
+
+    def search_query(self, filters: list) -> Query:
+        """Base property query with the given filters applied"""
+        query = self.db.query(Property)
+        if filters:
+            query = query.filter(and_(*filters))
+        return query
+
+    # ================== Autocomplete ==================
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[SearchSuggestion]:
+        """
+        Suggestions containing `prefix`, answered from the trigram index on
+        search_suggestions. Prefixes shorter than TRIGRAM_MIN_LENGTH only
+        match labels starting with them, from the text_pattern_ops index.
+        Labels starting with the prefix rank first, then cities before zips
+        before addresses, then by property count.
+        """
+        needle = prefix.strip().lower()
+        if not needle:
+            return []
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        starts_with = SearchSuggestion.search_text.like(f"{escaped}%", escape="\\")
+        if len(needle) < TRIGRAM_MIN_LENGTH:
+            matches = starts_with
+        else:
+            matches = SearchSuggestion.search_text.like(f"%{escaped}%", escape="\\")
+        kind_order = case({"city": 0, "zip": 1}, value=SearchSuggestion.kind, else_=2)
+
+        return (
+            self.db.query(SearchSuggestion)
+            .filter(matches)
+            .order_by(
+                starts_with.desc(),
+                kind_order,
+                SearchSuggestion.count.desc(),
+                SearchSuggestion.label
+            )
+            .limit(limit)
+            .all()
+        )
+
+    def refresh_suggestions(self) -> int:
+        """
+        Rebuild search_suggestions from properties in one transaction.
+        Returns the number of suggestions written.
+        """
+        self.db.execute(text("DELETE FROM search_suggestions"))
+        result = self.db.execute(text("""
+            INSERT INTO search_suggestions (kind, value, label, search_text, state, count, property_id)
+            SELECT kind, value, label, lower(label), state, count, property_id
+            FROM (
+                SELECT 'city' AS kind, city AS value,
+                       city || ', ' || upper(coalesce(state, '')) AS label,
+                       state, count(*) AS count,
+                       CASE WHEN count(*) = 1 THEN min(id) END AS property_id
+                FROM properties
+                WHERE coalesce(city, '') <> ''
+                GROUP BY city, state
+                UNION ALL
+                SELECT 'zip', zip_code,
+                       zip_code || ', ' || upper(coalesce(state, '')),
+                       state, count(*),
+                       CASE WHEN count(*) = 1 THEN min(id) END
+                FROM properties
+                WHERE coalesce(zip_code, '') <> ''
+                GROUP BY zip_code, state
+                UNION ALL
+                SELECT 'address', address,
+                       address || ', ' || coalesce(city, '') || ', ' || upper(coalesce(state, '')) || ' ' || coalesce(zip_code, ''),
+                       state, count(*),
+                       CASE WHEN count(*) = 1 THEN min(id) END
+                FROM properties
+                WHERE coalesce(address, '') <> ''
+                GROUP BY address, city, state, zip_code
+            ) s
+        """))
+        self.db.commit()
+        return result.rowcount
+
+    # ================== Counting ==================
+
+    def count(
+        self,
+        query: Query,
+        strategy: CountStrategy,
+        search_params: dict
+    ) -> Tuple[int, CountStrategy]:
+        """
+        Total rows matching `query` using the requested strategy.
+
+        Returns the total and the strategy that actually produced it:
+        an estimate below COUNT_ESTIMATE_EXACT_BELOW is replaced by an exact
+        count, and a cache miss is counted exactly before being stored.
+        """
+        if strategy == CountStrategy.ESTIMATED:
+            estimate = planner_row_estimate(self.db, query.statement)
+            if estimate >= settings.COUNT_ESTIMATE_EXACT_BELOW:
+                return estimate, CountStrategy.ESTIMATED
+            return query.count(), CountStrategy.EXACT
+
+        if strategy == CountStrategy.CACHED:
+            key = self.filter_key(search_params)
+            cached = _count_cache.get(key)
+            if cached is not None:
+                return cached, CountStrategy.CACHED
+            total = query.count()
+            _count_cache.set(key, total)
+            return total, CountStrategy.EXACT
+
+        return query.count(), CountStrategy.EXACT
+
+    @staticmethod
+    def filter_key(search_params: dict) -> tuple:
+        """Normalize filters so equivalent searches share one cache entry"""
+        normalized = []
+        for name, value in sorted(search_params.items()):
+            if value is None or value == "" or value == 0:
+                continue  # Same falsy values build_filters ignores
+            if name == "city":
+                value = value.lower()  # Matched with ilike, so case never matters
+            normalized.append((name, value))
+        return tuple(normalized)
+
+    # ================== Batch Lookup ==================
+
+    def get_many(
+        self,
+        ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Property], List[str]]:
+        """
+        Fetch properties by id in one `id = ANY(:ids)` query.
+
+        Returns the rows in request order (duplicates collapsed) and the
+        ids that matched nothing.
+        """
+        ids = list(dict.fromkeys(ids))
+        query = self.db.query(Property).filter(
+            Property.id == any_(bindparam("ids", ids, type_=ARRAY(String)))
+        )
+        if fields:
+            query = self.load_fields(query, fields)
+
+        found = {row.id: row for row in query.all()}
+        rows = [found[i] for i in ids if i in found]
+        missing = [i for i in ids if i not in found]
+        return rows, missing
+
+    # ================== Projection ==================
+
+    @staticmethod
+    def resolve_fields(
+        view: Optional[PropertyView] = None,
+        fields: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """
+        Response fields for a ?view= or comma-separated ?fields= request.
+        Returns None for the full response; id is always included.
+        """
+        if fields:
+            selected = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = [name for name in selected if name not in PropertyResponse.model_fields]
+            if unknown:
+                raise InvalidSearchError(f"Unknown fields: {', '.join(unknown)}")
+            return ["id"] + [name for name in dict.fromkeys(selected) if name != "id"]
+        if view and view != PropertyView.FULL:
+            return PROPERTY_VIEW_FIELDS[view]
+        return None
+
+    @staticmethod
+    def load_fields(query: Query, fields: List[str]) -> Query:
+        """
+        Load only the selected columns. created_at is loaded as well because
+        cursor pagination encodes it into next_cursor.
+        """
+        columns = set(fields) | {"id", "created_at"}
+        return query.options(load_only(*[getattr(Property, name) for name in sorted(columns)]))
+
+    @staticmethod
+    def project(rows: List[Property], fields: List[str]) -> List[PropertyPartialResponse]:
+        """Build partial responses from rows loaded by load_fields"""
+        return [
+            PropertyPartialResponse(**{name: getattr(row, name) for name in fields})
+            for row in rows
+        ]
+
+    # ================== Facets ==================
+
+    @staticmethod
+    def price_buckets() -> List[Tuple[Optional[int], Optional[int], str]]:
+        """(low, high, label) price ranges from FACET_PRICE_BUCKETS"""
+        bounds = [int(b) for b in settings.FACET_PRICE_BUCKETS.split(",")]
+        buckets = []
+        low = 0
+        for high in bounds:
+            buckets.append((low, high, f"{low}-{high}"))
+            low = high
+        buckets.append((low, None, f"{low}+"))
+        return buckets
+
+    @staticmethod
+    def parse_facets(value: str) -> List[FacetField]:
+        """Parse a comma-separated facet list, e.g. `status,price`"""
+        try:
+            return [FacetField(name.strip()) for name in value.split(",") if name.strip()]
+        except ValueError:
+            valid = ", ".join(f.value for f in FacetField)
+            raise InvalidSearchError(f"facets must be a comma-separated list of: {valid}")
+
+    def facet_columns(self) -> Dict[FacetField, object]:
+        """Per-facet bucket expression, labelled with the facet name"""
+        beds = case(
+            (Property.beds.is_(None), "unknown"),
+            (Property.beds >= 5, "5+"),
+            else_=cast(Property.beds, String)
+        )
+        price = case(
+            *[(Property.price < high, label) for _, high, label in self.price_buckets()[:-1]],
+            else_=self.price_buckets()[-1][2]
+        )
+        return {
+            FacetField.PROPERTY_TYPE: func.coalesce(Property.property_type, "unknown"),
+            FacetField.STATUS: func.coalesce(Property.status, "unknown"),
+            FacetField.BEDS: beds,
+            FacetField.PRICE: price,
+        }
+
+    def facets(
+        self,
+        query: Query,
+        fields: List[FacetField],
+        search_params: dict
+    ) -> Dict[str, List[dict]]:
+        """
+        Bucket counts for each requested facet over the filtered set.
+
+        All facets come from one scan: the buckets are computed in a
+        subquery and aggregated with GROUPING SETS, one set per facet.
+        Results are cached per normalized filter set for
+        FACET_CACHE_TTL_SECONDS, so nudging one slider back and forth
+        does not rescan.
+        """
+        fields = sorted(set(fields), key=lambda f: f.value)
+        key = (self.filter_key(search_params), tuple(f.value for f in fields))
+        cached = _facet_cache.get(key)
+        if cached is not None:
+            return cached
+
+        columns = self.facet_columns()
+        buckets = query.with_entities(
+            *[columns[f].label(f.value) for f in fields]
+        ).subquery()
+        grouped = [buckets.c[f.value] for f in fields]
+
+        rows = self.db.query(
+            *grouped,
+            *[func.grouping(c) for c in grouped],
+            func.count()
+        ).group_by(func.grouping_sets(*grouped)).all()
+
+        n = len(fields)
+        result = {f.value: [] for f in fields}
+        for row in rows:
+            values, grouping_flags, count = row[:n], row[n:2 * n], row[-1]
+            # GROUPING() is 0 for the one column this set is grouped by
+            index = list(grouping_flags).index(0)
+            result[fields[index].value].append({"value": values[index], "count": count})
+
+        for name, entries in result.items():
+            if name == FacetField.PRICE.value:
+                order = [label for _, _, label in self.price_buckets()]
+                entries.sort(key=lambda e: order.index(e["value"]))
+            elif name == FacetField.BEDS.value:
+                entries.sort(key=lambda e: (not e["value"][0].isdigit(), e["value"]))
+            else:
+                entries.sort(key=lambda e: -e["count"])
+
+        _facet_cache.set(key, result)
+        return result
+
+    # ================== Pagination ==================
+
+    @staticmethod
+    def order_newest_first(query: Query) -> Query:
+        """Stable newest-first ordering; id breaks ties between equal timestamps"""
+        return query.order_by(Property.created_at.desc(), Property.id.desc())
+
+    def order_by_relevance(self, query: Query, q: str) -> Query:
+        """Best ts_rank match first, newest first among equal ranks"""
+        rank = func.ts_rank(Property.search_vector, self.text_query(q))
+        return query.order_by(rank.desc(), Property.created_at.desc(), Property.id.desc())
+
+    def fetch_offset_page(
+        self,
+        query: Query,
+        limit: int,
+        offset: int,
+        q: Optional[str] = None
+    ) -> List[Property]:
+        """Classic OFFSET/LIMIT page, ranked by relevance when searching text"""
+        ordered = self.order_by_relevance(query, q) if q else self.order_newest_first(query)
+        return ordered.offset(offset).limit(limit).all()
+
+    def fetch_cursor_page(
+        self,
+        query: Query,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Property], Optional[str]]:
+        """
+        Keyset page on (created_at, id).
+
+        Seeks directly past the last row of the previous page instead of
+        scanning and discarding `offset` rows, so page N costs the same as
+        page 1. Returns the rows and the cursor for the next page (None on
+        the last page).
+        """
+        if cursor:
+            created_at, last_id = self.decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Property.created_at, Property.id) < tuple_(
+                    literal(created_at, Property.created_at.type),
+                    literal(last_id, Property.id.type)
+                )
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        rows = self.order_newest_first(query).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, self.encode_cursor(rows[-1])
+
+    @staticmethod
+    def encode_cursor(prop: Property) -> str:
+        """Opaque, URL-safe cursor pointing just past the given row"""
+        payload = json.dumps(
+            {"c": prop.created_at.isoformat(), "i": prop.id},
+            separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Inverse of encode_cursor; raises InvalidCursorError on bad input"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(payload["c"]), str(payload["i"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError("Invalid cursor") from e
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+# Tests that need PostgreSQL (with PostGIS and pg_trgm) run against this
+# dedicated database, whose tables they drop and recreate; they skip without it
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+APP_DATABASE_URL = os.getenv("DATABASE_URL")
+
+# The engine modules need a URL at import time; nothing here connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/tailorhomefinder_test")
+
+
+def _database(url: str) -> tuple:
+    url = make_url(url)
+    return url.host or "localhost", url.port or 5432, url.database
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    if APP_DATABASE_URL and _database(TEST_DATABASE_URL) == _database(APP_DATABASE_URL):
+        pytest.exit("TEST_DATABASE_URL is DATABASE_URL's database; use a dedicated one", returncode=1)
+
+    # The bulk loader's tables, bound to the same models it writes through
+    import load_data
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    load_data.Base.metadata.drop_all(engine)
+    load_data.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_db(pg_engine):
+    """Session whose work, commits included, is rolled back after the test"""
+    connection = pg_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
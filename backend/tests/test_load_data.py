@@ -0,0 +1,327 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import load_data
+from app.schemas.property import PropertyResponse
+
+KEY_COLUMNS = ("property_id", "mls", "mls_id", "listing_id", "full_street_line", "street", "city", "zip_code")
+
+
+def frame(*records: dict) -> pd.DataFrame:
+    return pd.DataFrame([{key: record.get(key) for key in KEY_COLUMNS} for record in records])
+
+
+# A record from the HomeHarvest export, trimmed to the fields the mapping reads
+LISTING = {
+    "property_id": "9358843957",
+    "listing_id": "2973579972",
+    "mls": "STNY",
+    "mls_id": "11352554",
+    "status": "FOR_SALE",
+    "style": "MOBILE",
+    "full_street_line": "8865 E Baseline Rd Unit 1516",
+    "street": "8865 E Baseline Rd",
+    "city": "Mesa",
+    "state": "az",
+    "zip_code": "85209",
+    "list_price": 12500,
+    "beds": 1,
+    "full_baths": 1,
+    "sqft": 396,
+    "year_built": 1986,
+    "latitude": 33.377113,
+    "longitude": -111.642494,
+    "primary_photo": "https://ap.rdcpix.com/55e4e959l-m2325200035od-w480_h360_x2.webp",
+    "alt_photos": "https://ap.rdcpix.com/1.webp, https://ap.rdcpix.com/2.webp",
+    "agent_name": "Rebecca Grant",
+    "agent_phones": [{"ext": None, "primary": True, "type": "Office", "number": "4808332223"}],
+    "office_name": "Monte Vista Village Resort",
+    "property_url": "https://www.realtor.com/realestateandhomes-detail/8865-E-Baseline-Rd-1516_Mesa_AZ_85209_M93588-43957",
+    "estimated_value": 74000,
+    "price_per_sqft": 32,
+    "days_on_mls": 471,
+    "county": "Maricopa",
+}
+
+
+# ================== Field Mapping ==================
+
+def map_one(**changes) -> dict:
+    rows = load_data.convert_records([{**LISTING, **changes}])
+    assert len(rows) == 1
+    return rows[0]
+
+
+def test_map_records_maps_a_homeharvest_record():
+    row = map_one()
+    assert row["id"] == load_data.property_ids(pd.Series(["pid:9358843957"]))[0]
+    assert (row["title"], row["address"]) == ("8865 E Baseline Rd Unit 1516", "8865 E Baseline Rd Unit 1516")
+    assert (row["city"], row["state"], row["zip_code"]) == ("Mesa", "az", "85209")
+    assert (row["price"], row["beds"], row["baths"], row["sqft"], row["year_built"]) == (12500, 1, 1.0, 396, 1986)
+    assert (row["property_type"], row["status"]) == ("Mobile", "FOR_SALE")
+    assert (row["latitude"], row["longitude"]) == (33.377113, -111.642494)
+    assert row["image"] == LISTING["primary_photo"]
+    assert row["alt_photos"] == ["https://ap.rdcpix.com/1.webp", "https://ap.rdcpix.com/2.webp"]
+    assert row["agent_phone"] == "4808332223"
+    assert row["agent_phones"] == LISTING["agent_phones"]
+    assert (row["mls_number"], row["estimated_value"], row["days_on_mls"]) == ("11352554", 74000, 471)
+    assert row["content_hash"].startswith(f"v{load_data.FIELD_MAPPING_VERSION}-")
+    assert list(row) == list(load_data.PROPERTY_COLUMNS)
+
+
+def test_map_records_returns_python_scalars_and_none():
+    row = map_one(beds=None, sqft=float("nan"), latitude=None, text=float("nan"), lot_sqft="1849.0")
+    assert row["beds"] is None and row["sqft"] is None
+    assert row["latitude"] is None and row["description"] is None
+    assert row["lot_sqft"] == 1849
+    for column in ("price", "lot_sqft", "year_built", "estimated_value"):
+        assert type(row[column]) is int
+    assert type(row["longitude"]) is float
+
+
+@pytest.mark.parametrize("list_price,price", [("$1,250,000", 1250000), (349999.9, 349999), ("412000", 412000)])
+def test_map_records_parses_prices(list_price, price):
+    assert map_one(list_price=list_price)["price"] == price
+
+
+@pytest.mark.parametrize("list_price", [None, 0, "", "call for price"])
+def test_map_records_drops_unpriced_listings(list_price):
+    assert load_data.convert_records([{**LISTING, "list_price": list_price}]) == []
+
+
+@pytest.mark.parametrize("style,property_type", [
+    ("SINGLE_FAMILY", "House"), ("CONDOS", "Condo"), ("TOWNHOMES", "Townhouse"),
+    ("LAND", "Land"), ("APARTMENT", "House"), (None, "House"),
+])
+def test_map_records_maps_style_to_property_type(style, property_type):
+    assert map_one(style=style)["property_type"] == property_type
+
+
+def test_map_records_fills_required_text_columns():
+    row = map_one(full_street_line=None, street=None, city=None, status=None)
+    assert (row["title"], row["address"], row["city"], row["status"]) == ("Property", "", "", "Active")
+
+
+@pytest.mark.parametrize("phones,number", [
+    ([{"number": "1", "primary": False}, {"number": "2", "primary": True}], "2"),
+    ([{"number": "1"}, {"number": "2"}], "1"),
+    ('[{"number": "3", "primary": true}]', "3"),  # Parquet cache stores nested values as JSON
+    (["5550100"], "5550100"),
+    ([], None),
+    (None, None),
+])
+def test_map_records_picks_the_primary_phone(phones, number):
+    assert map_one(agent_phones=phones)["agent_phone"] == number
+
+
+def test_map_records_keeps_the_first_alt_photos():
+    urls = [f"https://ap.rdcpix.com/{i}.webp" for i in range(25)]
+    assert map_one(alt_photos=", ".join(urls))["alt_photos"] == urls[:load_data.MAX_ALT_PHOTOS]
+    assert map_one(alt_photos=urls[:3])["alt_photos"] == urls[:3]
+    assert map_one(alt_photos=None)["alt_photos"] == []
+
+
+def test_map_records_splits_neighborhoods_and_wraps_json_lists():
+    row = map_one(neighborhoods="Sunland Village, Superstition Springs", tax_history={"year": 2023, "tax": 180})
+    assert row["neighborhoods"] == ["Sunland Village", "Superstition Springs"]
+    assert row["tax_history"] == [{"year": 2023, "tax": 180}]
+
+
+def test_content_hash_is_stable_and_tracks_the_mapped_values():
+    assert map_one()["content_hash"] == map_one()["content_hash"]
+    assert map_one(text="Freshly painted")["content_hash"] != map_one()["content_hash"]
+    # Source fields the mapping drops don't count as changes
+    assert map_one(listing_id="other", unit="Unit 9")["content_hash"] == map_one()["content_hash"]
+
+
+# ================== Streaming Parser ==================
+
+RECORDS = [
+    {"mls_id": "1", "text": "Ünïcödé ✓ " * 20, "list_price": 350000.5},
+    {"mls_id": "2", "alt_photos": [{"href": "a"}, {"href": "b"}], "nested": {"x": [1, 2, {"y": None}]}},
+    {"mls_id": "3", "text": "brackets ] and commas , in strings"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_stream_parser_yields_array_elements(chunk_size):
+    raw = json.dumps(RECORDS, ensure_ascii=False, indent=2).encode()
+    assert list(load_data._iter_json_values(io.BytesIO(raw), chunk_size)) == RECORDS
+
+
+def test_stream_parser_accepts_a_single_object():
+    raw = b'  {"mls_id": "1"}\n'
+    assert list(load_data._iter_json_values(io.BytesIO(raw), 4)) == [{"mls_id": "1"}]
+
+
+def test_stream_parser_handles_an_empty_array():
+    assert list(load_data._iter_json_values(io.BytesIO(b"[ ]"), 1)) == []
+
+
+def test_stream_parser_rejects_truncated_input():
+    raw = json.dumps(RECORDS).encode()[:-20]
+    with pytest.raises(json.JSONDecodeError):
+        list(load_data._iter_json_values(io.BytesIO(raw), 16))
+
+
+def test_hashing_reader_covers_the_whole_file():
+    raw = json.dumps(RECORDS).encode() + b"\n\n   \n"
+    reader = load_data.HashingReader(io.BytesIO(raw))
+    list(load_data._iter_json_values(reader, 16))
+    assert reader.hexdigest() == load_data.hashlib.sha256(raw).hexdigest()
+
+
+# ================== Cross-file Dedup ==================
+
+def test_compact_hash_set_reports_first_occurrences():
+    seen = load_data.CompactHashSet(capacity=4)
+    assert seen.add_many(np.array([5, 9, 5, 13], dtype=np.uint64)).tolist() == [True, True, False, True]
+    assert seen.add_many(np.array([9, 21, 21], dtype=np.uint64)).tolist() == [False, True, False]
+    assert len(seen) == 4
+
+
+def test_compact_hash_set_grows_and_keeps_its_keys():
+    rng = np.random.default_rng(0)
+    keys = np.unique(rng.integers(1, 2**63, size=5000, dtype=np.uint64))
+    seen = load_data.CompactHashSet(capacity=8)
+    for batch in np.array_split(keys, 10):
+        assert seen.add_many(batch).all()
+    assert len(seen) == len(keys)
+    assert len(seen.table) >= 2 * len(keys)
+    assert not seen.add_many(keys).any()
+
+
+def test_compact_hash_set_accepts_the_empty_marker():
+    seen = load_data.CompactHashSet()
+    assert seen.add_many(np.array([0], dtype=np.uint64)).tolist() == [True]
+    assert seen.add_many(np.array([0], dtype=np.uint64)).tolist() == [False]
+
+
+def test_id_keys_are_the_ids_as_integers():
+    assert load_data.id_keys(["0000000000000001", "ffffffffffffffff"]).tolist() == [1, 2**64 - 1]
+
+
+# ================== Listing Keys ==================
+
+def test_listing_keys_use_the_strongest_identifier():
+    keys = load_data.listing_keys(frame(
+        {"property_id": " 9358843957 ", "mls": "ARMLS", "mls_id": "1", "listing_id": "2"},
+        {"mls": "armls", "mls_id": "11352554", "listing_id": "2"},
+        {"mls_id": "11352554", "listing_id": "2971467343"},
+        {"full_street_line": "8865 E Baseline Rd", "city": "Mesa", "zip_code": "85209"},
+        {"street": "  ", "city": "", "zip_code": None},
+    ))
+    assert keys.tolist()[:4] == [
+        "pid:9358843957",
+        "mls:ARMLS:11352554",
+        "lid:2971467343",
+        "addr:8865 e baseline rd|mesa|85209",
+    ]
+    assert pd.isna(keys.iloc[4])
+
+
+def test_the_same_house_gets_the_same_id_from_every_file():
+    a = frame({"full_street_line": "8865 E Baseline Rd", "city": "Mesa", "zip_code": "85209"})
+    b = frame({"street": " 8865 e baseline rd ", "city": "MESA", "zip_code": "85209"})
+    ids = load_data.property_ids(pd.concat([load_data.listing_keys(a), load_data.listing_keys(b)]))
+    assert ids[0] == ids[1]
+    assert len(ids[0]) == 16
+
+
+def test_records_without_an_identifier_get_no_id():
+    assert load_data.property_ids(load_data.listing_keys(frame({"city": None}))) == [None]
+
+
+# ================== Bulk Path (COPY + merge) ==================
+
+def import_records(db, *records: dict):
+    """Run records through the bulk path's convert, COPY and merge stages"""
+    mapped = load_data.map_records(load_data.records_frame(records))
+    load_data.copy_rows_to_staging(db, list(mapped.itertuples(index=False, name=None)))
+    result = load_data.merge_staging(db)
+    # Stands in for ON COMMIT DELETE ROWS, which the test's outer transaction never reaches
+    db.execute(text("DELETE FROM property_staging"))
+    db.commit()
+    return result, list(mapped["id"])
+
+
+def test_imported_rows_validate_as_responses(pg_db):
+    _, (property_id,) = import_records(pg_db, LISTING)
+    imported = pg_db.get(load_data.Property, property_id)
+    assert imported.is_featured is False
+    response = PropertyResponse.model_validate(imported)
+    assert response.id == property_id
+    assert response.is_featured is False
+    assert response.created_at is not None
+
+
+def test_merge_skips_unchanged_listings(pg_db):
+    assert import_records(pg_db, LISTING)[0] == (1, 0)
+    (inserted, updated), (property_id,) = import_records(pg_db, LISTING)
+    assert (inserted, updated) == (0, 0)
+    assert pg_db.get(load_data.Property, property_id).updated_at is None
+
+
+def test_merge_rewrites_changed_listings_without_price_history(pg_db):
+    import_records(pg_db, LISTING)
+    result, (property_id,) = import_records(pg_db, {**LISTING, "text": "Freshly painted", "beds": 2})
+    assert result == (0, 1)
+    imported = pg_db.get(load_data.Property, property_id)
+    assert (imported.description, imported.beds) == ("Freshly painted", 2)
+    assert imported.updated_at is not None
+    assert imported.price_history is None
+
+
+def test_merge_appends_price_and_status_changes(pg_db):
+    import_records(pg_db, LISTING)
+    import_records(pg_db, {**LISTING, "list_price": 11900})
+    _, (property_id,) = import_records(pg_db, {**LISTING, "list_price": 11900, "status": "PENDING"})
+    history = pg_db.get(load_data.Property, property_id).price_history
+    assert [(h["old_price"], h["price"], h["old_status"], h["status"]) for h in history] == [
+        (12500, 11900, "FOR_SALE", "FOR_SALE"),
+        (11900, 11900, "FOR_SALE", "PENDING"),
+    ]
+    assert all(h["date"] for h in history)
+
+
+def test_merge_collapses_duplicates_within_a_batch(pg_db):
+    result, ids = import_records(pg_db, LISTING, {**LISTING, "zip_code": "85209", "city": "Mesa"})
+    assert ids[0] == ids[1]
+    assert result == (1, 0)
+
+
+# ================== File Order ==================
+
+def test_state_files_are_listed_in_name_order(tmp_path):
+    for state, zips in (("tx", ("78701", "75001")), ("az", ("85209", "85004", "85281"))):
+        (tmp_path / state).mkdir()
+        for zip_code in zips:
+            (tmp_path / state / f"{zip_code}.json").write_text("[]")
+    listed = [(state, [f.name for f in files]) for state, files in load_data.iter_state_files(tmp_path)]
+    assert listed == [("az", ["85004.json", "85209.json", "85281.json"]), ("tx", ["75001.json", "78701.json"])]
+
+
+def test_parallel_parse_results_come_back_in_file_order(tmp_path, monkeypatch):
+    files = []
+    for i in range(12):
+        files.append(str(tmp_path / f"{i:05}.json"))
+        Path(files[-1]).write_text("[]")
+
+    def parse_slowest_first(group, stream=False):
+        # Earlier files finish last, so completion order is the reverse of file order
+        time.sleep((len(files) - files.index(group[0])) * 0.005)
+        return [(f, None, [], None) for f in group]
+
+    monkeypatch.setattr(load_data, "PARSE_BYTES_PER_TASK", 1)
+    monkeypatch.setattr(load_data, "parse_zip_files", parse_slowest_first)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parsed = [result[0] for result in load_data.iter_parsed_files(files, executor, max_pending=4)]
+    assert parsed == files
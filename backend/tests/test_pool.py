@@ -0,0 +1,33 @@
+import pytest
+
+from app.core.config import settings
+from app.db.pool import pool_sizing
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    def configure(budget=30, workers=1, pool_size=0, max_overflow=-1):
+        monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", budget)
+        monkeypatch.setattr(settings, "WEB_CONCURRENCY", workers)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", pool_size)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", max_overflow)
+    return configure
+
+
+@pytest.mark.parametrize("workers,engines", [(1, 1), (1, 2), (4, 1), (4, 2), (7, 2)])
+def test_budget_is_never_exceeded(pool_settings, workers, engines):
+    pool_settings(budget=60, workers=workers)
+    pool_size, max_overflow = pool_sizing(engines)
+    assert (pool_size + max_overflow) * workers * engines <= 60
+    assert pool_size >= 1
+
+
+def test_third_of_the_share_is_kept_open(pool_settings):
+    pool_settings(budget=30)
+    assert pool_sizing() == (10, 20)
+    assert pool_sizing(2) == (5, 10)
+
+
+def test_explicit_sizes_win(pool_settings):
+    pool_settings(budget=30, workers=4, pool_size=3, max_overflow=0)
+    assert pool_sizing(2) == (3, 0)
@@ -0,0 +1,69 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.models.property import SearchSuggestion
+from app.services.property_service import InvalidCursorError, PropertyService
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = PropertyService.encode_cursor(SimpleNamespace(created_at=created_at, id="0123456789abcdef"))
+    assert "=" not in cursor
+    assert PropertyService.decode_cursor(cursor) == (created_at, "0123456789abcdef")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJjIjoxfQ", "eyJpIjoiYSJ9"])
+def test_bad_cursors_raise(cursor):
+    with pytest.raises(InvalidCursorError):
+        PropertyService.decode_cursor(cursor)
+
+
+# ================== Autocomplete ==================
+
+SUGGESTIONS = [
+    ("city", "Mesa", "Mesa, AZ", "AZ", 40),
+    ("city", "Amesbury", "Amesbury, MA", "MA", 3),
+    ("zip", "85209", "85209, AZ", "AZ", 25),
+    ("address", "8865 E Baseline Rd", "8865 E Baseline Rd, Mesa, AZ", "AZ", 1),
+]
+
+
+@pytest.fixture
+def suggestions(pg_db):
+    pg_db.execute(
+        text(
+            "INSERT INTO search_suggestions (kind, value, label, search_text, state, count) "
+            "VALUES (:kind, :value, :label, lower(:label), :state, :count)"
+        ),
+        [dict(zip(("kind", "value", "label", "state", "count"), row)) for row in SUGGESTIONS]
+    )
+    return PropertyService(pg_db)
+
+
+def test_short_prefixes_only_match_label_starts(suggestions):
+    assert [s.label for s in suggestions.autocomplete("me")] == ["Mesa, AZ"]
+    assert [s.label for s in suggestions.autocomplete("8")] == ["85209, AZ", "8865 E Baseline Rd, Mesa, AZ"]
+
+
+def test_longer_prefixes_match_anywhere_with_starts_first(suggestions):
+    assert [s.label for s in suggestions.autocomplete(" MES ")] == [
+        "Mesa, AZ", "Amesbury, MA", "8865 E Baseline Rd, Mesa, AZ"
+    ]
+
+
+def test_wildcards_in_the_prefix_are_literal(suggestions):
+    assert suggestions.autocomplete("%") == []
+    assert suggestions.autocomplete("m_s") == []
+    assert suggestions.autocomplete("   ") == []
+
+
+def test_short_prefixes_can_use_the_btree_index(suggestions, pg_db):
+    pg_db.execute(text("SET LOCAL enable_seqscan = off"))
+    query = pg_db.query(SearchSuggestion).filter(SearchSuggestion.search_text.like("me%", escape="\\"))
+    plan = pg_db.execute(
+        text(f"EXPLAIN {query.statement.compile(pg_db.get_bind(), compile_kwargs={'literal_binds': True})}")
+    ).scalars().all()
+    assert any("ix_search_suggestions_prefix" in line for line in plan)
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, track_queries
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    track_queries(engine)
+
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/queries/{n}")
+    async def run_queries(n: int):
+        with engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ran": n}
+
+    with TestClient(app) as client:
+        yield client
+    engine.dispose()
+
+
+def test_server_timing_counts_statements(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+    response = client.get("/queries/4")
+    assert response.status_code == 200
+    assert 'desc="4 queries"' in response.headers["Server-Timing"]
+
+
+def test_strict_mode_raises_on_the_statement_over_budget(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    monkeypatch.setattr(settings, "QUERY_BUDGET", 3)
+    assert client.get("/queries/3").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="budget of 3"):
+        client.get("/queries/4")
+
+
+def test_budget_is_per_request(client, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    monkeypatch.setattr(settings, "QUERY_BUDGET", 3)
+    for _ in range(3):
+        assert client.get("/queries/3").status_code == 200
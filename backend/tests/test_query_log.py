@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Integer, String, column, create_engine, select, table, text
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
+
+from app.api import admin
+from app.core.config import settings
+from app.db import query_log
+from app.db.query_log import fingerprint, log_queries, normalize_sql, query_stats, reset_query_stats, strip_plan_literals
+
+properties = table("properties", column("id", String), column("beds", Integer))
+
+
+def compiled(dialect, ids) -> str:
+    query = select(properties.c.id).where(properties.c.id.in_(ids), properties.c.beds >= 3)
+    return str(query.compile(dialect=dialect, compile_kwargs={"render_postcompile": True}))
+
+
+@pytest.mark.parametrize("dialect", [psycopg2.dialect(), asyncpg.dialect()], ids=["psycopg2", "asyncpg"])
+def test_in_lists_of_any_length_share_a_fingerprint(dialect):
+    short = normalize_sql(compiled(dialect, ["a"]))
+    long = normalize_sql(compiled(dialect, ["a", "b", "c", "d"]))
+    assert "IN (?+)" in short
+    assert short == long
+    assert fingerprint(short) == fingerprint(long)
+
+
+def test_literals_comments_and_whitespace_are_normalized():
+    statement = """
+        SELECT * FROM properties  -- listing lookup
+        WHERE city = 'O''Fallon' AND price < 250000.5 AND id IN (1, 2, 3)
+    """
+    assert normalize_sql(statement) == "SELECT * FROM properties WHERE city = ? AND price < ? AND id IN (?+)"
+
+
+def test_casts_survive_normalization():
+    assert normalize_sql("SELECT $1::VARCHAR, col::INTEGER FROM t") == "SELECT ?::VARCHAR, col::INTEGER FROM t"
+    assert normalize_sql("SELECT * FROM t WHERE x IN ($1::NUMERIC(10, 2), $2::NUMERIC(10, 2))") == (
+        "SELECT * FROM t WHERE x IN (?+)"
+    )
+
+
+# ================== Plans ==================
+
+def test_plan_literals_are_stripped():
+    plan = {
+        "Plan": {
+            "Node Type": "Limit",
+            "Plans": [{
+                "Node Type": "Index Scan",
+                "Index Name": "ix_properties_city_2",
+                "Relation Name": "properties",
+                "Index Cond": "((city)::text = 'Phoenix'::text)",
+                "Filter": "((list_price < '250000'::numeric) AND (beds >= 3))",
+                "Sort Key": ["(ST_Distance(location, '0101000020E6100000'::geography))"],
+                "Actual Rows": 20
+            }]
+        },
+        "Execution Time": 12.5
+    }
+    scan = strip_plan_literals(plan)["Plan"]["Plans"][0]
+    assert scan["Index Cond"] == "((city)::text = ?::text)"
+    assert scan["Filter"] == "((list_price < ?::numeric) AND (beds >= ?))"
+    assert scan["Sort Key"] == ["(ST_Distance(location, ?::geography))"]
+    assert scan["Index Name"] == "ix_properties_city_2"
+    assert scan["Actual Rows"] == 20
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    reset_query_stats()
+    yield
+    query_log._explain_executor.submit(lambda: None).result()  # let any capture finish
+    reset_query_stats()
+
+
+def test_slow_statements_return_before_their_plan_is_captured(slow_log, monkeypatch):
+    release = threading.Event()
+
+    def capture(conn, statement, parameters):
+        release.wait(5)
+        return {"Plan": {"Node Type": "Result"}}
+
+    monkeypatch.setattr(query_log, "_capture_explain", capture)
+    engine = create_engine("sqlite://")
+    log_queries("test", engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert query_stats()[0]["explain"] is None
+
+    release.set()
+    query_log._explain_executor.submit(lambda: None).result()
+    assert query_stats()[0]["explain"]["plan"] == {"Plan": {"Node Type": "Result"}}
+    engine.dispose()
+
+
+def test_captured_plans_hold_no_bound_values(slow_log, pg_engine):
+    engine = create_engine(pg_engine.url)
+    log_queries("test", engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT * FROM properties WHERE city = :city LIMIT 1"), {"city": "Tempe"})
+    query_log._explain_executor.submit(lambda: None).result()
+    explain = query_stats()[0]["explain"]
+    assert explain["plan"]["Plan"]["Node Type"] == "Limit"
+    assert "Tempe" not in str(explain)
+    engine.dispose()
+
+
+# ================== Admin Endpoints ==================
+
+@pytest.fixture
+def admin_client():
+    app = FastAPI()
+    app.include_router(admin.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_query_stats_are_closed_without_a_configured_key(admin_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert admin_client.get("/api/admin/stats/queries").status_code == 403
+    assert admin_client.get("/api/admin/stats/queries", headers={"X-Admin-Key": ""}).status_code == 403
+
+
+def test_query_stats_need_the_admin_key(admin_client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "s3cret")
+    assert admin_client.get("/api/admin/stats/queries").status_code == 401
+    assert admin_client.delete("/api/admin/stats/queries", headers={"X-Admin-Key": "wrong"}).status_code == 401
+    response = admin_client.get("/api/admin/stats/queries", headers={"X-Admin-Key": "s3cret"})
+    assert response.status_code == 200
+    assert "queries" in response.json()
+    assert admin_client.delete("/api/admin/stats/queries", headers={"X-Admin-Key": "s3cret"}).json() == {"success": True}
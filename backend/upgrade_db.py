@@ -0,0 +1,78 @@
+"""
+Script to bring an existing TailorHomeFinder database up to date.
+
+create_tables.py only creates missing tables; it never adds indexes or
+columns to tables that already exist. Every statement here is idempotent,
+so this is safe to run after each deploy.
+"""
+import os
+import sys
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import text
+from app.db.database import engine
+from app.models.property import SEARCH_VECTOR_EXPRESSION
+
+UPGRADE_STATEMENTS = [
+    # Keyset pagination on GET /api/properties/?pagination=cursor
+    "CREATE INDEX IF NOT EXISTS ix_properties_created_at_id ON properties (created_at, id)",
+    # Spatial search (bbox= / near=&radius_m=): backfill points, then index them
+    """UPDATE properties
+       SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
+       WHERE location IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL""",
+    "CREATE INDEX IF NOT EXISTS idx_properties_location ON properties USING gist (location)",
+    """CREATE INDEX IF NOT EXISTS ix_properties_location_geog
+       ON properties USING gist (CAST(location AS geography(GEOMETRY,4326)))""",
+    # Full-text search (q=): generated tsvector column plus GIN index
+    f"""ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector
+       GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_properties_search_vector ON properties USING gin (search_vector)",
+    # Trigram index for the city ILIKE filter (autocomplete has its own table)
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_properties_city_trgm ON properties USING gin (city gin_trgm_ops)",
+    # Change detection for re-imports (load_data.py upsert)
+    "ALTER TABLE properties ADD COLUMN IF NOT EXISTS content_hash varchar(32)",
+    # Bulk-imported rows never set is_featured; default it in the database and backfill
+    "ALTER TABLE properties ALTER COLUMN is_featured SET DEFAULT false",
+    "UPDATE properties SET is_featured = false WHERE is_featured IS NULL",
+    # Resumable imports: manifest rows point at the run that wrote them
+    "ALTER TABLE IF EXISTS import_manifest ADD COLUMN IF NOT EXISTS run_id integer",
+    # HomeHarvest fields mapped by load_data.py (see FIELD_MAPPING_VERSION there)
+    """ALTER TABLE properties
+       ADD COLUMN IF NOT EXISTS estimated_value integer,
+       ADD COLUMN IF NOT EXISTS price_per_sqft integer,
+       ADD COLUMN IF NOT EXISTS days_on_mls integer,
+       ADD COLUMN IF NOT EXISTS county varchar,
+       ADD COLUMN IF NOT EXISTS neighborhoods varchar[],
+       ADD COLUMN IF NOT EXISTS agent_email varchar,
+       ADD COLUMN IF NOT EXISTS agent_phones json,
+       ADD COLUMN IF NOT EXISTS nearby_schools json,
+       ADD COLUMN IF NOT EXISTS tax_history json""",
+    "CREATE INDEX IF NOT EXISTS ix_properties_county ON properties (county)",
+    "ALTER TABLE IF EXISTS import_manifest ADD COLUMN IF NOT EXISTS mapping_version integer",
+    # Autocomplete prefixes shorter than a trigram (PropertyService.autocomplete)
+    """CREATE INDEX IF NOT EXISTS ix_search_suggestions_prefix
+       ON search_suggestions (search_text text_pattern_ops)""",
+    "ANALYZE properties",
+]
+
+
+def upgrade():
+    """Apply all upgrade statements in order"""
+    print("Upgrading database schema...")
+
+    with engine.begin() as conn:
+        for statement in UPGRADE_STATEMENTS:
+            print(f"  - {statement.splitlines()[0][:90]}")
+            conn.execute(text(statement))
+
+    print("Upgrade complete!")
+
+
+if __name__ == "__main__":
+    upgrade()
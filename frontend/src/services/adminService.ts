@@ -3,6 +3,8 @@
  * Handles all API calls for admin dashboard, users, agents, CRM, and features
  */
 
+import { apiFetch } from './api/client'
+
 const API_BASE = 'http://localhost:8000'
 
 // ================== Users API ==================
@@ -24,31 +26,31 @@ export const usersApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/users/?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/users/?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch users')
     return response.json()
   },
 
   async getUser(userId: string) {
-    const response = await fetch(`${API_BASE}/api/users/${userId}`)
+    const response = await apiFetch(`${API_BASE}/api/users/${userId}`)
     if (!response.ok) throw new Error('Failed to fetch user')
     return response.json()
   },
 
   async getUserByFirebaseUid(firebaseUid: string) {
-    const response = await fetch(`${API_BASE}/api/users/firebase/${firebaseUid}`)
+    const response = await apiFetch(`${API_BASE}/api/users/firebase/${firebaseUid}`)
     if (!response.ok) throw new Error('Failed to fetch user')
     return response.json()
   },
 
   async getUserStats() {
-    const response = await fetch(`${API_BASE}/api/users/stats`)
+    const response = await apiFetch(`${API_BASE}/api/users/stats`)
     if (!response.ok) throw new Error('Failed to fetch user stats')
     return response.json()
   },
 
   async createUser(data: any) {
-    const response = await fetch(`${API_BASE}/api/users/`, {
+    const response = await apiFetch(`${API_BASE}/api/users/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -58,7 +60,7 @@ export const usersApi = {
   },
 
   async syncUser(data: any) {
-    const response = await fetch(`${API_BASE}/api/users/sync`, {
+    const response = await apiFetch(`${API_BASE}/api/users/sync`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -68,7 +70,7 @@ export const usersApi = {
   },
 
   async updateUser(userId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/users/${userId}`, {
+    const response = await apiFetch(`${API_BASE}/api/users/${userId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -78,7 +80,7 @@ export const usersApi = {
   },
 
   async updateUserStatus(userId: string, status: string) {
-    const response = await fetch(`${API_BASE}/api/users/${userId}/status?status=${status}`, {
+    const response = await apiFetch(`${API_BASE}/api/users/${userId}/status?status=${status}`, {
       method: 'PATCH'
     })
     if (!response.ok) throw new Error('Failed to update user status')
@@ -86,7 +88,7 @@ export const usersApi = {
   },
 
   async assignAgentToUser(userId: string, agentId: string) {
-    const response = await fetch(`${API_BASE}/api/users/${userId}/assign-agent?agent_id=${agentId}`, {
+    const response = await apiFetch(`${API_BASE}/api/users/${userId}/assign-agent?agent_id=${agentId}`, {
       method: 'PATCH'
     })
     if (!response.ok) throw new Error('Failed to assign agent')
@@ -94,7 +96,7 @@ export const usersApi = {
   },
 
   async deleteUser(userId: string) {
-    const response = await fetch(`${API_BASE}/api/users/${userId}`, {
+    const response = await apiFetch(`${API_BASE}/api/users/${userId}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete user')
@@ -121,25 +123,25 @@ export const agentsApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/agents/?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/agents/?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch agents')
     return response.json()
   },
 
   async getAgent(agentId: string) {
-    const response = await fetch(`${API_BASE}/api/agents/${agentId}`)
+    const response = await apiFetch(`${API_BASE}/api/agents/${agentId}`)
     if (!response.ok) throw new Error('Failed to fetch agent')
     return response.json()
   },
 
   async getAgentStats() {
-    const response = await fetch(`${API_BASE}/api/agents/stats`)
+    const response = await apiFetch(`${API_BASE}/api/agents/stats`)
     if (!response.ok) throw new Error('Failed to fetch agent stats')
     return response.json()
   },
 
   async createAgent(data: any) {
-    const response = await fetch(`${API_BASE}/api/agents/`, {
+    const response = await apiFetch(`${API_BASE}/api/agents/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -149,7 +151,7 @@ export const agentsApi = {
   },
 
   async updateAgent(agentId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/agents/${agentId}`, {
+    const response = await apiFetch(`${API_BASE}/api/agents/${agentId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -159,7 +161,7 @@ export const agentsApi = {
   },
 
   async updateAgentStatus(agentId: string, status: string) {
-    const response = await fetch(`${API_BASE}/api/agents/${agentId}/status?status=${status}`, {
+    const response = await apiFetch(`${API_BASE}/api/agents/${agentId}/status?status=${status}`, {
       method: 'PATCH'
     })
     if (!response.ok) throw new Error('Failed to update agent status')
@@ -167,7 +169,7 @@ export const agentsApi = {
   },
 
   async assignCustomerToAgent(customerId: string, agentId: string, notes?: string) {
-    const response = await fetch(`${API_BASE}/api/agents/assign-customer`, {
+    const response = await apiFetch(`${API_BASE}/api/agents/assign-customer`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ customer_id: customerId, agent_id: agentId, notes })
@@ -177,7 +179,7 @@ export const agentsApi = {
   },
 
   async getAgentCustomers(agentId: string, limit = 20, offset = 0) {
-    const response = await fetch(
+    const response = await apiFetch(
       `${API_BASE}/api/agents/${agentId}/customers?limit=${limit}&offset=${offset}`
     )
     if (!response.ok) throw new Error('Failed to fetch agent customers')
@@ -185,7 +187,7 @@ export const agentsApi = {
   },
 
   async deleteAgent(agentId: string) {
-    const response = await fetch(`${API_BASE}/api/agents/${agentId}`, {
+    const response = await apiFetch(`${API_BASE}/api/agents/${agentId}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete agent')
@@ -211,13 +213,13 @@ export const crmApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/crm/interactions?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/crm/interactions?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch interactions')
     return response.json()
   },
 
   async createInteraction(data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/interactions`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/interactions`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -227,7 +229,7 @@ export const crmApi = {
   },
 
   async updateInteraction(interactionId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/interactions/${interactionId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/interactions/${interactionId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -237,7 +239,7 @@ export const crmApi = {
   },
 
   async deleteInteraction(interactionId: string) {
-    const response = await fetch(`${API_BASE}/api/crm/interactions/${interactionId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/interactions/${interactionId}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete interaction')
@@ -261,13 +263,13 @@ export const crmApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/crm/notes?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/crm/notes?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch notes')
     return response.json()
   },
 
   async createNote(data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/notes`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/notes`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -277,7 +279,7 @@ export const crmApi = {
   },
 
   async updateNote(noteId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/notes/${noteId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/notes/${noteId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -287,7 +289,7 @@ export const crmApi = {
   },
 
   async deleteNote(noteId: string) {
-    const response = await fetch(`${API_BASE}/api/crm/notes/${noteId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/notes/${noteId}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete note')
@@ -311,20 +313,20 @@ export const crmApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/crm/tasks?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch tasks')
     return response.json()
   },
 
   async getOverdueTasks(agentId?: string) {
     const params = agentId ? `?assigned_agent_id=${agentId}` : ''
-    const response = await fetch(`${API_BASE}/api/crm/tasks/overdue${params}`)
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks/overdue${params}`)
     if (!response.ok) throw new Error('Failed to fetch overdue tasks')
     return response.json()
   },
 
   async createTask(data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/tasks`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -334,7 +336,7 @@ export const crmApi = {
   },
 
   async updateTask(taskId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/tasks/${taskId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks/${taskId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -344,7 +346,7 @@ export const crmApi = {
   },
 
   async completeTask(taskId: string) {
-    const response = await fetch(`${API_BASE}/api/crm/tasks/${taskId}/complete`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks/${taskId}/complete`, {
       method: 'PATCH'
     })
     if (!response.ok) throw new Error('Failed to complete task')
@@ -352,7 +354,7 @@ export const crmApi = {
   },
 
   async deleteTask(taskId: string) {
-    const response = await fetch(`${API_BASE}/api/crm/tasks/${taskId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/tasks/${taskId}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete task')
@@ -372,19 +374,19 @@ export const crmApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/crm/pipeline?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/crm/pipeline?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch pipeline')
     return response.json()
   },
 
   async getPipelineStats() {
-    const response = await fetch(`${API_BASE}/api/crm/pipeline/stats`)
+    const response = await apiFetch(`${API_BASE}/api/crm/pipeline/stats`)
     if (!response.ok) throw new Error('Failed to fetch pipeline stats')
     return response.json()
   },
 
   async createPipelineEntry(data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/pipeline`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/pipeline`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -394,7 +396,7 @@ export const crmApi = {
   },
 
   async updatePipeline(pipelineId: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/crm/pipeline/${pipelineId}`, {
+    const response = await apiFetch(`${API_BASE}/api/crm/pipeline/${pipelineId}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -404,7 +406,7 @@ export const crmApi = {
   },
 
   async updateCustomerStage(customerId: string, stage: string) {
-    const response = await fetch(
+    const response = await apiFetch(
       `${API_BASE}/api/crm/pipeline/customer/${customerId}/stage?stage=${stage}`,
       { method: 'PATCH' }
     )
@@ -414,7 +416,7 @@ export const crmApi = {
 
   // Stats
   async getCRMStats() {
-    const response = await fetch(`${API_BASE}/api/crm/stats`)
+    const response = await apiFetch(`${API_BASE}/api/crm/stats`)
     if (!response.ok) throw new Error('Failed to fetch CRM stats')
     return response.json()
   }
@@ -424,7 +426,7 @@ export const crmApi = {
 
 export const adminApi = {
   async getDashboardStats() {
-    const response = await fetch(`${API_BASE}/api/admin/stats`)
+    const response = await apiFetch(`${API_BASE}/api/admin/stats`)
     if (!response.ok) throw new Error('Failed to fetch dashboard stats')
     return response.json()
   },
@@ -435,19 +437,19 @@ export const adminApi = {
     if (params?.category) searchParams.append('category', params.category)
     if (params?.is_enabled !== undefined) searchParams.append('is_enabled', params.is_enabled.toString())
 
-    const response = await fetch(`${API_BASE}/api/admin/features?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/admin/features?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch features')
     return response.json()
   },
 
   async getFeature(featureKey: string) {
-    const response = await fetch(`${API_BASE}/api/admin/features/${featureKey}`)
+    const response = await apiFetch(`${API_BASE}/api/admin/features/${featureKey}`)
     if (!response.ok) throw new Error('Failed to fetch feature')
     return response.json()
   },
 
   async createFeature(data: any) {
-    const response = await fetch(`${API_BASE}/api/admin/features`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/features`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -457,7 +459,7 @@ export const adminApi = {
   },
 
   async updateFeature(featureKey: string, data: any) {
-    const response = await fetch(`${API_BASE}/api/admin/features/${featureKey}`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/features/${featureKey}`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -467,7 +469,7 @@ export const adminApi = {
   },
 
   async toggleFeature(featureKey: string, isEnabled: boolean, enabledBy?: string) {
-    const response = await fetch(`${API_BASE}/api/admin/features/${featureKey}/toggle`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/features/${featureKey}/toggle`, {
       method: 'PATCH',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ is_enabled: isEnabled, enabled_by: enabledBy })
@@ -477,7 +479,7 @@ export const adminApi = {
   },
 
   async deleteFeature(featureKey: string) {
-    const response = await fetch(`${API_BASE}/api/admin/features/${featureKey}`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/features/${featureKey}`, {
       method: 'DELETE'
     })
     if (!response.ok) throw new Error('Failed to delete feature')
@@ -485,7 +487,7 @@ export const adminApi = {
   },
 
   async seedDefaultFeatures() {
-    const response = await fetch(`${API_BASE}/api/admin/features/seed`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/features/seed`, {
       method: 'POST'
     })
     if (!response.ok) throw new Error('Failed to seed features')
@@ -509,19 +511,19 @@ export const adminApi = {
     if (params?.limit) searchParams.append('limit', params.limit.toString())
     if (params?.offset) searchParams.append('offset', params.offset.toString())
 
-    const response = await fetch(`${API_BASE}/api/admin/activity?${searchParams}`)
+    const response = await apiFetch(`${API_BASE}/api/admin/activity?${searchParams}`)
     if (!response.ok) throw new Error('Failed to fetch activity logs')
     return response.json()
   },
 
   async getRecentActivity(limit = 10) {
-    const response = await fetch(`${API_BASE}/api/admin/activity/recent?limit=${limit}`)
+    const response = await apiFetch(`${API_BASE}/api/admin/activity/recent?limit=${limit}`)
     if (!response.ok) throw new Error('Failed to fetch recent activity')
     return response.json()
   },
 
   async createActivityLog(data: any) {
-    const response = await fetch(`${API_BASE}/api/admin/activity`, {
+    const response = await apiFetch(`${API_BASE}/api/admin/activity`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
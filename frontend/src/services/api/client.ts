@@ -0,0 +1,12 @@
+/**
+ * Shared fetch wrapper for the backend API
+ */
+
+/**
+ * fetch() that sends and accepts cookies on cross-origin API calls.
+ * The backend's read-your-writes window (READ_YOUR_WRITES_SECONDS) is a
+ * cookie set on write responses, so every API call must go through this.
+ */
+export function apiFetch(input: RequestInfo | URL, init: RequestInit = {}): Promise<Response> {
+  return fetch(input, { credentials: 'include', ...init })
+}
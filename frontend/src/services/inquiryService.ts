@@ -2,6 +2,8 @@
  * Service for handling property inquiries and contact form submissions
  */
 
+import { apiFetch } from './api/client';
+
 const API_BASE_URL = 'http://localhost:8000';
 
 export interface ContactFormData {
@@ -60,7 +62,7 @@ class InquiryService {
    */
   async submitContactForm(data: ContactFormData): Promise<InquiryResponse> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/inquiries/contact`, {
+      const response = await apiFetch(`${this.baseUrl}/api/inquiries/contact`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -107,7 +109,7 @@ class InquiryService {
       if (params.offset) queryParams.append('offset', params.offset.toString());
 
       const url = `${this.baseUrl}/api/inquiries/?${queryParams.toString()}`;
-      const response = await fetch(url);
+      const response = await apiFetch(url);
 
       if (!response.ok) {
         throw new Error(`Failed to fetch inquiries: ${response.status}`);
@@ -125,7 +127,7 @@ class InquiryService {
    */
   async getInquiry(id: string): Promise<Inquiry> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/inquiries/${id}`);
+      const response = await apiFetch(`${this.baseUrl}/api/inquiries/${id}`);
 
       if (!response.ok) {
         throw new Error(`Inquiry not found: ${id}`);
@@ -143,7 +145,7 @@ class InquiryService {
    */
   async updateInquiryStatus(id: string, status: 'new' | 'read' | 'responded' | 'closed'): Promise<Inquiry> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/inquiries/${id}/status`, {
+      const response = await apiFetch(`${this.baseUrl}/api/inquiries/${id}/status`, {
         method: 'PATCH',
         headers: {
           'Content-Type': 'application/json',
@@ -167,7 +169,7 @@ class InquiryService {
    */
   async getInquiryStats(): Promise<InquiryStats> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/inquiries/stats/overview`);
+      const response = await apiFetch(`${this.baseUrl}/api/inquiries/stats/overview`);
 
       if (!response.ok) {
         throw new Error('Failed to fetch inquiry stats');
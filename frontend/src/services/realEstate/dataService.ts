@@ -1,4 +1,5 @@
 import type { Property } from '@/types/property';
+import { apiFetch } from '@/services/api/client';
 
 // Backend API response interfaces
 interface PropertyResponse {
@@ -140,7 +141,7 @@ class DataService {
       const url = `${this.baseUrl}/api/properties/?${queryParams.toString()}`;
       console.log('Fetching from API:', url);
 
-      const response = await fetch(url);
+      const response = await apiFetch(url);
       
       if (!response.ok) {
         throw new Error(`API request failed: ${response.status} ${response.statusText}`);
@@ -188,7 +189,7 @@ class DataService {
    */
   async getPropertyById(id: string): Promise<Property> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/properties/${id}`);
+      const response = await apiFetch(`${this.baseUrl}/api/properties/${id}`);
       
       if (!response.ok) {
         throw new Error(`Property not found: ${id}`);
@@ -207,7 +208,7 @@ class DataService {
    */
   async getStats(): Promise<{ total_properties: number; avg_price: number }> {
     try {
-      const response = await fetch(`${this.baseUrl}/api/properties/stats/overview`);
+      const response = await apiFetch(`${this.baseUrl}/api/properties/stats/overview`);
       
       if (!response.ok) {
         throw new Error('Failed to load stats');